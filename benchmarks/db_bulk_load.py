@@ -0,0 +1,144 @@
+"""
+Benchmark of loading professors and subjects data into the SQLite database.
+Compares the previous row-by-row loading (a connection per converter, one INSERT per row, a commit per table)
+with the bulk loading of db_support.json_to_db (one shared connection, executemany, one transaction, bulk load pragmas).
+
+Usage:
+    python benchmarks/db_bulk_load.py [--professors 5000] [--subjects-per-professor 5] [--repeat 3]
+"""
+
+import argparse
+import json
+import os
+from pathlib import Path
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import src.db_support as db_support
+
+
+def generate_data(data_dir, professors=5000, subjects_per_professor=5):
+    """
+    Generates synthetic professors data, subjects data and results JSON files.
+
+    Args:
+        data_dir (str):                  Directory where the files are saved
+        professors (int):                (Optional) Number of professors. Default is 5000
+        subjects_per_professor (int):    (Optional) Number of subjects of each professor. Default is 5
+
+    Returns:
+        (tuple):                         Paths to the professors data, subjects data and results files
+    """
+    prof_list = [{'ord_num': str(i + 1), 'prof_name': f'Profesor {i}', 'prof_title': 'Redovni profesor'} for i in range(professors)]
+    prof_tables = []
+    subj_list = []
+    subj_tables = []
+    for i in range(professors):
+        subjects = []
+        for j in range(subjects_per_professor):
+            code = f'P{i:05d}{j:02d}'
+            subjects.append({'index': str(j + 1), 'code': code, 'name': f'Predmet {i}-{j}', 'type': 'P', 'studies_programme': 'Informatika', 'studies_type': 'OAS'})
+            subj_list.append({'index': str(len(subj_list) + 1), 'code': code, 'name': f'Predmet {i}-{j}', 'type': 'P', 'sem': '1', 'p': '2', 'v': '2', 'don': '0', 'other': '0', 'espb': '6'})
+            subj_tables.append({'school': 'Fakultet', 'studies_programme': 'Informatika', 'subject': f'[{code}] Predmet {i}-{j}', 'subject_code': f'[{code}]', 'subject_name': f'Predmet {i}-{j}',
+                                'professor': f'Profesor {i}', 'subject_status': 'obavezni', 'espb': '6', 'condition': 'nema', 'theory_classes': '2', 'practical_classes': '2',
+                                'class_points': {'Kolokvijum 1': '20', 'Kolokvijum 2': '20', 'Ispit': '60'}, 'subjects_header': []})
+        prof_tables.append({'table_key': i + 1, 'name': f'Profesor {i}', 'title': 'Redovni profesor', 'institution': 'Fakultet', 'sci_discipline': 'Informatika', 'subjects': subjects, 'subjects_header': []})
+    paths = (os.path.join(data_dir, 'professors_data.json'), os.path.join(data_dir, 'subjects_data.json'), os.path.join(data_dir, 'results.json'))
+    with open(paths[0], 'w', encoding='utf-8') as f:
+        json.dump([{'type': 'prof_list', 'data': prof_list, 'header': []}, {'type': 'prof_tables', 'data': prof_tables, 'header': []}], f)
+    with open(paths[1], 'w', encoding='utf-8') as f:
+        json.dump([{'type': 'subj_list', 'data': subj_list, 'header': []}, {'type': 'subj_tables', 'data': subj_tables, 'header': []}], f)
+    with open(paths[2], 'w', encoding='utf-8') as f:
+        json.dump({'studies_programme': 'Informatika', 'studies_type': 'OAS'}, f)
+    return paths
+
+def row_by_row_json_to_db(professors_json_path, subjects_json_path, results_json_path, db_path):
+    """
+    Loads the data the way db_support did before bulk loading: a connection per converter, one INSERT per row and a commit after each table.
+    """
+    with open(professors_json_path, 'r', encoding='utf-8') as f:
+        professors = json.load(f)
+    conn = sqlite3.connect(db_path)
+    converter = db_support.ProfessorDBConverter(db_path, conn=conn)
+    converter.connect()
+    converter.create_tables()
+    conn.commit()
+    for section in professors:
+        if section['type'] == 'prof_list':
+            for professor in section['data']:
+                conn.execute('INSERT INTO professors_list_table (ord_num, prof_name, prof_title) VALUES (?, ?, ?)', (professor['ord_num'], professor['prof_name'], professor['prof_title']))
+            conn.commit()
+        elif section['type'] == 'prof_tables':
+            for professor in section['data']:
+                conn.execute('INSERT INTO professors_table (id, name, title, institution, sci_discipline) VALUES (?, ?, ?, ?, ?)',
+                             (professor['table_key'], professor['name'], professor['title'], professor['institution'], professor['sci_discipline']))
+                for subject in professor['subjects']:
+                    conn.execute('INSERT INTO prof_subjects_table (subject_index, code, name, type, studies_programme, studies_type, professor_id) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                                 (subject['index'], subject['code'], subject['name'], subject['type'], subject['studies_programme'], subject['studies_type'], professor['table_key']))
+            conn.commit()
+    conn.close()
+    with open(subjects_json_path, 'r', encoding='utf-8') as f:
+        subjects = json.load(f)
+    conn = sqlite3.connect(db_path)
+    converter = db_support.SubjectDBConverter(db_path, conn=conn)
+    converter.connect()
+    converter.create_tables()
+    conn.commit()
+    subj_list = {i['code']: i for i in subjects[0]['data']}
+    for subject in subjects[1]['data']:
+        code = subject['subject_code'].strip('[]')
+        subj_list_data = subj_list.get(code, {})
+        conn.execute('''INSERT INTO subjects_table (subject_index, code, name, type, sem, p, v, don, other, espb, professor, subject_status, condition,
+                        theory_classes, practical_classes, studies_programme, school, class_points) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+                     (subj_list_data.get('index', ''), code, subject['subject_name'], subj_list_data.get('type', ''), subj_list_data.get('sem', ''), subj_list_data.get('p', ''),
+                      subj_list_data.get('v', ''), subj_list_data.get('don', ''), subj_list_data.get('other', ''), subject['espb'], subject['professor'], subject['subject_status'],
+                      subject['condition'], subject['theory_classes'], subject['practical_classes'], subject['studies_programme'], subject['school'], json.dumps(subject['class_points'], ensure_ascii=False)))
+    conn.commit()
+    conn.close()
+    converter = db_support.ResultsDBConverter(db_path)
+    converter.convert(results_json_path)
+
+def table_counts(db_path):
+    """
+    Counts rows of the loaded tables.
+    """
+    conn = sqlite3.connect(db_path)
+    counts = {table: conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0] for table in ['professors_list_table', 'professors_table', 'prof_subjects_table', 'subjects_table', 'programme_table']}
+    conn.close()
+    return counts
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark of loading data into the SQLite database.')
+    parser.add_argument('--professors', type=int, default=5000, help='Number of professors. Default is 5000')
+    parser.add_argument('--subjects-per-professor', type=int, default=5, help='Number of subjects of each professor. Default is 5')
+    parser.add_argument('--repeat', type=int, default=3, help='Number of runs of each loading path, the best time is reported. Default is 3')
+    args = parser.parse_args(argv)
+    data_dir = tempfile.mkdtemp(prefix='db_bulk_load_')
+    try:
+        paths = generate_data(data_dir, professors=args.professors, subjects_per_professor=args.subjects_per_professor)
+        print(f'Generated {args.professors} professors with {args.subjects_per_professor} subjects each in {data_dir}')
+        timings = {}
+        for name, load in [('row by row', row_by_row_json_to_db), ('bulk (json_to_db)', db_support.json_to_db)]:
+            best = None
+            for i in range(args.repeat):
+                db_path = os.path.join(data_dir, f'benchmark_{i}.db')
+                if os.path.exists(db_path):
+                    os.remove(db_path)
+                start_time = time.perf_counter()
+                load(*paths, db_path)
+                duration = time.perf_counter() - start_time
+                best = duration if best is None else min(best, duration)
+            timings[name] = best
+            print(f'{name}: {best:.3f} s, rows: {table_counts(db_path)}')
+        print(f"Speedup: {timings['row by row'] / timings['bulk (json_to_db)']:.1f}x")
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Benchmark of extracting professor and subjects tables (verify_data.extract_professor_table, verify_data.extract_subjects_table).
+Reports the extraction cost per table of the current code and, with --baseline, of verify_data.py at another git revision
+(e.g. the revision before the pattern registry, src/patterns.py), loaded from the repository with git show.
+
+Usage:
+    python benchmarks/table_extraction.py [--tables 2000] [--repeat 5] [--baseline <git revision>]
+"""
+
+import argparse
+import importlib.util
+from pathlib import Path
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import src.verify_data as verify_data
+
+
+def generate_tables(tables=2000):
+    """
+    Generates synthetic professor and subjects tables, in the format read from the documentation (rows of cell texts, None for empty cells).
+
+    Args:
+        tables (int):            (Optional) Number of tables of each type. Default is 2000
+
+    Returns:
+        (list):                  Professor tables
+        (list):                  Subjects tables
+    """
+    prof_tables = []
+    subj_tables = []
+    for i in range(tables):
+        prof_table = [['Ime i prezime', f'Profesor {i}', f'Profesor {i}'],
+                      ['Zvanje', 'Redovni profesor', None],
+                      ['Naziv institucije u kojoj nastavnik radi sa punim radnim vremenom', 'Fakultet', 'Fakultet'],
+                      ['Uža naučna oblast', 'Informatika', None],
+                      ['Akademska karijera', 'Godina', 'Institucija'],
+                      ['Spisak predmeta koje nastavnik drži\nna akreditovanim studijskim programima', None, None],
+                      ['R.B.', 'Oznaka predmeta', 'Naziv predmeta', 'Vid nastave', 'Naziv studijskog programa', 'Vrsta studija']]
+        for j in range(8):
+            prof_table.append([f'{j + 1}.', f'P{i:05d}{j:02d}', f'Predmet {i}-{j}', 'Predavanja', 'Informatika', 'OAS'])
+        prof_table.append(['Reprezentativne reference (minimalno 5 ne više od 10)', None, None])
+        prof_tables.append(prof_table)
+        subj_tables.append([['Školska ustanova:', 'Fakultet'],
+                            ['Studijski program: Informatika'],
+                            ['Naziv predmeta:', f'[P{i:05d}00] Predmet {i}-0'],
+                            ['Nastavnik/nastavnici:', f'Profesor {i}'],
+                            ['Status predmeta:', 'obavezni'],
+                            ['Broj ESPB:', '6'],
+                            ['Uslov:', 'nema'],
+                            ['Cilj predmeta', 'Sticanje znanja'],
+                            ['Ishod predmeta', 'Razumevanje oblasti'],
+                            ['Broj časova aktivne nastave', 'Teorijska nastava: 2', 'Praktična nastava: 2'],
+                            ['Metode izvođenja nastave', 'Predavanja i vežbe'],
+                            ['Ocena znanja (maksimalni broj poena 100)'],
+                            ['Predispitne obaveze', 'poena', 'Završni ispit', 'poena'],
+                            ['aktivnost u toku predavanja', '10', 'pismeni ispit', '40'],
+                            ['kolokvijum-i', '30', 'usmeni ispit', '20']])
+    return prof_tables, subj_tables
+
+def load_baseline(revision):
+    """
+    Loads verify_data.py of the given git revision as a separate module.
+
+    Args:
+        revision (str):          Git revision (commit, branch, tag)
+
+    Returns:
+        (module):                verify_data module of the revision
+    """
+    repo_dir = Path(__file__).resolve().parents[1]
+    source = subprocess.run(['git', 'show', f'{revision}:src/verify_data.py'], cwd=repo_dir, capture_output=True, text=True, check=True).stdout
+    module_path = Path(tempfile.mkdtemp(prefix='table_extraction_')) / 'verify_data_baseline.py'
+    module_path.write_text(source, encoding='utf-8')
+    spec = importlib.util.spec_from_file_location('verify_data_baseline', module_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def time_extraction(module, prof_tables, subj_tables, repeat=5):
+    """
+    Times extraction of all tables with the given verify_data module.
+
+    Returns:
+        (dict):                  Best time per table (microseconds) for professor and subjects tables, and the extracted data
+    """
+    timings = {}
+    extracted = {}
+    for name, tables, extract in [('professor', prof_tables, lambda table, index: module.extract_professor_table(table, index)),
+                                  ('subjects', subj_tables, lambda table, index: module.extract_subjects_table(table))]:
+        best = None
+        for i in range(repeat):
+            start_time = time.perf_counter()
+            extracted[name] = [extract(table, index) for index, table in enumerate(tables)]
+            duration = time.perf_counter() - start_time
+            best = duration if best is None else min(best, duration)
+        timings[name] = best / len(tables) * 1e6
+    return timings, extracted
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark of extracting professor and subjects tables.')
+    parser.add_argument('--tables', type=int, default=2000, help='Number of tables of each type. Default is 2000')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of runs, the best time is reported. Default is 5')
+    parser.add_argument('--baseline', default='', help='Git revision whose verify_data.py is also timed, for comparison. Default is \'\' - only the current code is timed')
+    args = parser.parse_args(argv)
+    prof_tables, subj_tables = generate_tables(tables=args.tables)
+    print(f'Generated {args.tables} professor tables and {args.tables} subjects tables')
+    modules = [('current', verify_data)]
+    if args.baseline != '':
+        modules.insert(0, (f'baseline ({args.baseline})', load_baseline(args.baseline)))
+    results = {}
+    for name, module in modules:
+        timings, extracted = time_extraction(module, prof_tables, subj_tables, repeat=args.repeat)
+        results[name] = (timings, extracted)
+        print(f"{name}: professor table {timings['professor']:.1f} us, subjects table {timings['subjects']:.1f} us")
+    if len(modules) > 1:
+        (baseline_timings, baseline_extracted), (timings, extracted) = results[modules[0][0]], results['current']
+        print(f"Speedup: professor tables {baseline_timings['professor'] / timings['professor']:.2f}x, subjects tables {baseline_timings['subjects'] / timings['subjects']:.2f}x")
+        print(f"Extracted data is {'the same' if baseline_extracted == extracted else 'DIFFERENT'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Run the verification without the GUI, for one or more documentation directories.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import src.batch_runner as batch_runner
+import src.conversion_backends as conversion_backends
+
+root_dir = os.getcwd()
+
+def run(doc_dirs, root_dir=root_dir, jobs=None, clean_tmp=True, processing_options=None, summary_path='', store_path=''):
+    """
+    Runs the verification for each of the given documentation directories, in parallel worker processes.
+    Each documentation directory is verified in its own workspace, <root_dir>/workspaces/<name>.
+
+    Args:
+        doc_dirs (list):             Absolute paths to the documentation directories
+        root_dir (str):              (Optional) Root directory of the project, absolute path. Default is the current working directory
+        jobs (int):                  (Optional) Number of worker processes. Default is None - number of CPUs
+        clean_tmp (bool):            (Optional) If True, the /tmp directory of each workspace is cleared before running. Default is True
+        processing_options (dict):   (Optional) Processing options. Default is None - default options
+        summary_path (str):          (Optional) If not empty, the merged summary of all runs is saved as a .json file to this path. Default is ''
+        store_path (str):            (Optional) If not empty, databases of all runs are imported into the run store at this path. Default is ''
+
+    Returns:
+        (dict):                      Merged summary of all runs
+    """
+    processing_options = processing_options if processing_options is not None else {'use_loaded_data': False, 'prof_subj_comp': True, 'prof_subj_min_num': 2, 'exam_points_sum': True}
+    summary = batch_runner.run_packages(doc_dirs=doc_dirs, root_dir=root_dir, jobs=jobs, clean_tmp=clean_tmp, processing_options=processing_options, summary_path=summary_path, store_path=store_path)
+    print(f"{'=' * 20}\nSummary:\n{json.dumps(summary, indent=4)}")
+    return summary
+
+
+def benchmark_backends(doc_dirs, root_dir=root_dir, repeat=1):
+    """
+    Benchmarks conversion backends on the largest .doc and .docx files of the given documentation directories (see conversion_backends.py),
+    and saves the report with the selected backend to <root_dir>/cache/conversion_backends.json, where it is used by the 'auto' book reader.
+
+    Args:
+        doc_dirs (list):             Absolute paths to the documentation directories
+        root_dir (str):              (Optional) Root directory of the project, absolute path. Default is the current working directory
+        repeat (int):                (Optional) Number of runs of each backend on each file, the best time is used. Default is 1
+
+    Returns:
+        (dict):                      Benchmark report
+    """
+    report = conversion_backends.benchmark(conversion_backends.sample_files(doc_dirs), repeat=repeat)
+    conversion_backends.print_report(report)
+    selection_path = os.path.join(root_dir, 'cache', 'conversion_backends.json')
+    conversion_backends.save_selection(selection_path, report)
+    print(f'Benchmark report saved to {selection_path}')
+    return report
+
+
+def main(argv=None):
+    """
+    Parses command line arguments and runs the verification.
+    """
+    parser = argparse.ArgumentParser(description='AutoCreditation - verification of accreditation documentation without the GUI.')
+    parser.add_argument('doc_dirs', nargs='+', help='Documentation directories to verify')
+    parser.add_argument('--root-dir', default=root_dir, help='Root directory of the project, working files are saved in <root-dir>/workspaces/<name>/tmp. Default is the current working directory')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='Number of documentation directories verified in parallel. Default is the number of CPUs')
+    parser.add_argument('--keep-tmp', action='store_true', help='Do not clear the /tmp directory before each run')
+    parser.add_argument('--prof-subj-min-num', type=int, default=2, help='Minimum number of subjects per professor. Default is 2')
+    parser.add_argument('--table-processes', type=int, default=0, help='Number of worker processes extracting professor and subjects tables of each documentation directory in parallel. Default is 0 - tables are extracted sequentially')
+    parser.add_argument('--table-chunk-size', type=int, default=50, help='Number of tables extracted by a worker process at once. Default is 50')
+    parser.add_argument('--workspace-mode', choices=['copy', 'link', 'lazy'], default='copy', help='How documentation files are placed in the workspace: copy, link (hardlinks or reflinks, copied if not supported) or lazy (symbolic links, files read by the pipeline are copied). Default is copy')
+    parser.add_argument('--copy-threads', type=int, default=4, help='Number of threads copying documentation files into the workspace. Files already up to date in the workspace (with --keep-tmp) are not copied again. Default is 4')
+    parser.add_argument('--scan-threads', type=int, default=0, help='Number of threads scanning subdirectories of each documentation directory in parallel, for network shares. Default is 0 - sequential')
+    parser.add_argument('--link-source', choices=['docx', 'html'], default='docx', help='Where hyperlinks of the main documentation file are found: docx (read from the .docx file) or html (searched in the converted .html file). Default is docx')
+    parser.add_argument('--book-reader', choices=['html', 'docx', 'auto'], default='html', help='How tables of the professors and subjects files are read: html (from the converted .html file), docx (streamed from the .docx file, without converting it) or auto (reader of the backend selected by --benchmark-backends). Default is html')
+    parser.add_argument('--benchmark-backends', action='store_true', help='Benchmark conversion backends on the largest .doc and .docx files of the documentation directories, save the selected backend for --book-reader auto and exit without verification')
+    parser.add_argument('--benchmark-repeat', type=int, default=1, help='Number of runs of each backend on each file with --benchmark-backends, the best time is used. Default is 1')
+    parser.add_argument('--sequential-books', action='store_true', help='Read the professors and subjects files one after another, instead of at the same time')
+    parser.add_argument('--comparison-backend', choices=['python', 'sql'], default='python', help='Backend matching professors and subjects: python or sql (SQLite). Default is python')
+    parser.add_argument('--no-cache', action='store_true', help='Do not use the conversion cache (<root-dir>/cache/conversions) and the incremental cache of each workspace (<workspace>/cache/incremental)')
+    parser.add_argument('--store', default='', help='Import databases of all runs into this run store database (runs of other programmes in the store are kept)')
+    parser.add_argument('--summary', default='', help='Save the merged summary of all runs as a .json file to this path')
+    args = parser.parse_args(argv)
+    if args.benchmark_backends:
+        report = benchmark_backends(doc_dirs=[os.path.abspath(i) for i in args.doc_dirs], root_dir=os.path.abspath(args.root_dir), repeat=args.benchmark_repeat)
+        return 0 if report['selected'] != '' else 1
+    processing_options = {'use_loaded_data': False, 'prof_subj_comp': True, 'prof_subj_min_num': args.prof_subj_min_num, 'exam_points_sum': True, 'use_conversion_cache': not args.no_cache, 'use_incremental_cache': not args.no_cache,
+                          'table_processes': args.table_processes, 'table_chunk_size': args.table_chunk_size, 'comparison_backend': args.comparison_backend, 'link_source': args.link_source,
+                          'scan_threads': args.scan_threads, 'workspace_mode': args.workspace_mode, 'copy_threads': args.copy_threads, 'book_reader': args.book_reader,
+                          'overlap_books': not args.sequential_books}
+    summary = run(doc_dirs=[os.path.abspath(i) for i in args.doc_dirs], root_dir=os.path.abspath(args.root_dir), jobs=args.jobs, clean_tmp=not args.keep_tmp, processing_options=processing_options, summary_path=args.summary, store_path=os.path.abspath(args.store) if args.store != '' else '')
+    return 1 if summary['failed_packages'] > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
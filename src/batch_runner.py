@@ -0,0 +1,144 @@
+"""
+Verification of multiple documentation directories in parallel.
+Each documentation directory is verified in its own workspace (<root_dir>/workspaces/<name>), so runs do not share the /tmp directory.
+Converted documents are cached in <root_dir>/cache/conversions, shared by all workspaces.
+Databases of all runs can be collected in a single run store (see db_store).
+"""
+
+import contextlib
+import hashlib
+import os
+from pathlib import Path
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import src.db_store as db_store
+import src.pipeline as pipeline
+import src.util as util
+
+
+def workspace_dir(root_dir, doc_dir):
+    """
+    Forms a path to the workspace of the given documentation directory.
+
+    Args:
+        root_dir (str):          Root directory of the project, absolute path
+        doc_dir (str):           Absolute path to the documentation directory
+
+    Returns:
+        (str):                   Absolute path to the workspace. Working files of the run are saved in <workspace>/tmp
+    """
+    doc_dir = os.path.abspath(doc_dir)
+    doc_dir_hash = hashlib.sha1(doc_dir.encode('utf-8')).hexdigest()[:8]
+    return os.path.join(root_dir, Path('workspaces'), f'{Path(doc_dir).name}_{doc_dir_hash}')
+
+def run_package(root_dir, doc_dir, clean_tmp=True, processing_options=None):
+    """
+    Verifies a single documentation directory in its own workspace. Output of the run is saved to <workspace>/run_log.txt.
+
+    Args:
+        root_dir (str):              Root directory of the project, absolute path
+        doc_dir (str):               Absolute path to the documentation directory
+        clean_tmp (bool):            (Optional) If True, the /tmp directory of the workspace is cleared before running. Default is True
+        processing_options (dict):   (Optional) Processing options. Default is None - no options
+
+    Returns:
+        (dict):                      Summary of the run
+    """
+    workspace = workspace_dir(root_dir=root_dir, doc_dir=doc_dir)
+    os.makedirs(workspace, exist_ok=True)
+    start_time = time.perf_counter()
+    with open(os.path.join(workspace, 'run_log.txt'), 'w', encoding='utf-8') as log:
+        with contextlib.redirect_stdout(log):
+            try:
+                verification = pipeline.Pipeline(root_dir=workspace, doc_dir=doc_dir, clean_tmp=clean_tmp, processing_options=processing_options,
+                                                 cache_dir=os.path.join(root_dir, Path('cache/conversions')),
+                                                 progress_callback=lambda value, desc: print(f'[{value}%] {desc}'))
+                verification.run()
+                summary = verification.summary()
+            except Exception as e:
+                print(f'Error verifying documentation in {doc_dir}:\n    {e}')
+                summary = {'doc_dir': str(doc_dir), 'errors': [f'Run failed: {e}']}
+    summary['workspace'] = workspace
+    summary['duration'] = round(time.perf_counter() - start_time, 2)
+    return summary
+
+def merge_summaries(summaries):
+    """
+    Merges summaries of multiple runs.
+
+    Args:
+        summaries (list):        Summaries of the runs
+
+    Returns:
+        (dict):                  Merged summary: totals of unmatched items and the list of summaries of all runs
+    """
+    return {
+        'packages': len(summaries),
+        'failed_packages': len([i for i in summaries if True in ['Run failed' in j for j in i['errors']]]),
+        'unmatched_hyperlinks': sum([i.get('unmatched_hyperlinks', 0) for i in summaries]),
+        'prof_to_subj_not_found': sum([i.get('prof_to_subj_not_found', 0) for i in summaries]),
+        'subj_to_prof_not_found': sum([i.get('subj_to_prof_not_found', 0) for i in summaries]),
+        'runs': summaries,
+    }
+
+def store_runs(summaries, store_path):
+    """
+    Imports databases of the finished runs into the run store, each run named by its documentation directory.
+
+    Args:
+        summaries (list):            Summaries of the runs, the run id in the store is added to each of them
+        store_path (str):            Absolute path to the run store database
+    """
+    with db_store.RunStore(store_path) as store:
+        for summary in summaries:
+            if summary.get('workspace') is None:
+                continue
+            run_db_path = os.path.join(summary['workspace'], Path('tmp/acreditation.db'))
+            if not os.path.isfile(run_db_path):
+                continue
+            try:
+                summary['run_id'] = store.import_run(run_db_path=run_db_path, name=summary['doc_dir'])
+            except Exception as e:
+                print(f"Error importing {run_db_path} into run store {store_path}:\n    {e}")
+
+def run_packages(doc_dirs, root_dir, jobs=None, clean_tmp=True, processing_options=None, summary_path='', store_path=''):
+    """
+    Verifies the given documentation directories in a process pool, each in its own workspace.
+
+    Args:
+        doc_dirs (list):             Paths to the documentation directories, each directory is verified once
+        root_dir (str):              Root directory of the project, absolute path
+        jobs (int):                  (Optional) Number of worker processes. Default is None - number of CPUs
+        clean_tmp (bool):            (Optional) If True, the /tmp directory of each workspace is cleared before running. Default is True
+        processing_options (dict):   (Optional) Processing options. Default is None - no options
+        summary_path (str):          (Optional) If not empty, the merged summary is saved as a .json file to this path. Default is ''
+        store_path (str):            (Optional) If not empty, databases of all runs are imported into the run store at this path. Default is ''
+
+    Returns:
+        (dict):                      Merged summary of all runs
+    """
+    # The same directory given twice would be verified twice in the same workspace at the same time
+    doc_dirs = list(dict.fromkeys([os.path.abspath(doc_dir) for doc_dir in doc_dirs]))
+    jobs = jobs if jobs is not None else os.cpu_count() or 1
+    jobs = max(1, min(jobs, len(doc_dirs)))
+    summaries = {}
+    print(f'Verifying {len(doc_dirs)} documentation directories with {jobs} worker processes...')
+    start_time = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {executor.submit(run_package, root_dir, doc_dir, clean_tmp, processing_options): doc_dir for doc_dir in doc_dirs}
+        for future in as_completed(futures):
+            doc_dir = futures[future]
+            try:
+                summaries[doc_dir] = future.result()
+            except Exception as e:
+                summaries[doc_dir] = {'doc_dir': str(doc_dir), 'errors': [f'Run failed: {e}'],
+                                      'workspace': workspace_dir(root_dir=root_dir, doc_dir=doc_dir), 'duration': round(time.perf_counter() - start_time, 2)}
+            print(f"{len(summaries)}/{len(doc_dirs)}    Finished {doc_dir} ({summaries[doc_dir].get('duration', 0)} s)")
+    if store_path != '':
+        store_runs(summaries=[summaries[doc_dir] for doc_dir in doc_dirs], store_path=store_path)
+    # Keep the order of the given documentation directories
+    summary = merge_summaries([summaries[doc_dir] for doc_dir in doc_dirs])
+    if summary_path != '':
+        util.save_json(file_path=summary_path, data=summary)
+    return summary
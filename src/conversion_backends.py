@@ -0,0 +1,314 @@
+"""
+Registry of document conversion backends.
+Each backend declares its capabilities:
+    - 'formats_in':   formats of the files it reads
+    - 'formats_out':  formats of the files it creates (empty for backends that read documents without converting them)
+    - 'tables_only':  if True, the backend only reads tables (and hyperlinks), without creating a converted file
+    - 'tables':       if True, the backend reads tables of professors and subjects files ('book_reader' is the value of the book_reader option using it)
+    - 'links':        if True, the backend reads hyperlinks of the main documentation file
+Backends are benchmarked on sample documentation files (benchmark), and the fastest backend reading the same tables as the reference backend (mammoth) is selected.
+The selection is saved to a .json file and used by the 'auto' book reader, until versions of the backends change.
+"""
+
+from importlib import metadata
+import importlib.util
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import src.docx_to_md_html as docx_to_md_html
+import src.docx_stream as docx_stream
+import src.doc_2_docx_ms_word_win as doc_2_docx_ms_word_win
+import src.html_tables as html_tables
+
+# Backend whose tables other backends are compared with
+REFERENCE_BACKEND = 'mammoth'
+SELECTION_VERSION = 1
+
+
+def module_available(name):
+    """
+    Checks if a module can be imported, without importing it.
+    """
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+def package_version(name):
+    """
+    Returns the installed version of a package, '' if it is not installed.
+    """
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return ''
+
+def convert_doc_docx(doc_path, out_dir):
+    """
+    Converts a .doc file to .docx with Microsoft Word (Windows) or LibreOffice (Linux), see doc_2_docx_ms_word_win.py.
+    """
+    return doc_2_docx_ms_word_win.doc2docx(doc_path, os.path.join(out_dir, f'{os.path.splitext(os.path.basename(doc_path))[0]}.docx'))
+
+def convert_mammoth(docx_path, out_dir):
+    """
+    Converts a .docx file to .html with mammoth, see docx_to_md_html.py.
+    """
+    return docx_to_md_html.convert_docx_file(root_dir=out_dir, docx_path=docx_path, file_name=os.path.splitext(os.path.basename(docx_path))[0], processed_dir='html', output_format='html')
+
+def convert_markitdown(docx_path, out_dir):
+    """
+    Converts a .docx file to .md with markitdown.
+    """
+    from markitdown import MarkItDown
+    md_path = os.path.join(out_dir, f'{os.path.splitext(os.path.basename(docx_path))[0]}.md')
+    with open(md_path, 'w', encoding='utf-8') as f:
+        f.write(MarkItDown().convert(docx_path).text_content)
+    return md_path
+
+def tables_mammoth(docx_path):
+    """
+    Reads tables of a .docx file converted to .html with mammoth, the same as the 'html' book reader.
+    """
+    out_dir = tempfile.mkdtemp(prefix='conversion_backends_')
+    try:
+        with open(convert_mammoth(docx_path, out_dir), 'r', encoding='utf-8') as f:
+            return list(html_tables.read_tables(f.read()))
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+
+def tables_docx_stream(docx_path):
+    """
+    Reads tables of a .docx file with the streaming reader, the same as the 'docx' book reader.
+    """
+    return list(docx_stream.read_tables(docx_path))
+
+
+BACKENDS = {
+    'word': {'formats_in': ['doc'], 'formats_out': ['docx'], 'tables_only': False, 'tables': False, 'links': False,
+             'available': lambda: sys.platform.startswith('win') and module_available('win32com'),
+             'version': lambda: doc_2_docx_ms_word_win.converter_version() if sys.platform.startswith('win') else '', 'convert': convert_doc_docx},
+    'libreoffice': {'formats_in': ['doc'], 'formats_out': ['docx'], 'tables_only': False, 'tables': False, 'links': False,
+                    'available': lambda: sys.platform.startswith('linux') and (shutil.which('soffice') or shutil.which('lowriter')) is not None,
+                    'version': lambda: doc_2_docx_ms_word_win.converter_version() if sys.platform.startswith('linux') else '', 'convert': convert_doc_docx},
+    'mammoth': {'formats_in': ['docx'], 'formats_out': ['html', 'md', 'txt'], 'tables_only': False, 'tables': True, 'links': True, 'book_reader': 'html',
+                'available': lambda: module_available('mammoth'),
+                'version': lambda: package_version('mammoth'), 'convert': convert_mammoth, 'read_tables': tables_mammoth},
+    'docx_stream': {'formats_in': ['docx'], 'formats_out': [], 'tables_only': True, 'tables': True, 'links': True, 'book_reader': 'docx',
+                    'available': lambda: True,
+                    'version': lambda: '', 'read_tables': tables_docx_stream},
+    'markitdown': {'formats_in': ['docx'], 'formats_out': ['md'], 'tables_only': False, 'tables': False, 'links': False,
+                   'available': lambda: module_available('markitdown'),
+                   'version': lambda: package_version('markitdown'), 'convert': convert_markitdown},
+}
+
+
+def available_backends(format_in=None, tables=None):
+    """
+    Lists available backends (installed and supported on this platform).
+
+    Args:
+        format_in (str):         (Optional) Only backends reading this format ('doc', 'docx'). Default is None - all formats
+        tables (bool):           (Optional) If True, only backends reading tables, if False, only backends converting files. Default is None - all backends
+
+    Returns:
+        (list):                  Names of the backends
+    """
+    names = []
+    for name, backend in BACKENDS.items():
+        if format_in is not None and format_in not in backend['formats_in']:
+            continue
+        if tables is not None and ('read_tables' in backend.keys()) != tables:
+            continue
+        if backend['available']():
+            names.append(name)
+    return names
+
+def backend_versions():
+    """
+    Returns versions of all backends, used to find out if a saved selection is still valid.
+    """
+    return {name: backend['version']() for name, backend in BACKENDS.items()}
+
+def sample_files(doc_dirs, max_files=4):
+    """
+    Finds sample files for the benchmark: the largest .doc and .docx files of the documentation directories (professors and subjects files are usually the largest).
+
+    Args:
+        doc_dirs (list):         Absolute paths to the documentation directories
+        max_files (int):         (Optional) Number of files from each directory. Default is 4
+
+    Returns:
+        (list):                  Absolute paths to the sample files
+    """
+    files = []
+    for doc_dir in doc_dirs:
+        dir_files = []
+        for dir_path, dir_names, file_names in os.walk(doc_dir):
+            for file_name in file_names:
+                if file_name.lower().endswith(('.doc', '.docx')) and not file_name.startswith('~$'):
+                    file_path = os.path.join(dir_path, file_name)
+                    dir_files.append((os.path.getsize(file_path), file_path))
+        files += [file_path for size, file_path in sorted(dir_files, reverse=True)[:max_files]]
+    return files
+
+def time_call(func, repeat=1):
+    """
+    Calls a function, repeat times.
+
+    Returns:
+        (any):                   Result of the last call
+        (float):                 Best time of a call, in seconds
+    """
+    best, result = None, None
+    for i in range(max(1, repeat)):
+        start_time = time.perf_counter()
+        result = func()
+        duration = time.perf_counter() - start_time
+        best = duration if best is None else min(best, duration)
+    return result, best
+
+def benchmark(files, backends=None, repeat=1):
+    """
+    Times available backends on sample files and selects the fastest backend reading tables, of the backends reading the same tables as the reference backend.
+    .doc files are converted to .docx by each .doc backend, and converted files are used as .docx samples.
+
+    Args:
+        files (list):            Absolute paths to the sample .doc and .docx files
+        backends (list):         (Optional) Names of the benchmarked backends. Default is None - all available backends
+        repeat (int):            (Optional) Number of runs of each backend on each file, the best time is used. Default is 1
+
+    Returns:
+        (dict):                  Benchmark report: {'backends': {name: {capabilities, 'time', 'files', 'failed', 'read_tables', 'equivalent'}}, 'selected': name of the selected backend reading tables, 'versions', 'files'}
+    """
+    names = [name for name in (backends if backends is not None else BACKENDS.keys()) if name in BACKENDS.keys() and BACKENDS[name]['available']()]
+    docx_files = [file_path for file_path in files if file_path.lower().endswith('.docx')]
+    doc_files = [file_path for file_path in files if file_path.lower().endswith('.doc')]
+    work_dir = tempfile.mkdtemp(prefix='conversion_benchmark_')
+    report = {'backends': {}, 'selected': '', 'versions': backend_versions(), 'files': files, 'version': SELECTION_VERSION}
+    try:
+        # .doc backends first, files converted by the first backend are also used as .docx samples
+        converted_docx = []
+        read_tables = {}
+        for name in [name for name in names if 'doc' in BACKENDS[name]['formats_in']] + [name for name in names if 'doc' not in BACKENDS[name]['formats_in']]:
+            backend = BACKENDS[name]
+            sources = doc_files if 'doc' in backend['formats_in'] else docx_files + converted_docx
+            result = {key: backend[key] for key in ['formats_in', 'formats_out', 'tables_only', 'tables', 'links']}
+            result.update({'time': 0.0, 'files': 0, 'failed': 0, 'equivalent': None})
+            tables = {}
+            for index, file_path in enumerate(sources):
+                out_dir = os.path.join(work_dir, name, str(index))
+                os.makedirs(out_dir, exist_ok=True)
+                try:
+                    if 'read_tables' in backend.keys():
+                        tables[file_path], duration = time_call(lambda: backend['read_tables'](file_path), repeat=repeat)
+                    else:
+                        output, duration = time_call(lambda: backend['convert'](file_path, out_dir), repeat=repeat)
+                        if output in ['', None] or not os.path.exists(output):
+                            raise OSError(f'Converted file not created: {output}')
+                        if 'doc' in backend['formats_in'] and len(converted_docx) < len(doc_files) and output not in converted_docx:
+                            converted_docx.append(output)
+                    result['time'] += duration
+                    result['files'] += 1
+                except Exception as e:
+                    print(f'Backend {name} failed on {file_path}:\n    {e}')
+                    result['failed'] += 1
+            result['time'] = round(result['time'], 4)
+            report['backends'][name] = result
+            if 'read_tables' in backend.keys():
+                read_tables[name] = tables
+        # Backends reading tables are equivalent if they read the same tables of all files as the reference backend
+        candidates = []
+        for name, tables in read_tables.items():
+            result = report['backends'][name]
+            result['read_tables'] = sum([len(file_tables) for file_tables in tables.values()])
+            if REFERENCE_BACKEND in read_tables.keys() and report['backends'][REFERENCE_BACKEND]['failed'] == 0 and result['failed'] == 0 and result['files'] > 0:
+                result['equivalent'] = tables == read_tables[REFERENCE_BACKEND]
+            if result['equivalent'] == True:
+                candidates.append(name)
+        if len(candidates) > 0:
+            report['selected'] = min(candidates, key=lambda name: report['backends'][name]['time'])
+        elif REFERENCE_BACKEND in names:
+            report['selected'] = REFERENCE_BACKEND
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return report
+
+def print_report(report):
+    """
+    Prints a benchmark report.
+    """
+    print(f"Benchmark of conversion backends on {len(report['files'])} files:")
+    for name, result in report['backends'].items():
+        capabilities = f"{'/'.join(result['formats_in'])} -> {'/'.join(result['formats_out']) if len(result['formats_out']) > 0 else 'tables'}"
+        capabilities += ', tables only' if result['tables_only'] == True else ''
+        capabilities += ', links' if result['links'] == True else ''
+        equivalent = '' if result['equivalent'] is None else ', same tables as the reference' if result['equivalent'] == True else ', DIFFERENT tables'
+        print(f"    {name:<12} {capabilities:<40} {result['time']:>8.3f} s, {result['files']} files, {result['failed']} failed{equivalent}")
+    print(f"Selected backend for reading tables: {report['selected'] if report['selected'] != '' else 'none'}")
+
+def save_selection(selection_path, report):
+    """
+    Saves a benchmark report with the selected backend. The file is written to a temporary file first, so other processes never read a partial file.
+
+    Args:
+        selection_path (str):    Absolute path to the .json file
+        report (dict):           Benchmark report
+    """
+    os.makedirs(os.path.dirname(selection_path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(selection_path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=4, ensure_ascii=False)
+        os.replace(tmp_path, selection_path)
+    except (OSError, TypeError, ValueError) as e:
+        print(f'Error saving conversion backend selection {selection_path}:\n    {e}')
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def load_selection(selection_path):
+    """
+    Loads a saved benchmark report, if it is still valid (versions of the backends did not change).
+
+    Args:
+        selection_path (str):    Absolute path to the .json file
+
+    Returns:
+        (dict or None):          Benchmark report, None if it is not found or not valid
+    """
+    if not os.path.isfile(selection_path):
+        return None
+    try:
+        with open(selection_path, 'r', encoding='utf-8') as f:
+            report = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f'Error reading conversion backend selection {selection_path}:\n    {e}')
+        return None
+    if report.get('version') != SELECTION_VERSION or report.get('versions') != backend_versions() or report.get('selected', '') not in BACKENDS.keys():
+        return None
+    return report
+
+def selected_book_reader(selection_path, sample_paths=None):
+    """
+    Finds the book reader (value of the book_reader option) of the selected backend. If there is no valid saved selection, backends are benchmarked on the given files and the selection is saved.
+
+    Args:
+        selection_path (str):    Absolute path to the .json file with the saved selection
+        sample_paths (list):     (Optional) Absolute paths to files to benchmark on, if there is no valid selection. Default is None - 'html' is used without a benchmark
+
+    Returns:
+        (str):                   Book reader: 'html' or 'docx'
+    """
+    report = load_selection(selection_path)
+    if report is None and sample_paths is not None and len(sample_paths) > 0:
+        print('No valid conversion backend selection found, benchmarking backends reading tables...')
+        report = benchmark(sample_paths, backends=available_backends(tables=True))
+        print_report(report)
+        if report['selected'] != '':
+            save_selection(selection_path, report)
+    if report is None or report['selected'] == '':
+        return 'html'
+    return BACKENDS[report['selected']].get('book_reader', 'html')
@@ -0,0 +1,183 @@
+"""
+Persistent cache of converted documents (.docx, .html, _lat.html).
+Entries are keyed by the content hash of the source file, the converter and its options, so unchanged files are not converted again on re-runs.
+The cache is size-bounded: least recently used entries are evicted first.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+import shutil
+import tempfile
+import time
+
+# Increase to invalidate all cached entries when the conversion output format changes
+CACHE_VERSION = 1
+
+
+def file_hash(file_path, block_size=1024 * 1024):
+    """
+    Calculates SHA-256 hash of the file content.
+
+    Args:
+        file_path (str):         Absolute path to the file
+        block_size (int):        (Optional) Size of the blocks the file is read in, in bytes. Default is 1 MB
+
+    Returns:
+        (str):                   Hex digest of the file content
+    """
+    sha = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+class ConversionCache:
+    """
+    Content-addressed cache of converted documents, stored in a directory.
+    Each entry is a directory <cache_dir>/<key[:2]>/<key> containing the converted files; its modification time marks the last use.
+    """
+
+    def __init__(self, cache_dir, max_size=2 * 1024 ** 3):
+        """
+        Args:
+            cache_dir (str):         Absolute path to the cache directory
+            max_size (int):          (Optional) Maximum size of all cached files, in bytes. Default is 2 GB
+        """
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.hashes = {}
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def key(self, source_path, converter, options=None):
+        """
+        Forms the cache key of a conversion.
+
+        Args:
+            source_path (str):       Absolute path to the source file
+            converter (str):         Name and version of the converter
+            options (dict):          (Optional) Conversion options. Default is None
+
+        Returns:
+            (str):                   Cache key
+        """
+        stat = os.stat(source_path)
+        # Hash is calculated only once for an unchanged file
+        hash_key = (os.path.abspath(source_path), stat.st_size, stat.st_mtime_ns)
+        if hash_key not in self.hashes:
+            self.hashes[hash_key] = file_hash(source_path)
+        key_data = json.dumps({'version': CACHE_VERSION, 'source': self.hashes[hash_key], 'converter': converter, 'options': options or {}}, sort_keys=True)
+        return hashlib.sha256(key_data.encode('utf-8')).hexdigest()
+
+    def entry_dir(self, key):
+        """
+        Forms a path to the directory of the cache entry.
+        """
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def get(self, key, outputs):
+        """
+        Copies cached files to the given paths, if all of them are cached.
+
+        Args:
+            key (str):               Cache key
+            outputs (dict):          Names of the cached files mapped to absolute paths where they are copied
+
+        Returns:
+            (bool):                  True if all files were found in the cache and copied
+        """
+        entry_dir = self.entry_dir(key)
+        if False in [os.path.isfile(os.path.join(entry_dir, name)) for name in outputs.keys()]:
+            return False
+        copied = []
+        try:
+            for name, dest_path in outputs.items():
+                os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+                shutil.copyfile(os.path.join(entry_dir, name), dest_path)
+                copied.append(dest_path)
+        except OSError as e:
+            # Entry can be evicted or replaced by another process while it is copied - treated as a cache miss
+            print(f'Error loading {key} from conversion cache:\n    {e}')
+            for dest_path in copied:
+                try:
+                    os.remove(dest_path)
+                except OSError:
+                    pass
+            return False
+        try:
+            os.utime(entry_dir)
+        except OSError:
+            pass
+        return True
+
+    def put(self, key, outputs):
+        """
+        Saves converted files to the cache and evicts least recently used entries if the cache is too large.
+
+        Args:
+            key (str):               Cache key
+            outputs (dict):          Names of the cached files mapped to absolute paths of the converted files
+        """
+        entry_dir = self.entry_dir(key)
+        os.makedirs(os.path.dirname(entry_dir), exist_ok=True)
+        # Entry is written to a temporary directory first, so other processes never see a partial entry
+        tmp_dir = tempfile.mkdtemp(dir=os.path.dirname(entry_dir))
+        try:
+            for name, src_path in outputs.items():
+                shutil.copyfile(src_path, os.path.join(tmp_dir, name))
+            if os.path.exists(entry_dir):
+                shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(tmp_dir, entry_dir)
+        except OSError as e:
+            print(f'Error saving {key} to conversion cache:\n    {e}')
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return
+        self.evict()
+
+    def entries(self):
+        """
+        Lists cache entries.
+
+        Returns:
+            (list):                  List of (last use time, size in bytes, entry directory), least recently used first
+        """
+        entries = []
+        for prefix in os.scandir(self.cache_dir):
+            if not prefix.is_dir():
+                continue
+            try:
+                prefix_entries = list(os.scandir(prefix.path))
+            except FileNotFoundError:
+                continue
+            for entry in prefix_entries:
+                if not entry.is_dir() or entry.name.startswith('tmp'):
+                    continue
+                # Other processes sharing the cache can remove the entry while it is read
+                try:
+                    size = sum([i.stat().st_size for i in os.scandir(entry.path) if i.is_file()])
+                    entries.append((entry.stat().st_mtime, size, entry.path))
+                except FileNotFoundError:
+                    continue
+        return sorted(entries)
+
+    def evict(self):
+        """
+        Removes least recently used entries until the cache size is within the limit.
+        """
+        entries = self.entries()
+        cache_size = sum([i[1] for i in entries])
+        for last_used, size, entry_dir in entries:
+            if cache_size <= self.max_size:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            cache_size -= size
+            print(f'Evicted {Path(entry_dir).name} from conversion cache (last used {time.ctime(last_used)})')
+
+    def clear(self):
+        """
+        Removes all cache entries.
+        """
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        os.makedirs(self.cache_dir, exist_ok=True)
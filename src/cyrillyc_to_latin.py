@@ -36,6 +36,10 @@ CYR_TO_LAT_DICT = {
 }
 
 
+# Translation table for str.translate, multi-character outputs (Lj, Nj, Dž) are supported
+CYR_TO_LAT_TABLE = str.maketrans(CYR_TO_LAT_DICT)
+
+
 def cyrillic_to_latin(text):
     '''
     Converts cyrillic characters to latin characters
@@ -46,7 +50,23 @@ def cyrillic_to_latin(text):
     Returns:
         str: Text with latin characters
     '''
-    for i in range(len(text)):
-        if text[i] in CYR_TO_LAT_DICT:
-            text = text.replace(text[i], CYR_TO_LAT_DICT[text[i]])
-    return text
\ No newline at end of file
+    return text.translate(CYR_TO_LAT_TABLE)
+
+
+def cyrillic_to_latin_file(src_path, dest_path, chunk_size=1024 * 1024):
+    '''
+    Converts cyrillic characters of a text file to latin characters, reading and writing the file in chunks
+
+    Args:
+        src_path (str): Path to the file to be converted (UTF-8)
+        dest_path (str): Path to the converted file. Can not be the same as src_path
+        chunk_size (int): (Optional) Number of characters read at once. Default is 1048576
+
+    Returns:
+        str: Path to the converted file
+    '''
+    # Characters are converted one by one, so chunks can be split at any character
+    with open(src_path, 'r', encoding='utf-8') as src, open(dest_path, 'w', encoding='utf-8') as dest:
+        for chunk in iter(lambda: src.read(chunk_size), ''):
+            dest.write(chunk.translate(CYR_TO_LAT_TABLE))
+    return dest_path
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Module for keeping data of many verification runs (programmes) in a single SQLite database.
+Each run database (tmp/acreditation.db) is imported into the store as a run: its rows are copied into the store tables
+with the run_id key, so tables are partitioned by run (primary keys start with run_id) and a run is imported, replaced,
+exported or deleted without rewriting the rest of the store.
+"""
+
+from pathlib import Path
+import sqlite3
+import os
+from typing import Dict, List, Any, Optional
+
+import src.db_support as db_support
+
+
+# Columns of the run database tables copied into the store, with their types. The id column is the key within a run
+STORE_TABLES = {
+    'professors_table': {'id': 'INTEGER', 'name': 'TEXT', 'title': 'TEXT', 'institution': 'TEXT', 'sci_discipline': 'TEXT'},
+    'prof_subjects_table': {'id': 'INTEGER', 'subject_index': 'TEXT', 'code': 'TEXT', 'name': 'TEXT', 'type': 'TEXT',
+                            'studies_programme': 'TEXT', 'studies_type': 'TEXT', 'professor_id': 'INTEGER'},
+    'professors_list_table': {'id': 'INTEGER', 'ord_num': 'TEXT', 'prof_name': 'TEXT', 'prof_title': 'TEXT'},
+    'programme_table': {'id': 'INTEGER', 'studies_programme': 'TEXT', 'studies_type': 'TEXT'},
+    'subjects_table': {'id': 'INTEGER', 'subject_index': 'TEXT', 'code': 'TEXT', 'name': 'TEXT', 'type': 'TEXT', 'sem': 'TEXT',
+                       'p': 'TEXT', 'v': 'TEXT', 'don': 'TEXT', 'other': 'TEXT', 'espb': 'TEXT', 'professor': 'TEXT',
+                       'subject_status': 'TEXT', 'condition': 'TEXT', 'theory_classes': 'TEXT', 'practical_classes': 'TEXT',
+                       'studies_programme': 'TEXT', 'school': 'TEXT', 'class_points': 'TEXT'},
+}
+
+
+def create_store_tables(cursor: sqlite3.Cursor) -> None:
+    """
+    Store migration 1: create the runs table and the run tables keyed by (run_id, id)
+
+    Args:
+        cursor: Database cursor
+    """
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS runs (
+        run_id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE,
+        studies_programme TEXT,
+        studies_type TEXT,
+        source TEXT,
+        imported_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+    # Rows of a run are stored together (clustered by the primary key)
+    for table, columns in STORE_TABLES.items():
+        column_defs = ',\n        '.join([f'{column} {column_type}' for column, column_type in columns.items()])
+        cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS {table} (
+            run_id INTEGER NOT NULL REFERENCES runs (run_id),
+            {column_defs},
+            PRIMARY KEY (run_id, id)
+        ) WITHOUT ROWID
+        ''')
+
+
+def create_store_indexes(cursor: sqlite3.Cursor) -> None:
+    """
+    Store migration 2: create indexes for queries across runs, on normalized (trimmed, lowercase) professor names and subject codes
+
+    Args:
+        cursor: Database cursor
+    """
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_store_professors_name_norm ON professors_table (lower(trim(name)))')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_store_prof_subjects_professor_id ON prof_subjects_table (run_id, professor_id, subject_index)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_store_prof_subjects_code_norm ON prof_subjects_table (lower(trim(code)))')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_store_subjects_code_norm ON subjects_table (lower(trim(code)))')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_store_subjects_professor_norm ON subjects_table (lower(trim(professor)))')
+
+
+# Schema migrations of the store, in order (see db_support.MIGRATIONS)
+STORE_MIGRATIONS = [
+    (1, 'Runs and run tables', create_store_tables),
+    (2, 'Indexes for queries across runs', create_store_indexes),
+]
+
+
+class RunStore:
+    """
+    Database of many verification runs, each imported from a run database (tmp/acreditation.db)
+    """
+
+    def __init__(self, db_path: str = "runs.db"):
+        """
+        Initialize the store with path to the store database, created if it does not exist
+
+        Args:
+            db_path: Path to the SQLite database file of the store
+        """
+        self.db_path = db_path
+        self.conn = None
+
+    def connect(self) -> None:
+        """
+        Establish connection to the store and upgrade its schema
+        """
+        if os.path.dirname(self.db_path) != '' and not os.path.exists(os.path.dirname(self.db_path)):
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.row_factory = sqlite3.Row
+        db_support.upgrade_schema(self.conn, migrations=STORE_MIGRATIONS)
+        self.conn.commit()
+
+    def close(self) -> None:
+        """
+        Close the store connection
+        """
+        if self.conn:
+            self.conn.close()
+        self.conn = None
+
+    def __enter__(self) -> 'RunStore':
+        self.connect()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def list_runs(self) -> List[Dict[str, Any]]:
+        """
+        List runs in the store
+
+        Returns:
+            List of runs (run_id, name, studies_programme, studies_type, source, imported_at), in order of run_id
+        """
+        return [dict(row) for row in self.conn.execute("SELECT * FROM runs ORDER BY run_id")]
+
+    def get_run_id(self, name: str) -> Optional[int]:
+        """
+        Get the id of a run by its name
+
+        Args:
+            name: Name of the run
+
+        Returns:
+            Run id, None if there is no run with the name
+        """
+        row = self.conn.execute("SELECT run_id FROM runs WHERE name = ?", (name,)).fetchone()
+        return row['run_id'] if row is not None else None
+
+    def delete_run_rows(self, run_id: int) -> None:
+        """
+        Delete rows of a run from all run tables (the run itself is kept)
+
+        Args:
+            run_id: Id of the run
+        """
+        for table in STORE_TABLES.keys():
+            self.conn.execute(f"DELETE FROM {table} WHERE run_id = ?", (run_id,))
+
+    def delete_run(self, run_id: int) -> None:
+        """
+        Delete a run and its rows from the store
+
+        Args:
+            run_id: Id of the run
+        """
+        self.delete_run_rows(run_id)
+        self.conn.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
+        self.conn.commit()
+
+    def import_run(self, run_db_path: str, name: str = '') -> int:
+        """
+        Import a run database into the store. A run with the same name is replaced, keeping its run id
+
+        Args:
+            run_db_path: Path to the run database (tmp/acreditation.db)
+            name: Name of the run (optional). Default is the studies programme of the run, or the name of the database file
+
+        Returns:
+            Id of the imported run
+        """
+        self.conn.execute("ATTACH DATABASE ? AS run_db", (run_db_path,))
+        try:
+            run_tables = [row['name'] for row in self.conn.execute("SELECT name FROM run_db.sqlite_master WHERE type = 'table'")]
+            programme = None
+            if 'programme_table' in run_tables:
+                programme = self.conn.execute("SELECT studies_programme, studies_type FROM run_db.programme_table LIMIT 1").fetchone()
+            studies_programme = programme['studies_programme'] if programme is not None else ''
+            studies_type = programme['studies_type'] if programme is not None else ''
+            name = name if name != '' else (studies_programme if studies_programme else Path(run_db_path).stem)
+            # Copy all rows of the run in a single transaction
+            run_id = self.get_run_id(name)
+            if run_id is not None:
+                self.delete_run_rows(run_id)
+                self.conn.execute("UPDATE runs SET studies_programme = ?, studies_type = ?, source = ?, imported_at = CURRENT_TIMESTAMP WHERE run_id = ?",
+                                  (studies_programme, studies_type, os.path.abspath(run_db_path), run_id))
+            else:
+                run_id = self.conn.execute("INSERT INTO runs (name, studies_programme, studies_type, source) VALUES (?, ?, ?, ?)",
+                                           (name, studies_programme, studies_type, os.path.abspath(run_db_path))).lastrowid
+            for table, columns in STORE_TABLES.items():
+                if table not in run_tables:
+                    continue
+                column_names = ', '.join(columns.keys())
+                self.conn.execute(f"INSERT INTO main.{table} (run_id, {column_names}) SELECT ?, {column_names} FROM run_db.{table}", (run_id,))
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            self.conn.execute("DETACH DATABASE run_db")
+        print(f"Imported {run_db_path} into {self.db_path} as run {run_id} ({name})")
+        return run_id
+
+    def export_run(self, run_id: int, run_db_path: str) -> None:
+        """
+        Export a run into a run database, which can be opened by the application (imported in the GUI).
+        An existing database at the path is replaced
+
+        Args:
+            run_id: Id of the run
+            run_db_path: Path to the exported run database
+        """
+        if os.path.exists(run_db_path):
+            os.remove(run_db_path)
+        if os.path.dirname(run_db_path) != '' and not os.path.exists(os.path.dirname(run_db_path)):
+            os.makedirs(os.path.dirname(run_db_path), exist_ok=True)
+        run_conn = sqlite3.connect(run_db_path)
+        try:
+            db_support.upgrade_schema(run_conn)
+            run_conn.execute("ATTACH DATABASE ? AS store", (self.db_path,))
+            for table, columns in STORE_TABLES.items():
+                column_names = ', '.join(columns.keys())
+                run_conn.execute(f"INSERT INTO main.{table} ({column_names}) SELECT {column_names} FROM store.{table} WHERE run_id = ? ORDER BY id", (run_id,))
+            run_conn.commit()
+            run_conn.execute("DETACH DATABASE store")
+        finally:
+            run_conn.close()
+        print(f"Exported run {run_id} from {self.db_path} to {run_db_path}")
+
+    def professor_subjects(self, professor_name: str) -> List[Dict[str, Any]]:
+        """
+        Find subjects a professor teaches across all runs (professors files of all programmes).
+        Names are compared trimmed and lowercase
+
+        Args:
+            professor_name: Name of the professor
+
+        Returns:
+            List of subjects (run_id, run, professor, code, name, type, studies_programme, studies_type), in order of runs
+        """
+        return [dict(row) for row in self.conn.execute('''
+        SELECT r.run_id, r.name AS run, p.name AS professor, s.code, s.name, s.type, s.studies_programme, s.studies_type
+        FROM professors_table p
+        JOIN prof_subjects_table s ON s.run_id = p.run_id AND s.professor_id = p.id
+        JOIN runs r ON r.run_id = p.run_id
+        WHERE lower(trim(p.name)) = lower(trim(?))
+        ORDER BY r.run_id, p.id, s.subject_index, s.id
+        ''', (professor_name,))]
+
+    def subject_runs(self, code: str) -> List[Dict[str, Any]]:
+        """
+        Find a subject in subjects files of all runs. Codes are compared trimmed and lowercase
+
+        Args:
+            code: Subject code
+
+        Returns:
+            List of subjects (run_id, run, code, name, professor, espb, studies_programme), in order of runs
+        """
+        return [dict(row) for row in self.conn.execute('''
+        SELECT r.run_id, r.name AS run, s.code, s.name, s.professor, s.espb, s.studies_programme
+        FROM subjects_table s
+        JOIN runs r ON r.run_id = s.run_id
+        WHERE lower(trim(s.code)) = lower(trim(?))
+        ORDER BY r.run_id, s.subject_index, s.id
+        ''', (code,))]
@@ -8,7 +8,203 @@ import json
 from pathlib import Path
 import sqlite3
 import os
-from typing import Dict, List, Any, Optional, Tuple
+from itertools import groupby
+from typing import Dict, List, Any, Optional, Tuple, Iterator
+
+
+SCHEMA_VERSION_TABLE = 'schema_version'
+
+
+def create_base_tables(cursor: sqlite3.Cursor) -> None:
+    """
+    Migration 1: create the tables of professors data, subjects data and results
+
+    Args:
+        cursor: Database cursor
+    """
+    # Professors table from prof_tables
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS professors_table (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        title TEXT,
+        institution TEXT,
+        sci_discipline TEXT
+    )
+    ''')
+
+    # Subjects table with foreign key to professors (renamed to prof_subjects_table)
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS prof_subjects_table (
+        id INTEGER PRIMARY KEY,
+        subject_index TEXT,
+        code TEXT,
+        name TEXT NOT NULL,
+        type TEXT,
+        studies_programme TEXT,
+        studies_type TEXT,
+        professor_id INTEGER,
+        FOREIGN KEY (professor_id) REFERENCES professors_table (id)
+    )
+    ''')
+
+    # Professors list table from prof_list
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS professors_list_table (
+        id INTEGER PRIMARY KEY,
+        ord_num TEXT,
+        prof_name TEXT NOT NULL,
+        prof_title TEXT
+    )
+    ''')
+
+    # Programme table for storing general programme information
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS programme_table (
+        id INTEGER PRIMARY KEY,
+        studies_programme TEXT,
+        studies_type TEXT
+    )
+    ''')
+
+    # Main subjects table
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS subjects_table (
+        id INTEGER PRIMARY KEY,
+        subject_index TEXT,
+        code TEXT,
+        name TEXT NOT NULL,
+        type TEXT,
+        sem TEXT,
+        p TEXT,
+        v TEXT,
+        don TEXT,
+        other TEXT,
+        espb TEXT,
+        professor TEXT,
+        subject_status TEXT,
+        condition TEXT,
+        theory_classes TEXT,
+        practical_classes TEXT,
+        studies_programme TEXT,
+        school TEXT,
+        class_points TEXT
+    )
+    ''')
+
+
+def create_lookup_indexes(cursor: sqlite3.Cursor) -> None:
+    """
+    Migration 2: create indexes for reading subjects by professor, code and name, and in order of the subjects list
+
+    Args:
+        cursor: Database cursor
+    """
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_prof_subjects_professor_id ON prof_subjects_table (professor_id, subject_index)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_prof_subjects_code ON prof_subjects_table (code)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_prof_subjects_name ON prof_subjects_table (name)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_subjects_code ON subjects_table (code)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_subjects_name ON subjects_table (name)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_subjects_subject_index ON subjects_table (subject_index)')
+
+
+def create_normalized_indexes(cursor: sqlite3.Cursor) -> None:
+    """
+    Migration 3: create indexes on normalized (trimmed, lowercase) subject codes, professor names and studies programmes.
+    Queries use them when comparing the same expression, e.g. WHERE lower(trim(name)) = ?
+
+    Args:
+        cursor: Database cursor
+    """
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_professors_name_norm ON professors_table (lower(trim(name)))')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_prof_subjects_code_norm ON prof_subjects_table (lower(trim(code)))')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_prof_subjects_programme_norm ON prof_subjects_table (lower(trim(studies_programme)))')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_subjects_code_norm ON subjects_table (lower(trim(code)))')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_subjects_professor_norm ON subjects_table (lower(trim(professor)))')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_subjects_programme_norm ON subjects_table (lower(trim(studies_programme)))')
+
+
+# Schema migrations as (version, description, function), in order. Add new migrations to the end, never change applied ones
+MIGRATIONS = [
+    (1, 'Base tables', create_base_tables),
+    (2, 'Subject lookup indexes', create_lookup_indexes),
+    (3, 'Normalized code, professor name and studies programme indexes', create_normalized_indexes),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """
+    Get the schema version of the database
+
+    Args:
+        conn: Open connection to the database
+
+    Returns:
+        Schema version, 0 for databases created before schema versioning
+    """
+    try:
+        version = conn.execute(f"SELECT MAX(version) FROM {SCHEMA_VERSION_TABLE}").fetchone()[0]
+    except sqlite3.OperationalError:
+        return 0
+    return version if version is not None else 0
+
+
+def upgrade_schema(conn: sqlite3.Connection, migrations: Optional[List[Tuple[int, str, Any]]] = None) -> int:
+    """
+    Apply migrations newer than the schema version of the database. Changes are not committed,
+    so the upgrade is a part of the current transaction
+
+    Args:
+        conn: Open connection to the database
+        migrations: Schema migrations as (version, description, function), in order (optional).
+                    Default is MIGRATIONS, the schema of a single run database
+
+    Returns:
+        Schema version of the database after the upgrade
+    """
+    migrations = migrations if migrations is not None else MIGRATIONS
+    latest_version = migrations[-1][0]
+    version = get_schema_version(conn)
+    if version > latest_version:
+        print(f"Database schema version {version} is newer than supported version {latest_version}, not upgrading")
+        return version
+    if version == latest_version:
+        return version
+    cursor = conn.cursor()
+    cursor.execute(f'''
+    CREATE TABLE IF NOT EXISTS {SCHEMA_VERSION_TABLE} (
+        version INTEGER PRIMARY KEY,
+        description TEXT,
+        applied_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+    for migration_version, description, migration in migrations:
+        if migration_version <= version:
+            continue
+        migration(cursor)
+        cursor.execute(f"INSERT INTO {SCHEMA_VERSION_TABLE} (version, description) VALUES (?, ?)", (migration_version, description))
+        print(f"Applied database migration {migration_version}: {description}")
+    return latest_version
+
+
+def upgrade_database(db_path: str) -> int:
+    """
+    Upgrade the schema of a database file (for example an imported database created by an older version) in place
+
+    Args:
+        db_path: Path to the SQLite database
+
+    Returns:
+        Schema version of the database after the upgrade
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        version = upgrade_schema(conn)
+        conn.commit()
+    finally:
+        conn.close()
+    return version
 
 
 class ProfessorDBConverter:
@@ -17,14 +213,17 @@ class ProfessorDBConverter:
     proper relational structure.
     """
 
-    def __init__(self, db_path: str = "acreditation.db"):
+    def __init__(self, db_path: str = "acreditation.db", conn: Optional[sqlite3.Connection] = None):
         """
         Initialize the converter with path to the target database
 
         Args:
             db_path: Path to the SQLite database file
+            conn: Open connection to the database, shared by multiple converters (optional).
+                  If given, it is not committed or closed by the converter
         """
         self.db_path = db_path
+        self.shared_conn = conn
         self.conn = None
         self.cursor = None
 
@@ -32,69 +231,32 @@ class ProfessorDBConverter:
         """
         Establish connection to the database
         """
-        self.conn = sqlite3.connect(self.db_path)
+        self.conn = self.shared_conn if self.shared_conn is not None else sqlite3.connect(self.db_path)
         self.cursor = self.conn.cursor()
 
     def close(self) -> None:
         """
         Close the database connection
         """
-        if self.conn:
+        if self.conn and self.shared_conn is None:
             self.conn.commit()
             self.conn.close()
-            self.conn = None
-            self.cursor = None
+        self.conn = None
+        self.cursor = None
 
     def create_tables(self) -> None:
         """
-        Create the necessary database tables
+        Create the necessary database tables (all tables of the current schema version, see upgrade_schema)
         """
-        # Professors table from prof_tables
-        self.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS professors_table (
-            id INTEGER PRIMARY KEY,
-            name TEXT NOT NULL,
-            title TEXT,
-            institution TEXT,
-            sci_discipline TEXT
-        )
-        ''')
-
-        # Subjects table with foreign key to professors (renamed to prof_subjects_table)
-        self.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS prof_subjects_table (
-            id INTEGER PRIMARY KEY,
-            subject_index TEXT,
-            code TEXT,
-            name TEXT NOT NULL,
-            type TEXT,
-            studies_programme TEXT,
-            studies_type TEXT,
-            professor_id INTEGER,
-            FOREIGN KEY (professor_id) REFERENCES professors_table (id)
-        )
-        ''')
-
-        # Professors list table from prof_list
-        self.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS professors_list_table (
-            id INTEGER PRIMARY KEY,
-            ord_num TEXT,
-            prof_name TEXT NOT NULL,
-            prof_title TEXT
-        )
-        ''')
-
-        # Programme table for storing general programme information
-        self.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS programme_table (
-            id INTEGER PRIMARY KEY,
-            studies_programme TEXT,
-            studies_type TEXT
-        )
-        ''')
+        upgrade_schema(self.conn)
 
-        self.conn.commit()
+    def clear_tables(self) -> None:
+        """
+        Remove previously inserted professors data, so converting again does not duplicate rows
+        """
+        self.cursor.execute('DELETE FROM professors_list_table')
+        self.cursor.execute('DELETE FROM professors_table')
+        self.cursor.execute('DELETE FROM prof_subjects_table')
 
     def insert_professors_list(self, professors_list: List[Dict[str, Any]]) -> None:
         """
@@ -103,17 +265,14 @@ class ProfessorDBConverter:
         Args:
             professors_list: List of professor data dictionaries
         """
-        for professor in professors_list:
-            self.cursor.execute('''
-            INSERT INTO professors_list_table (ord_num, prof_name, prof_title)
-            VALUES (?, ?, ?)
-            ''', (
-                professor.get('ord_num', ''),
-                professor.get('prof_name', ''),
-                professor.get('prof_title', '')
-            ))
-
-        self.conn.commit()
+        self.cursor.executemany('''
+        INSERT INTO professors_list_table (ord_num, prof_name, prof_title)
+        VALUES (?, ?, ?)
+        ''', [(
+            professor.get('ord_num', ''),
+            professor.get('prof_name', ''),
+            professor.get('prof_title', '')
+        ) for professor in professors_list])
 
     def insert_professors_and_subjects(self, professors_data: List[Dict[str, Any]]) -> None:
         """
@@ -122,39 +281,32 @@ class ProfessorDBConverter:
         Args:
             professors_data: List of professor data dictionaries including subjects
         """
-        for professor in professors_data:
-            # Insert professor first
-            self.cursor.execute('''
-            INSERT INTO professors_table (id, name, title, institution, sci_discipline)
-            VALUES (?, ?, ?, ?, ?)
-            ''', (
-                professor.get('table_key', None),
-                professor.get('name', ''),
-                professor.get('title', ''),
-                professor.get('institution', ''),
-                professor.get('sci_discipline', '')
-            ))
-
-            professor_id = professor.get('table_key')
-
-            # Insert subjects for this professor
-            subjects = professor.get('subjects_all', professor.get('subjects', []))
-            for subject in subjects:
-                self.cursor.execute('''
-                INSERT INTO prof_subjects_table
-                (subject_index, code, name, type, studies_programme, studies_type, professor_id)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    subject.get('index', ''),
-                    subject.get('code', ''),
-                    subject.get('name', ''),
-                    subject.get('type', ''),
-                    subject.get('studies_programme', ''),
-                    subject.get('studies_type', ''),
-                    professor_id
-                ))
-
-        self.conn.commit()
+        # Insert professors first
+        self.cursor.executemany('''
+        INSERT INTO professors_table (id, name, title, institution, sci_discipline)
+        VALUES (?, ?, ?, ?, ?)
+        ''', [(
+            professor.get('table_key', None),
+            professor.get('name', ''),
+            professor.get('title', ''),
+            professor.get('institution', ''),
+            professor.get('sci_discipline', '')
+        ) for professor in professors_data])
+
+        # Insert subjects of all professors
+        self.cursor.executemany('''
+        INSERT INTO prof_subjects_table
+        (subject_index, code, name, type, studies_programme, studies_type, professor_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', [(
+            subject.get('index', ''),
+            subject.get('code', ''),
+            subject.get('name', ''),
+            subject.get('type', ''),
+            subject.get('studies_programme', ''),
+            subject.get('studies_type', ''),
+            professor.get('table_key')
+        ) for professor in professors_data for subject in professor.get('subjects_all', professor.get('subjects', []))])
 
     def process_json_file(self, json_path: str) -> None:
         """
@@ -186,6 +338,7 @@ class ProfessorDBConverter:
         try:
             self.connect()
             self.create_tables()
+            self.clear_tables()
             self.process_json_file(json_path)
         except Exception as e:
             print(f"Error: {e}")
@@ -199,14 +352,17 @@ class SubjectDBConverter:
     proper relational structure.
     """
 
-    def __init__(self, db_path: str = "tmp/acreditation.db"):
+    def __init__(self, db_path: str = "tmp/acreditation.db", conn: Optional[sqlite3.Connection] = None):
         """
         Initialize the converter with path to the target database
 
         Args:
             db_path: Path to the SQLite database file
+            conn: Open connection to the database, shared by multiple converters (optional).
+                  If given, it is not committed or closed by the converter
         """
         self.db_path = db_path
+        self.shared_conn = conn
         self.conn = None
         self.cursor = None
 
@@ -214,49 +370,30 @@ class SubjectDBConverter:
         """
         Establish connection to the database
         """
-        self.conn = sqlite3.connect(self.db_path)
+        self.conn = self.shared_conn if self.shared_conn is not None else sqlite3.connect(self.db_path)
         self.cursor = self.conn.cursor()
 
     def close(self) -> None:
         """
         Close the database connection
         """
-        if self.conn:
+        if self.conn and self.shared_conn is None:
             self.conn.commit()
             self.conn.close()
-            self.conn = None
-            self.cursor = None
+        self.conn = None
+        self.cursor = None
 
     def create_tables(self) -> None:
         """
-        Create the necessary database tables for subjects
+        Create the necessary database tables for subjects (all tables of the current schema version, see upgrade_schema)
         """
-        # Main subjects table
-        self.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS subjects_table (
-            id INTEGER PRIMARY KEY,
-            subject_index TEXT,
-            code TEXT,
-            name TEXT NOT NULL,
-            type TEXT,
-            sem TEXT,
-            p TEXT,
-            v TEXT,
-            don TEXT,
-            other TEXT,
-            espb TEXT,
-            professor TEXT,
-            subject_status TEXT,
-            condition TEXT,
-            theory_classes TEXT,
-            practical_classes TEXT,
-            studies_programme TEXT,
-            school TEXT,
-            class_points TEXT
-        )
-        ''')
-
-        self.conn.commit()
+        upgrade_schema(self.conn)
+
+    def clear_tables(self) -> None:
+        """
+        Remove previously inserted subjects data, so converting again does not duplicate rows
+        """
+        self.cursor.execute('DELETE FROM subjects_table')
 
     def insert_subjects(self, subj_list: List[Dict[str, Any]], subj_tables: List[Dict[str, Any]]) -> None:
         """
@@ -272,6 +409,7 @@ class SubjectDBConverter:
             subj_list_lookup[subject.get('code', '')] = subject
 
         # Process subjects from tables list, adding data from subj_list when available
+        rows = []
         for subject in subj_tables:
             # Extract code from subject_code (removing brackets)
             code = subject.get('subject_code', '').strip('[]')
@@ -284,13 +422,7 @@ class SubjectDBConverter:
             class_points_json = json.dumps(class_points, ensure_ascii=False) if class_points else ''
 
             # Combine data from both sources
-            self.cursor.execute('''
-            INSERT INTO subjects_table (
-                subject_index, code, name, type, sem, p, v, don, other, espb,
-                professor, subject_status, condition, theory_classes, practical_classes,
-                studies_programme, school, class_points
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
+            rows.append((
                 subj_list_data.get('index', ''),
                 code,
                 subject.get('subject_name', ''),
@@ -311,7 +443,13 @@ class SubjectDBConverter:
                 class_points_json
             ))
 
-        self.conn.commit()
+        self.cursor.executemany('''
+        INSERT INTO subjects_table (
+            subject_index, code, name, type, sem, p, v, don, other, espb,
+            professor, subject_status, condition, theory_classes, practical_classes,
+            studies_programme, school, class_points
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', rows)
 
     def process_json_file(self, json_path: str) -> None:
         """
@@ -352,6 +490,7 @@ class SubjectDBConverter:
         try:
             self.connect()
             self.create_tables()
+            self.clear_tables()
             self.process_json_file(json_path)
         except Exception as e:
             print(f"Error processing subjects: {e}")
@@ -364,14 +503,17 @@ class ResultsDBConverter:
     Converts results data from JSON format into a SQLite database
     """
 
-    def __init__(self, db_path: str = "tmp/acreditation.db"):
+    def __init__(self, db_path: str = "tmp/acreditation.db", conn: Optional[sqlite3.Connection] = None):
         """
         Initialize the converter with path to the target database
 
         Args:
             db_path: Path to the SQLite database file
+            conn: Open connection to the database, shared by multiple converters (optional).
+                  If given, it is not committed or closed by the converter
         """
         self.db_path = db_path
+        self.shared_conn = conn
         self.conn = None
         self.cursor = None
 
@@ -379,31 +521,28 @@ class ResultsDBConverter:
         """
         Establish connection to the database
         """
-        self.conn = sqlite3.connect(self.db_path)
+        self.conn = self.shared_conn if self.shared_conn is not None else sqlite3.connect(self.db_path)
         self.cursor = self.conn.cursor()
 
     def close(self) -> None:
         """Close the database connection"""
-        if self.conn:
+        if self.conn and self.shared_conn is None:
             self.conn.commit()
             self.conn.close()
-            self.conn = None
-            self.cursor = None
+        self.conn = None
+        self.cursor = None
 
     def create_tables(self) -> None:
         """
-        Create the necessary database tables for results data
+        Create the necessary database tables for results data (all tables of the current schema version, see upgrade_schema)
         """
-        # Programme table for storing general programme information
-        self.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS programme_table (
-            id INTEGER PRIMARY KEY,
-            studies_programme TEXT,
-            studies_type TEXT
-        )
-        ''')
+        upgrade_schema(self.conn)
 
-        self.conn.commit()
+    def clear_tables(self) -> None:
+        """
+        Remove previously inserted programme data, so converting again does not duplicate rows
+        """
+        self.cursor.execute('DELETE FROM programme_table')
 
     def insert_programme_info(self, results_data: Dict[str, Any]) -> None:
         """
@@ -420,8 +559,6 @@ class ResultsDBConverter:
             results_data.get('studies_type', '')
         ))
 
-        self.conn.commit()
-
     def process_json_file(self, json_path: str) -> None:
         """
         Process the results JSON file and populate the database
@@ -448,6 +585,7 @@ class ResultsDBConverter:
         try:
             self.connect()
             self.create_tables()
+            self.clear_tables()
             self.process_json_file(json_path)
         except Exception as e:
             print(f"Error processing results: {e}")
@@ -455,6 +593,72 @@ class ResultsDBConverter:
             self.close()
 
 
+def contains_iterator(value: Any) -> bool:
+    """
+    Check if the value is an iterator or a dictionary/list containing an iterator
+
+    Args:
+        value: Value to check
+
+    Returns:
+        True if an iterator is found
+    """
+    if hasattr(value, '__next__'):
+        return True
+    if type(value) == dict:
+        return any(contains_iterator(item) for item in value.values())
+    if type(value) == list:
+        return any(contains_iterator(item) for item in value)
+    return False
+
+
+def write_json_value(f, value: Any, indent: int = 4, level: int = 0) -> None:
+    """
+    Write a value as JSON, formatted the same way as json.dump with ensure_ascii=False and the given indent.
+    Iterators (for example generators reading the database) are written as lists, one item at a time
+
+    Args:
+        f: File opened for writing
+        value: Value to write
+        indent: Number of spaces per indentation level
+        level: Indentation level of the value
+    """
+    if not contains_iterator(value):
+        # Indentation of nested values in json.dumps output is increased by the level of the value
+        f.write(json.dumps(value, ensure_ascii=False, indent=indent).replace('\n', '\n' + ' ' * indent * level))
+        return
+    is_dict = type(value) == dict
+    items = iter(value.items()) if is_dict else iter(value)
+    first = True
+    for item in items:
+        f.write(('{' if is_dict else '[') if first else ',')
+        f.write('\n' + ' ' * indent * (level + 1))
+        if is_dict:
+            f.write(json.dumps(item[0], ensure_ascii=False) + ': ')
+            write_json_value(f, item[1], indent, level + 1)
+        else:
+            write_json_value(f, item, indent, level + 1)
+        first = False
+    if first:
+        f.write('{}' if is_dict else '[]')
+    else:
+        f.write('\n' + ' ' * indent * level + ('}' if is_dict else ']'))
+
+
+def write_json_stream(file_path: str, data: Any, indent: int = 4) -> None:
+    """
+    Write data to a JSON file without first creating the whole JSON text in memory.
+    Iterators in the data are written as lists, one item at a time
+
+    Args:
+        file_path: Path to the JSON file
+        data: Data to write
+        indent: Number of spaces per indentation level
+    """
+    with open(file_path, 'w', encoding='utf-8') as f:
+        write_json_value(f, data, indent)
+
+
 class ProfessorDBToJSON:
     """
     Converts SQLite database with professor data back to the original JSON format
@@ -509,44 +713,42 @@ class ProfessorDBToJSON:
 
         return result
 
-    def get_professors_table_data(self) -> List[Dict[str, Any]]:
+    def iter_professors_table_data(self) -> Iterator[Dict[str, Any]]:
         """
-        Get professors table data with their subjects from the database
+        Read professors table data with their subjects from the database, one professor at a time.
+        Professors and their subjects are read with a single query and grouped by professor
 
         Returns:
-            List of dictionaries containing professor data with subjects
-        """
-        # Get all professors
-        self.cursor.execute("SELECT * FROM professors_table")
-        professors = self.cursor.fetchall()
+            Iterator over dictionaries containing professor data with subjects
+        """
+        rows = self.conn.execute("""
+            SELECT p.id AS prof_id, p.name AS prof_name, p.title, p.institution, p.sci_discipline,
+                   s.id AS subj_id, s.subject_index, s.code, s.name AS subj_name, s.type, s.studies_programme, s.studies_type
+            FROM professors_table p
+            LEFT JOIN prof_subjects_table s ON s.professor_id = p.id
+            ORDER BY p.id, s.subject_index, s.id
+        """)
 
-        result = []
-        for prof in professors:
-            prof_id = prof["id"]
+        for prof_id, prof_rows in groupby(rows, key=lambda row: row["prof_id"]):
+            prof_rows = list(prof_rows)
+            prof = prof_rows[0]
             prof_data = {
                 "table_key": prof_id,
-                "name": prof["name"],
+                "name": prof["prof_name"],
                 "title": prof["title"],
                 "institution": prof["institution"],
                 "sci_discipline": prof["sci_discipline"]
             }
 
-            # Get subjects for this professor
-            self.cursor.execute("""
-                SELECT * FROM prof_subjects_table
-                WHERE professor_id = ?
-                ORDER BY subject_index
-            """, (prof_id,))
-
-            subjects = self.cursor.fetchall()
-
-            # Convert subjects to list of dictionaries
+            # Convert subjects to list of dictionaries (professors without subjects have a single row with no subject)
             subjects_list = []
-            for subject in subjects:
+            for subject in prof_rows:
+                if subject["subj_id"] is None:
+                    continue
                 subjects_list.append({
                     "index": subject["subject_index"],
                     "code": subject["code"],
-                    "name": subject["name"],
+                    "name": subject["subj_name"],
                     "type": subject["type"],
                     "studies_programme": subject["studies_programme"],
                     "studies_type": subject["studies_type"]
@@ -556,27 +758,31 @@ class ProfessorDBToJSON:
             prof_data["subjects"] = subjects_list
             prof_data["subjects_all"] = subjects_list.copy()
 
-            # Add to result
-            result.append(prof_data)
+            yield prof_data
 
-        return result
+    def get_professors_table_data(self) -> List[Dict[str, Any]]:
+        """
+        Get professors table data with their subjects from the database
 
-    def get_subjects_list_data(self) -> List[Dict[str, Any]]:
+        Returns:
+            List of dictionaries containing professor data with subjects
         """
-        Get subjects list data from the database for subj_list
+        return list(self.iter_professors_table_data())
+
+    def iter_subjects_list_data(self) -> Iterator[Dict[str, Any]]:
+        """
+        Read subjects list data from the database for subj_list, one subject at a time
 
         Returns:
-            List of dictionaries containing subject list data
+            Iterator over dictionaries containing subject list data
         """
-        self.cursor.execute("""
+        subjects = self.conn.execute("""
             SELECT subject_index as "index", code, name, type, sem, p, v, don, other, espb, class_points
             FROM subjects_table
-            ORDER BY subject_index
+            ORDER BY subject_index, id
         """)
-        subjects = self.cursor.fetchall()
 
-        # Convert to list of dictionaries
-        result = []
+        # Convert to dictionaries
         for subj in subjects:
             # Parse class_points JSON string back to dictionary
             class_points = {}
@@ -586,7 +792,7 @@ class ProfessorDBToJSON:
                 except json.JSONDecodeError:
                     class_points = {}
 
-            result.append({
+            yield {
                 "index": subj["index"],
                 "code": subj["code"],
                 "name": subj["name"],
@@ -598,25 +804,30 @@ class ProfessorDBToJSON:
                 "other": subj["other"],
                 "espb": subj["espb"],
                 "class_points": class_points
-            })
+            }
 
-        return result
+    def get_subjects_list_data(self) -> List[Dict[str, Any]]:
+        """
+        Get subjects list data from the database for subj_list
 
-    def get_subjects_table_data(self) -> List[Dict[str, Any]]:
+        Returns:
+            List of dictionaries containing subject list data
         """
-        Get subjects table data from the database for subj_tables
+        return list(self.iter_subjects_list_data())
+
+    def iter_subjects_table_data(self) -> Iterator[Dict[str, Any]]:
+        """
+        Read subjects table data from the database for subj_tables, one subject at a time
 
         Returns:
-            List of dictionaries containing detailed subject data
+            Iterator over dictionaries containing detailed subject data
         """
-        self.cursor.execute("""
+        subjects = self.conn.execute("""
             SELECT * FROM subjects_table
-            ORDER BY subject_index
+            ORDER BY subject_index, id
         """)
-        subjects = self.cursor.fetchall()
 
-        # Convert to list of dictionaries
-        result = []
+        # Convert to dictionaries
         for subj in subjects:
             # Format the subject code with brackets
             subject_code = f"[{subj['code']}]" if subj['code'] else ""
@@ -632,7 +843,7 @@ class ProfessorDBToJSON:
                 except json.JSONDecodeError:
                     class_points = {}
 
-            result.append({
+            yield {
                 "school": subj["school"],
                 "studies_programme": subj["studies_programme"],
                 "subject": subject_full,
@@ -646,9 +857,16 @@ class ProfessorDBToJSON:
                 "practical_classes": subj["practical_classes"],
                 "subjects_header": [],
                 "class_points": class_points
-            })
+            }
 
-        return result
+    def get_subjects_table_data(self) -> List[Dict[str, Any]]:
+        """
+        Get subjects table data from the database for subj_tables
+
+        Returns:
+            List of dictionaries containing detailed subject data
+        """
+        return list(self.iter_subjects_table_data())
 
     def get_programme_data(self) -> Dict[str, Any]:
         """
@@ -711,15 +929,18 @@ class ProfessorDBToJSON:
 
         return professors_header, subjects_header, subj_list_header, subj_tables_header
 
-    def create_professors_json(self) -> List[Dict[str, Any]]:
+    def create_professors_json(self, stream: bool = False) -> List[Dict[str, Any]]:
         """
         Create professors JSON structure from database data
 
+        Args:
+            stream: If True, professors tables data is an iterator reading the database while it is written (see write_json_stream)
+
         Returns:
             List with the professors JSON structure
         """
         professors_list = self.get_professors_list()
-        professors_tables = self.get_professors_table_data()
+        professors_tables = self.iter_professors_table_data() if stream else self.get_professors_table_data()
         professors_header, subjects_header, _, _ = self.get_headers()
 
         json_data = [
@@ -737,15 +958,19 @@ class ProfessorDBToJSON:
 
         return json_data
 
-    def create_subjects_json(self) -> List[Dict[str, Any]]:
+    def create_subjects_json(self, stream: bool = False) -> List[Dict[str, Any]]:
         """
         Create subjects JSON structure from database data
 
+        Args:
+            stream: If True, subjects data are iterators reading the database while it is written (see write_json_stream)
+
         Returns:
             List with the subjects JSON structure
         """
-        subjects_list = self.get_subjects_list_data()
-        subjects_tables = self.get_subjects_table_data()
+        subjects_list = self.iter_subjects_list_data() if stream else self.get_subjects_list_data()
+        subjects_tables = self.iter_subjects_table_data() if stream else self.get_subjects_table_data()
+        subjects_tables_all = self.iter_subjects_table_data() if stream else subjects_tables
         _, _, subj_list_header, subj_tables_header = self.get_headers()
 
         json_data = [
@@ -757,7 +982,7 @@ class ProfessorDBToJSON:
             {
                 "type": "subj_tables",
                 "data": subjects_tables,
-                "data_all": subjects_tables,  # Include full data in data_all
+                "data_all": subjects_tables_all,  # Include full data in data_all
                 "header": subj_tables_header
             }
         ]
@@ -805,20 +1030,18 @@ class ProfessorDBToJSON:
             self.connect()
 
             # Process professors data
-            professors_json_data = self.create_professors_json()
+            professors_json_data = self.create_professors_json(stream=True)
             if not os.path.exists(os.path.dirname(professors_output_path)):
                 os.makedirs(os.path.dirname(professors_output_path), exist_ok=True)
-            with open(professors_output_path, 'w', encoding='utf-8') as f:
-                json.dump(professors_json_data, f, ensure_ascii=False, indent=4)
+            write_json_stream(professors_output_path, professors_json_data)
             print(f"Successfully converted professors data to JSON file: {professors_output_path}")
 
             # Process subjects data if path provided
             if subjects_output_path:
-                subjects_json_data = self.create_subjects_json()
+                subjects_json_data = self.create_subjects_json(stream=True)
                 if not os.path.exists(os.path.dirname(subjects_output_path)):
                     os.makedirs(os.path.dirname(subjects_output_path), exist_ok=True)
-                with open(subjects_output_path, 'w', encoding='utf-8') as f:
-                    json.dump(subjects_json_data, f, ensure_ascii=False, indent=4)
+                write_json_stream(subjects_output_path, subjects_json_data)
                 print(f"Successfully converted subjects data to JSON file: {subjects_output_path}")
 
             # Process results data if path provided
@@ -836,10 +1059,36 @@ class ProfessorDBToJSON:
             self.close()
 
 
+def configure_bulk_load(conn: sqlite3.Connection) -> None:
+    """
+    Set pragmas for loading large amounts of data: write-ahead log, fewer disk syncs and a larger page cache
+
+    Args:
+        conn: Open connection to the database
+    """
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA cache_size=-65536")  # 64 MB
+    conn.execute("PRAGMA temp_store=MEMORY")
+
+
+def finish_bulk_load(conn: sqlite3.Connection) -> None:
+    """
+    Write the write-ahead log to the database file and switch back to the default journal mode,
+    so the database is a single file again (it is copied when exported)
+
+    Args:
+        conn: Open connection to the database
+    """
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    conn.execute("PRAGMA journal_mode=DELETE")
+
+
 def json_to_db(professors_json_path: str = None, subjects_json_path: str = None,
                results_json_path: str = None, db_path: str = "tmp/acreditation.db") -> None:
     """
-    Helper function to convert JSON to database
+    Helper function to convert JSON to database. Tables of each converted JSON file are cleared first, so converting again does not duplicate rows.
+    All converters share one connection and all data is loaded in a single transaction
 
     Args:
         professors_json_path: Path to the JSON file containing professor data
@@ -850,17 +1099,26 @@ def json_to_db(professors_json_path: str = None, subjects_json_path: str = None,
     if not os.path.exists(os.path.dirname(db_path)):
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
 
-    if professors_json_path:
-        prof_converter = ProfessorDBConverter(db_path)
-        prof_converter.convert(professors_json_path)
+    conn = sqlite3.connect(db_path)
+    try:
+        configure_bulk_load(conn)
 
-    if subjects_json_path:
-        subj_converter = SubjectDBConverter(db_path)
-        subj_converter.convert(subjects_json_path)
+        if professors_json_path:
+            prof_converter = ProfessorDBConverter(db_path, conn=conn)
+            prof_converter.convert(professors_json_path)
 
-    if results_json_path:
-        results_converter = ResultsDBConverter(db_path)
-        results_converter.convert(results_json_path)
+        if subjects_json_path:
+            subj_converter = SubjectDBConverter(db_path, conn=conn)
+            subj_converter.convert(subjects_json_path)
+
+        if results_json_path:
+            results_converter = ResultsDBConverter(db_path, conn=conn)
+            results_converter.convert(results_json_path)
+
+        conn.commit()
+        finish_bulk_load(conn)
+    finally:
+        conn.close()
 
 
 def db_to_json(db_path: str, professors_output_path: str,
@@ -882,3 +1140,70 @@ def db_to_json(db_path: str, professors_output_path: str,
         os.makedirs(os.path.dirname(results_output_path), exist_ok=True)
     converter = ProfessorDBToJSON(db_path)
     converter.convert_to_json(professors_output_path, subjects_output_path, results_output_path)
+
+
+def source_fingerprints_path(db_path: str) -> str:
+    """
+    Form the path to the file with fingerprints of the JSON files the database was created from.
+    Fingerprints are kept beside the database, so they are not a part of the database schema or of exported databases
+
+    Args:
+        db_path: Path to the SQLite database
+
+    Returns:
+        Path to the fingerprints file (<db_path>.fingerprints.json)
+    """
+    return f"{db_path}.fingerprints.json"
+
+
+def database_stamp(db_path: str) -> List[int]:
+    """
+    Form a stamp of the database file (modification time and size), used to find out if the database was replaced or changed
+
+    Args:
+        db_path: Path to the SQLite database
+
+    Returns:
+        Modification time (ns) and size of the database file
+    """
+    stat = os.stat(db_path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def read_source_fingerprints(db_path: str) -> Dict[str, str]:
+    """
+    Read fingerprints of the JSON files the database was created from
+
+    Args:
+        db_path: Path to the SQLite database
+
+    Returns:
+        Dictionary of fingerprints by source name, empty if not saved or if the database changed since they were saved
+    """
+    try:
+        with open(source_fingerprints_path(db_path), 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+        if saved.get('database') != database_stamp(db_path):
+            return {}
+        return saved.get('sources', {})
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+
+def save_source_fingerprints(db_path: str, fingerprints: Dict[str, str]) -> None:
+    """
+    Save fingerprints of the JSON files the database was created from
+
+    Args:
+        db_path: Path to the SQLite database
+        fingerprints: Dictionary of fingerprints by source name
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        # Fingerprints were kept in the database by earlier versions
+        conn.execute("DROP TABLE IF EXISTS source_fingerprints")
+        conn.commit()
+    finally:
+        conn.close()
+    with open(source_fingerprints_path(db_path), 'w', encoding='utf-8') as f:
+        json.dump({'database': database_stamp(db_path), 'sources': fingerprints}, f, indent=4)
@@ -0,0 +1,134 @@
+"""
+Directory scanning. The documentation directory is walked once with os.scandir, and both the tree text (util.tree) and the structure (util.dir_struct) are formed from the scan.
+Each directory is listed with a single os.scandir call, using the file type information of the directory entries instead of a stat call per entry.
+Subdirectories of the scanned directory can be scanned in parallel threads (faster on network shares).
+A scan can be saved and updated on the next run: directories with unchanged modification times are not listed again.
+"""
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+
+def list_entries(path, mtime_ns, previous=None):
+    """
+    Lists entries of a directory. If the directory modification time did not change since the previous scan, the previous listing is used.
+
+    Args:
+        path (str):              Path to the directory
+        mtime_ns (int):          Modification time of the directory, in nanoseconds
+        previous (dict):         (Optional) Previous scan of the directory. Default is None
+
+    Returns:
+        (list):                  List of (path, name, is_dir, is_file, previous scan of the entry or None)
+    """
+    previous = previous if previous is not None and previous.get('is_dir') == True else None
+    if previous is not None and previous.get('mtime_ns') == mtime_ns:
+        # Listing did not change, but subdirectories are still scanned, as their changes do not change the modification time of this directory
+        return [(child['path'], child['name'], child['is_dir'], child['is_file'], child) for child in previous['contents']]
+    previous_contents = {child['name']: child for child in previous['contents']} if previous is not None else {}
+    with os.scandir(path) as entries:
+        return [(entry.path, entry.name, entry.is_dir(), entry.is_file(), previous_contents.get(entry.name)) for entry in entries]
+
+def scan_entry(path, name, is_dir, is_file, previous=None):
+    """
+    Scans a directory entry, recursively for directories.
+
+    Args:
+        path (str):              Path to the file/directory
+        name (str):              Name of the file/directory
+        is_dir (bool):           True if the entry is a directory (or a link to a directory)
+        is_file (bool):          True if the entry is a file (or a link to a file)
+        previous (dict):         (Optional) Previous scan of the entry, see list_entries. Default is None
+
+    Returns:
+        (dict):                  Scanned entry: {'name', 'path', 'is_dir', 'is_file', 'mtime_ns' (directories only), 'contents' (directories only, else empty)}
+    """
+    node = {'name': name, 'path': path, 'is_dir': is_dir, 'is_file': is_file, 'contents': []}
+    if not is_dir:
+        return node
+    node['mtime_ns'] = os.stat(path).st_mtime_ns
+    node['contents'] = [scan_entry(*entry) for entry in list_entries(path, node['mtime_ns'], previous=previous)]
+    return node
+
+def scan_dir(dir_path, threads=0, previous=None):
+    """
+    Scans a directory recursively.
+
+    Args:
+        dir_path (str):          Absolute path to the directory
+        threads (int):           (Optional) Number of threads scanning subdirectories of the directory in parallel. If 0 or 1, subdirectories are scanned sequentially. Default is 0
+        previous (dict):         (Optional) Previous scan of the directory, used to skip listing unchanged directories. Default is None
+
+    Returns:
+        (dict):                  Scanned directory, see scan_entry
+    """
+    dir_path = str(dir_path)
+    name = os.path.basename(os.path.normpath(dir_path))
+    if previous is not None and previous.get('path') != dir_path:
+        previous = None
+    if threads <= 1 or not os.path.isdir(dir_path):
+        return scan_entry(dir_path, name, os.path.isdir(dir_path), os.path.isfile(dir_path), previous=previous)
+    # Top level is listed here, its entries are scanned in parallel
+    node = {'name': name, 'path': dir_path, 'is_dir': True, 'is_file': False, 'mtime_ns': os.stat(dir_path).st_mtime_ns, 'contents': []}
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        node['contents'] = list(executor.map(lambda entry: scan_entry(*entry), list_entries(dir_path, node['mtime_ns'], previous=previous)))
+    return node
+
+def changed_paths(previous, current):
+    """
+    Compares two scans of a directory.
+
+    Args:
+        previous (dict):         Previous scan
+        current (dict):          Current scan
+
+    Returns:
+        (list):                  Paths added since the previous scan
+        (list):                  Paths removed since the previous scan
+    """
+    def paths(node):
+        found = set()
+        stack = [node]
+        while len(stack) > 0:
+            item = stack.pop()
+            found.add(item['path'])
+            stack.extend(item['contents'])
+        return found
+    previous_paths = paths(previous) if previous is not None else set()
+    current_paths = paths(current)
+    return sorted(current_paths - previous_paths), sorted(previous_paths - current_paths)
+
+def save_scan(scan, file_path):
+    """
+    Saves a scan as a .json file.
+
+    Args:
+        scan (dict):             Scanned directory
+        file_path (str):         Absolute path to the .json file
+    """
+    try:
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(scan, f)
+    except Exception as e:
+        print(f'Error saving directory scan to {file_path}:\n    {e}')
+
+def load_scan(file_path):
+    """
+    Loads a saved scan.
+
+    Args:
+        file_path (str):         Absolute path to the .json file
+
+    Returns:
+        (dict or None):          Scanned directory, or None if not found or not readable
+    """
+    if not os.path.isfile(file_path):
+        return None
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f'Error loading directory scan from {file_path}:\n    {e}')
+        return None
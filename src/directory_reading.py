@@ -9,10 +9,12 @@ import shutil
 import sys
 
 import src.util as util
+import src.dir_scan as dir_scan
+import src.workspace as workspace
 
 is_windows = sys.platform.startswith('win')
 
-def list_dir(root_dir, dir_to_list='', dir_tree='', save_struct=True, convert_to_latin=False):
+def list_dir(root_dir, dir_to_list='', dir_tree='', save_struct=True, convert_to_latin=False, scan=None):
     """
     Reads structure and creates a tree of the given directory.
 
@@ -22,6 +24,7 @@ def list_dir(root_dir, dir_to_list='', dir_tree='', save_struct=True, convert_to
         dir_tree (str):          (Optional) Tree structure representation of the directory. If not passed, it is formed. Default is ''
         save_struct (str):       (Optional) If True, the structure is saved in a file. Default is True
         convert_to_latin (bool): If True, cyrillic characters of the files/directories are converted to latin characters. Files/directories are renamed accordingly. Default is False
+        scan (dict):             (Optional) Scan of the directory (see dir_scan.scan_dir), used to form both the tree and the structure. If not passed, the directory is scanned once. Default is None
 
     Returns:
         (list):                  List of all files in the directory
@@ -30,10 +33,12 @@ def list_dir(root_dir, dir_to_list='', dir_tree='', save_struct=True, convert_to
     """
     dir_to_list = os.path.join(root_dir, Path('tmp/imput_files')) if dir_to_list == '' else dir_to_list
     dir_struct = []
+    # Directory is scanned once, for both the tree and the structure
+    scan = scan if scan is not None else dir_scan.scan_dir(dir_to_list)
     # Print and save tree structure of the documentation directory
-    dir_tree = util.print_save_tree(root_dir=root_dir, formed_tree=dir_tree, dir_path=dir_to_list, save_dir=os.path.join(root_dir, Path('tmp')), print_tree=False)
+    dir_tree = util.print_save_tree(root_dir=root_dir, formed_tree=dir_tree, dir_path=dir_to_list, save_dir=os.path.join(root_dir, Path('tmp')), print_tree=False, scan=scan)
     # Read a structure of the documentation directory
-    dir_struct = util.dir_struct(doc_dir=dir_to_list, process_names=True, convert_to_latin=convert_to_latin)
+    dir_struct = util.dir_struct(doc_dir=dir_to_list, process_names=True, convert_to_latin=convert_to_latin, scan=scan)
     if save_struct == True:
         # Save structure of the documentation directory
         struct_save_dir = os.path.join(root_dir, 'tmp')
@@ -75,7 +80,7 @@ def load_list_dir(root_dir, dir_struct_file='/tmp/documentation_structure.json')
     return dir_struct
 
 
-def copy_read_doc_dir(root_dir, documentation_dir, working_dir='/tmp/input_files', copy_documentation=True, clear_dir=True, overwrite=True, load_struct=False, convert_names_to_latin=False):
+def copy_read_doc_dir(root_dir, documentation_dir, working_dir='/tmp/input_files', copy_documentation=True, clear_dir=True, overwrite=True, load_struct=False, convert_names_to_latin=False, scan_threads=0, workspace_mode='copy', copy_threads=4, copy_progress_callback=None):
     """
     Copies the given documentation directory to a /tmp directory.
 
@@ -86,8 +91,12 @@ def copy_read_doc_dir(root_dir, documentation_dir, working_dir='/tmp/input_files
         copy_documentation (str):           (Optional) If True, the documentation directory is copied. Default is True
         clear_dir (str):                    (Optional) If True, clears the working_dir directory before copying. Default is True
         overwrite (str):                    (Optional) If True, overwrites the files in the working_dir directory. Default is True
-        load_struct (str):                  (Optional) If True, the structure of the documentation directory is loaded from a file if it exists. Default is False
+        load_struct (str):                  (Optional) If True, the saved scan of the documentation directory (tmp/documentation_scan.json) is updated if it exists: only directories changed since it was saved are listed again. Default is False
         convert_names_to_latin (bool):      If True, cyrillic characters of the files/directories are converted to latin characters. Files/directories are renamed accordingly. Default is False
+        scan_threads (int):                 (Optional) Number of threads scanning subdirectories of the documentation directory in parallel. Default is 0 - sequential
+        workspace_mode (str):               (Optional) How documentation files are copied: 'copy', 'link' (hardlinks or reflinks) or 'lazy' (symbolic links, see workspace.py). Default is 'copy'
+        copy_threads (int):                 (Optional) Number of threads copying documentation files. Files already up to date in the working directory are not copied again. Default is 4
+        copy_progress_callback (callable):  (Optional) Called with (number of copied files, number of all files) while files are copied. Default is None
 
     Returns:
         (list, dict):                       List of all files in the directory, structure of the directory
@@ -114,17 +123,19 @@ def copy_read_doc_dir(root_dir, documentation_dir, working_dir='/tmp/input_files
     # Copy documentation directory contents to working_dir if copy_documentation is set to True
     if copy_documentation == True:
         print(f'Copying files:\n    from {documentation_dir}\n    to {working_dir}')
-        shutil.copytree(f'{'\\\\?\\' if is_windows == True else ''}{documentation_dir}', f'{'\\\\?\\' if is_windows == True else ''}{os.path.join(root_dir, working_dir)}', dirs_exist_ok=overwrite, symlinks=True)
+        workspace.build_workspace(f'{'\\\\?\\' if is_windows == True else ''}{documentation_dir}', f'{'\\\\?\\' if is_windows == True else ''}{os.path.join(root_dir, working_dir)}', mode=workspace_mode, overwrite=overwrite, threads=copy_threads, progress_callback=copy_progress_callback)
         print('Copy complete')
-    # Form a tree and structure of the documentation directory
-    dir_tree = util.print_save_tree(root_dir=root_dir, dir_path=doc_dir_path)
-    # Try to load saved structure of the documentation directory if load_struct is set to True
-    dir_struct = None
-    if load_struct == True:
-        dir_struct = load_list_dir(root_dir=root_dir)
-    # Otherwise, form a tree structure of the documentation directory
-    if dir_struct == None:
+    # Scan the documentation directory once. If load_struct is set to True, the saved scan is updated instead
+    scan_path = os.path.join(root_dir, Path('tmp/documentation_scan.json'))
+    previous_scan = dir_scan.load_scan(scan_path) if load_struct == True else None
+    scan = dir_scan.scan_dir(str(doc_dir_path), threads=scan_threads, previous=previous_scan)
+    if previous_scan is not None:
+        added, removed = dir_scan.changed_paths(previous_scan, scan)
+        print(f'Updated saved structure of the documentation directory: {len(added)} paths added, {len(removed)} paths removed')
+    else:
         print('Saved structure of the documentation directory not loaded. Forming a new structure...')
-        # Read structure of the documentation directory
-        dir_struct, doc_structure_tree = list_dir(root_dir=root_dir, dir_to_list=doc_dir_path, dir_tree=dir_tree, save_struct=True, convert_to_latin=convert_names_to_latin)
+    dir_scan.save_scan(scan, scan_path)
+    # Form a tree and structure of the documentation directory from the scan
+    dir_tree = util.print_save_tree(root_dir=root_dir, dir_path=doc_dir_path, scan=scan)
+    dir_struct, doc_structure_tree = list_dir(root_dir=root_dir, dir_to_list=str(doc_dir_path), dir_tree=dir_tree, save_struct=True, convert_to_latin=convert_names_to_latin, scan=scan)
     return dir_struct, dir_tree, doc_dir_path
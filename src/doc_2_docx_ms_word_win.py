@@ -1,16 +1,234 @@
 """
-Converts .doc file to .docx file using Microsoft Word.
+Converts .doc file to .docx file using Microsoft Word (Windows) or LibreOffice Writer (Linux).
+On Linux, conversions run in a pool of headless LibreOffice instances, each with its own user profile, so multiple files can be converted concurrently.
 """
 
+import atexit
+import contextlib
+from importlib import metadata
 import os
 from pathlib import Path
+import queue
+import shutil
 import subprocess
 import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+def libreoffice_executable():
+    """
+    Finds the LibreOffice executable used for conversions.
+
+    Returns:
+        (str):                  Path to soffice or lowriter, or 'lowriter' if neither is found
+    """
+    return shutil.which('soffice') or shutil.which('lowriter') or 'lowriter'
+
+
+class LibreOfficeConverterPool:
+    """
+    Pool of headless LibreOffice instances used for .doc to .docx conversion.
+    Each instance has its own user profile, which is kept between conversions (profile creation is the slowest part of a cold start),
+    and instances with separate profiles can run at the same time.
+    Profiles are kept in a directory of the process (<profiles_dir>/<process id>), so pools of different processes (e.g. batch runs) never start
+    LibreOffice with the same profile - a second instance with the same profile hands its request over to the running one and creates no file.
+    """
+
+    def __init__(self, size=None, profiles_dir=None, timeout=300):
+        """
+        Args:
+            size (int):             (Optional) Number of LibreOffice instances. Default is None - number of CPUs, up to 4
+            profiles_dir (str):     (Optional) Directory where user profiles of the instances are kept, in a subdirectory of the process. Default is None - <system temp dir>/autocreditation_lo_profiles
+            timeout (int):          (Optional) Maximum conversion time of a single file, in seconds. Default is 300
+        """
+        self.size = size if size is not None else min(os.cpu_count() or 1, 4)
+        profiles_dir = profiles_dir if profiles_dir is not None else os.path.join(tempfile.gettempdir(), 'autocreditation_lo_profiles')
+        self.profiles_dir = os.path.join(profiles_dir, str(os.getpid()))
+        self.timeout = timeout
+        self.executable = libreoffice_executable()
+        self.slots = queue.Queue()
+        for index in range(self.size):
+            self.slots.put(index)
+        self.executor = ThreadPoolExecutor(max_workers=self.size)
+
+    def profile_url(self, slot):
+        """
+        Forms URL of the user profile of the given instance.
+        """
+        return Path(os.path.join(self.profiles_dir, f'slot_{slot}')).absolute().as_uri()
+
+    def convert(self, doc_path, docx_path):
+        """
+        Converts .doc file to .docx file, using the first free LibreOffice instance.
+
+        Args:
+            doc_path (str):         Absolute path to the .doc file
+            docx_path (str):        Absolute path to the .docx file. .docx extension can be omitted.
+        Returns:
+            (str):                  Absolute path to the created .docx file, or '' if conversion failed
+        """
+        docx_path = docx_path[:-1] if docx_path[-1] == '.' else docx_path
+        docx_path = docx_path if docx_path.endswith('.docx') else docx_path + '.docx'
+        converted_dir_name = os.path.dirname(docx_path)
+        os.makedirs(converted_dir_name, exist_ok=True)
+        # Each conversion writes to its own directory, so files with the same name can be converted at the same time
+        out_dir = tempfile.mkdtemp(dir=converted_dir_name)
+        slot = self.slots.get()
+        try:
+            subprocess.run([self.executable, '--headless', '--norestore', f'-env:UserInstallation={self.profile_url(slot)}',
+                            '--convert-to', 'docx', '--outdir', out_dir, doc_path],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=self.timeout, check=False)
+            converted_path = os.path.join(out_dir, f'{Path(doc_path).stem}.docx')
+            if not os.path.exists(converted_path):
+                print(f'Error converting {doc_path}: converted file not created')
+                return ''
+            os.replace(converted_path, docx_path)
+            return docx_path
+        except subprocess.TimeoutExpired:
+            print(f'Error converting {doc_path}: conversion timed out after {self.timeout} s')
+            return ''
+        finally:
+            self.slots.put(slot)
+            shutil.rmtree(out_dir, ignore_errors=True)
+
+    def convert_batch(self, conversions):
+        """
+        Converts multiple .doc files to .docx files concurrently.
+
+        Args:
+            conversions (list):     List of (doc_path, docx_path) pairs
+        Returns:
+            (list):                 Absolute paths to the created .docx files, in the order of the given conversions ('' for failed conversions)
+        """
+        return list(self.executor.map(lambda conversion: self.convert(*conversion), conversions))
+
+    def close(self):
+        """
+        Waits for running conversions to finish, shuts the pool down and removes the user profiles of the instances.
+        """
+        self.executor.shutdown(wait=True)
+        shutil.rmtree(self.profiles_dir, ignore_errors=True)
+
+
+_converter_pool = None
+_converter_pool_lock = threading.Lock()
+
+def get_converter_pool():
+    """
+    Returns the LibreOffice converter pool shared by all conversions of the process. The pool is created on first use.
+
+    Returns:
+        (LibreOfficeConverterPool): Converter pool
+    """
+    global _converter_pool
+    with _converter_pool_lock:
+        if _converter_pool is None:
+            _converter_pool = LibreOfficeConverterPool()
+            atexit.register(_converter_pool.close)
+        return _converter_pool
+
+
+_word_lock = threading.Lock()
+
+@contextlib.contextmanager
+def word_application():
+    """
+    Starts Microsoft Word for automation from the calling thread and quits it when done (Windows).
+    Word is used by one thread at a time - Dispatch returns the running Word instance, so Quit of one conversion would close documents of another.
+
+    Returns:
+        (object):               Word application
+    """
+    import pythoncom
+    from win32com import client as wc
+    with _word_lock:
+        # COM has to be initialized in every thread that uses it
+        pythoncom.CoInitialize()
+        try:
+            # word = wc.DispatchEx("Word.Application")
+            word = wc.Dispatch('word.Application')
+            word.Visible = False
+            # Disable macros
+            word.AutomationSecurity = 3
+            try:
+                yield word
+            finally:
+                word.Quit()
+        finally:
+            pythoncom.CoUninitialize()
+
+
+def word_version():
+    """
+    Reads the installed Microsoft Word version without starting Word (Windows): file version of WINWORD.EXE found in the registry,
+    or the version of the registered Word.Application if the file version can not be read.
+
+    Returns:
+        (str):                  Microsoft Word version, '' if it can not be read
+    """
+    import winreg
+    try:
+        with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r'SOFTWARE\Microsoft\Windows\CurrentVersion\App Paths\Winword.exe') as key:
+            winword_path = winreg.QueryValue(key, None)
+        import win32api
+        info = win32api.GetFileVersionInfo(winword_path, '\\')
+        return f"{info['FileVersionMS'] >> 16}.{info['FileVersionMS'] & 0xFFFF}.{info['FileVersionLS'] >> 16}.{info['FileVersionLS'] & 0xFFFF}"
+    except Exception:
+        pass
+    try:
+        # e.g. Word.Application.16
+        with winreg.OpenKey(winreg.HKEY_CLASSES_ROOT, r'Word.Application\CurVer') as key:
+            return winreg.QueryValue(key, None).replace('Word.Application.', '')
+    except OSError as e:
+        print(f'Error reading Microsoft Word version:\n    {e}')
+        return ''
+
+def read_converter_version():
+    """
+    Reads the version of the converter used by doc2docx: LibreOffice version (soffice --version) on Linux, Microsoft Word and pywin32 versions on Windows.
+    Neither converter is started for automation, so reading the version does not slow down runs whose conversions are all cached.
+
+    Returns:
+        (str):                  Converter name and version, only the name if the version can not be read
+    """
+    if sys.platform.startswith('win'):
+        try:
+            pywin32_version = metadata.version('pywin32')
+        except metadata.PackageNotFoundError:
+            pywin32_version = ''
+        version = word_version()
+        return f'word-{version}-pywin32-{pywin32_version}' if version != '' else 'word'
+    elif sys.platform.startswith('linux'):
+        try:
+            version = subprocess.run([libreoffice_executable(), '--version'], capture_output=True, text=True, timeout=60, check=False).stdout.strip()
+            return f'libreoffice-{version}' if version != '' else 'libreoffice'
+        except (OSError, subprocess.TimeoutExpired) as e:
+            print(f'Error reading LibreOffice version:\n    {e}')
+            return 'libreoffice'
+    return ''
+
+_converter_version = None
+_converter_version_lock = threading.Lock()
+
+def converter_version():
+    """
+    Forms the name and version of the converter used by doc2docx, used as a part of the conversion cache key. The version is read once per process.
+
+    Returns:
+        (str):                  Converter name and version
+    """
+    global _converter_version
+    with _converter_version_lock:
+        if _converter_version is None:
+            _converter_version = read_converter_version()
+        return _converter_version
 
 
 def doc2docx(doc_path, docx_path):
     """
-    Converts .doc file to .docx file using Microsoft Word.
+    Converts .doc file to .docx file using Microsoft Word (Windows) or LibreOffice Writer (Linux).
 
     Args:
         doc_path (str):         Absolute path to the .doc file
@@ -33,21 +251,28 @@ def doc2docx(doc_path, docx_path):
     if not os.path.exists(converted_dir_name):
         os.makedirs(converted_dir_name, exist_ok=True)
     if sys.platform.startswith('win'):
-        # word = wc.DispatchEx("Word.Application")
-        word = wc.Dispatch('word.Application')
-        word.Visible = False
-        # Disable macros
-        word.AutomationSecurity = 3
-        doc = word.Documents.Open(doc_path)
-        doc.SaveAs(docx_path,16)  #16 doc2docx
-        doc.Close()
-        word.Quit()
+        with word_application() as word:
+            doc = word.Documents.Open(doc_path)
+            doc.SaveAs(docx_path,16)  #16 doc2docx
+            doc.Close()
         return docx_path if docx_path.endswith('.docx') else docx_path + '.docx'
     elif sys.platform.startswith('linux'):
-        subprocess.call(['lowriter', '--convert-to', 'docx', '--outdir', f'{os.sep.join(docx_path.split(os.sep)[:-1])}', doc_path])
-        if converted_file_name.replace('.docx', '') != doc_path.split(os.sep)[-1].replace('.doc', ''):
-            os.rename(os.path.join(docx_path.split(os.sep)[:-1]), doc_path.split(os.sep)[:-1], docx_path)
-        return docx_path if docx_path.endswith('.docx') else docx_path + '.docx'
+        return get_converter_pool().convert(doc_path, docx_path)
     else:
         print('Unsupported platform. Please use Windows or Linux.')
-        return ''
\ No newline at end of file
+        return ''
+
+def doc2docx_batch(conversions):
+    """
+    Converts multiple .doc files to .docx files. On Linux, files are converted concurrently in the LibreOffice converter pool.
+    On Windows, files are converted one after another using Microsoft Word (also across threads, see word_application).
+
+    Args:
+        conversions (list):     List of (doc_path, docx_path) pairs, absolute paths. .docx extension can be omitted.
+    Returns:
+        (list):                 Absolute paths to the created .docx files, in the order of the given conversions
+    """
+    conversions = [(str(doc_path), str(docx_path)) for doc_path, docx_path in conversions]
+    if sys.platform.startswith('linux'):
+        return get_converter_pool().convert_batch(conversions)
+    return [doc2docx(doc_path=doc_path, docx_path=docx_path) for doc_path, docx_path in conversions]
\ No newline at end of file
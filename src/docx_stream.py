@@ -0,0 +1,345 @@
+"""
+Streaming reading of .docx files, without converting them to .html.
+The document part (word/document.xml) is read from the .docx (zip) file with an incremental XML parser (xml.etree.ElementTree.iterparse),
+and processed elements are cleared while parsing, so memory use does not grow with the size of the document.
+- Hyperlinks: targets of hyperlinks are read from the relationships part of the document (word/_rels/document.xml.rels),
+  hyperlinks and HYPERLINK fields are found in paragraphs and each is returned as a line in the format of the mammoth .html conversion
+  (<p>text <a href="target">link text</a> text</p>), so lines are processed the same way as lines found in the converted .html file
+- Tables: tables are returned one at a time, as soon as each table is parsed, as rows of cell texts in the same format as tables read from the converted .html file (see html_tables.py).
+  Cells are read the same way as in the mammoth .html conversion: cells spanning columns (gridSpan) and vertically merged cells (vMerge) are repeated in each spanned cell,
+  leading header rows (tblHeader) are not included, deleted rows and deleted or moved text are skipped, and text of tables nested in a cell is added to the text of the cell
+"""
+
+import posixpath
+import re
+import xml.etree.ElementTree as ET
+import zipfile
+
+import src.html_tables as html_tables
+
+
+# Namespaces of the document (transitional and strict Office Open XML)
+W_NAMESPACES = ['http://schemas.openxmlformats.org/wordprocessingml/2006/main', 'http://purl.oclc.org/ooxml/wordprocessingml/main']
+R_NAMESPACES = ['http://schemas.openxmlformats.org/officeDocument/2006/relationships', 'http://purl.oclc.org/ooxml/officeDocument/relationships']
+MC_CHOICE = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Choice'
+PACKAGE_RELATIONSHIPS = '{http://schemas.openxmlformats.org/package/2006/relationships}Relationship'
+OFFICE_DOCUMENT_TYPES = ['http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument', 'http://purl.oclc.org/ooxml/officeDocument/relationships/officeDocument']
+
+
+def w_tags(name):
+    """
+    Returns the qualified names of a document element, in all document namespaces.
+    """
+    return set([f'{{{namespace}}}{name}' for namespace in W_NAMESPACES])
+
+def w_attribute(elem, name, namespaces=W_NAMESPACES):
+    """
+    Returns the value of a namespaced attribute of an element, None if it is not set.
+    """
+    for namespace in namespaces:
+        value = elem.get(f'{{{namespace}}}{name}')
+        if value is not None:
+            return value
+    return None
+
+
+P_TAGS, T_TAGS, TAB_TAGS, BODY_TAGS = w_tags('p'), w_tags('t'), w_tags('tab'), w_tags('body')
+HYPERLINK_TAGS, FLD_SIMPLE_TAGS, FLD_CHAR_TAGS, INSTR_TEXT_TAGS = w_tags('hyperlink'), w_tags('fldSimple'), w_tags('fldChar'), w_tags('instrText')
+TBL_TAGS, TR_TAGS, TC_TAGS, TR_PR_TAGS, TC_PR_TAGS = w_tags('tbl'), w_tags('tr'), w_tags('tc'), w_tags('trPr'), w_tags('tcPr')
+GRID_SPAN_TAGS, V_MERGE_TAGS, TBL_HEADER_TAGS, BOOKMARK_START_TAGS = w_tags('gridSpan'), w_tags('vMerge'), w_tags('tblHeader'), w_tags('bookmarkStart')
+NO_BREAK_HYPHEN_TAGS, SOFT_HYPHEN_TAGS, NOTE_REFERENCE_TAGS = w_tags('noBreakHyphen'), w_tags('softHyphen'), w_tags('footnoteReference') | w_tags('endnoteReference')
+DEL_TAGS = w_tags('del')
+# Elements whose content is not shown (deleted and moved text, alternative content other than the fallback), the same as in the mammoth conversion
+IGNORED_TAGS = DEL_TAGS | w_tags('moveFrom') | set([MC_CHOICE])
+
+
+def read_relationships(docx_file, rels_path):
+    """
+    Reads a relationships part of a .docx file.
+
+    Args:
+        docx_file (ZipFile):     Opened .docx file
+        rels_path (str):         Path of the relationships part in the .docx file
+
+    Returns:
+        (dict):                  Relationships by id: {'type', 'target', 'external'}
+    """
+    if rels_path not in docx_file.namelist():
+        return {}
+    with docx_file.open(rels_path) as f:
+        root = ET.parse(f).getroot()
+    return {rel.get('Id'): {'type': rel.get('Type', ''), 'target': rel.get('Target', ''), 'external': rel.get('TargetMode', '') == 'External'}
+            for rel in root.iter(PACKAGE_RELATIONSHIPS)}
+
+def document_part(docx_file):
+    """
+    Finds the main document part of a .docx file.
+
+    Args:
+        docx_file (ZipFile):     Opened .docx file
+
+    Returns:
+        (str):                   Path of the document part (usually word/document.xml)
+        (str):                   Path of the relationships part of the document (usually word/_rels/document.xml.rels)
+    """
+    part = 'word/document.xml'
+    for rel in read_relationships(docx_file, '_rels/.rels').values():
+        if rel['type'] in OFFICE_DOCUMENT_TYPES:
+            part = rel['target'].lstrip('/')
+            break
+    return part, posixpath.join(posixpath.dirname(part), '_rels', f'{posixpath.basename(part)}.rels')
+
+def escape_html(text):
+    """
+    Escapes text and attribute values for .html, the same way as the mammoth .html writer.
+    """
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;').replace('"', '&quot;')
+
+def field_hyperlink(instruction):
+    """
+    Finds the target of a HYPERLINK field, the same way as mammoth.
+
+    Args:
+        instruction (str):       Field instruction, e.g. 'HYPERLINK "../file.pdf"'
+
+    Returns:
+        (str or None):           Target of the hyperlink ('#anchor' for links within the document), None if the field is not a hyperlink
+    """
+    match = re.match(r'\s*HYPERLINK "(.*)"', instruction)
+    if match:
+        return match.group(1)
+    match = re.match(r'\s*HYPERLINK\s+\\l\s+"(.*)"', instruction)
+    if match:
+        return f'#{match.group(1)}'
+    return None
+
+def paragraph_link_lines(segments, links):
+    """
+    Forms .html lines of a paragraph, one for each hyperlink of the paragraph. Text of other hyperlinks of the paragraph is kept as text.
+
+    Args:
+        segments (list):         Text of the paragraph, as (text, hyperlink id or None)
+        links (dict):            Targets of hyperlinks by id
+
+    Returns:
+        (list):                  .html lines
+    """
+    lines = []
+    link_ids = list(dict.fromkeys([link_id for text, link_id in segments if link_id is not None]))
+    for link_id in link_ids:
+        line, in_link = '', False
+        for text, segment_link_id in segments:
+            if segment_link_id == link_id and in_link == False:
+                line += f'<a href="{escape_html(links[link_id])}">'
+                in_link = True
+            elif segment_link_id != link_id and in_link == True:
+                line += '</a>'
+                in_link = False
+            line += escape_html(text)
+        line += '</a>' if in_link == True else ''
+        lines.append(f'<p>{line}</p>')
+    return lines
+
+def hyperlink_lines(docx_path):
+    """
+    Finds hyperlinks in a .docx file, reading the document part with an incremental XML parser.
+
+    Args:
+        docx_path (str):         Absolute path to the .docx file
+
+    Returns:
+        (list):                  .html lines of paragraphs with hyperlinks, one line for each hyperlink, in the format of the mammoth .html conversion
+    """
+    lines = []
+    with zipfile.ZipFile(docx_path) as docx_file:
+        part, rels_path = document_part(docx_file)
+        relationships = read_relationships(docx_file, rels_path)
+        links = {}
+        # Open paragraphs (paragraphs in text boxes are nested), active hyperlinks and fields
+        paragraphs, active_links, fields = [], [], []
+        body = None
+        with docx_file.open(part) as f:
+            for event, elem in ET.iterparse(f, events=('start', 'end')):
+                tag = elem.tag
+                if event == 'start':
+                    if tag in P_TAGS:
+                        paragraphs.append([])
+                    elif tag in BODY_TAGS:
+                        body = elem
+                    elif tag in HYPERLINK_TAGS:
+                        rel = relationships.get(w_attribute(elem, 'id', namespaces=R_NAMESPACES))
+                        anchor = w_attribute(elem, 'anchor')
+                        href = rel['target'] if rel is not None else None
+                        if anchor is not None:
+                            href = f'{href}#{anchor}' if href is not None else f'#{anchor}'
+                        links[len(links)] = href
+                        active_links.append(len(links) - 1 if href is not None else None)
+                    elif tag in FLD_SIMPLE_TAGS:
+                        href = field_hyperlink(w_attribute(elem, 'instr') or '')
+                        links[len(links)] = href
+                        active_links.append(len(links) - 1 if href is not None else None)
+                    elif tag in FLD_CHAR_TAGS:
+                        field_type = w_attribute(elem, 'fldCharType')
+                        if field_type == 'begin':
+                            fields.append({'instruction': '', 'link_id': None})
+                        elif field_type == 'separate' and len(fields) > 0:
+                            href = field_hyperlink(fields[-1]['instruction'])
+                            if href is not None:
+                                links[len(links)] = href
+                                fields[-1]['link_id'] = len(links) - 1
+                        elif field_type == 'end' and len(fields) > 0:
+                            fields.pop()
+                    continue
+                if tag in T_TAGS or tag in TAB_TAGS:
+                    if len(paragraphs) > 0:
+                        field_links = [field['link_id'] for field in fields if field['link_id'] is not None]
+                        link_id = active_links[-1] if len(active_links) > 0 and active_links[-1] is not None else field_links[-1] if len(field_links) > 0 else None
+                        text = (elem.text or '') if tag in T_TAGS else '\t'
+                        paragraphs[-1].append((text, link_id))
+                elif tag in INSTR_TEXT_TAGS:
+                    if len(fields) > 0:
+                        fields[-1]['instruction'] += elem.text or ''
+                elif tag in HYPERLINK_TAGS or tag in FLD_SIMPLE_TAGS:
+                    active_links.pop()
+                elif tag in P_TAGS:
+                    lines.extend(paragraph_link_lines(paragraphs.pop(), links))
+                    if len(paragraphs) == 0 and body is not None:
+                        # Processed paragraphs and tables are removed from the document tree
+                        body.clear()
+    return lines
+
+def span_value(value):
+    """
+    Reads the value of a gridSpan element.
+    """
+    try:
+        return max(1, int(value))
+    except (TypeError, ValueError):
+        return 1
+
+def merge_cells(rows, merge=True):
+    """
+    Merges vertically merged cells into the first cell of the merge (rowspan), the same way as mammoth.
+
+    Args:
+        rows (list):             Rows of the table: {'cells', 'header'}, each cell {'text', 'colspan', 'rowspan', 'vmerge', 'header'}
+        merge (bool):            (Optional) If False, merged cells are kept as separate cells. Default is True
+
+    Returns:
+        (list):                  Rows of the table, without the cells merged into cells of previous rows
+    """
+    columns = {}
+    for row in rows:
+        index = 0
+        for cell in row['cells']:
+            if merge == True and cell['vmerge'] == True and index in columns:
+                columns[index]['rowspan'] += 1
+            else:
+                columns[index] = cell
+                cell['vmerge'] = False
+            index += cell['colspan']
+    return [{'cells': [cell for cell in row['cells'] if cell['vmerge'] == False], 'header': row['header']} for row in rows]
+
+def table_rows(rows, merge=True):
+    """
+    Forms the rows of a parsed table, in the same format as tables read from the converted .html file (see html_tables.table_rows).
+
+    Args:
+        rows (list):             Rows of the table (see merge_cells)
+        merge (bool):            (Optional) If False, vertically merged cells are not merged. Default is True
+
+    Returns:
+        (list):                  Rows of the table, each row a list of cell texts (None for empty cells)
+    """
+    rows = merge_cells(rows, merge=merge)
+    # Leading header rows are the head (<thead>) of the converted .html table
+    body_index = 0
+    while body_index < len(rows) and rows[body_index]['header'] == True:
+        body_index += 1
+    return html_tables.table_rows([row['cells'] for row in rows[:body_index]], [row['cells'] for row in rows[body_index:]])
+
+def read_tables(docx_path):
+    """
+    Reads tables from a .docx file, reading the document part with an incremental XML parser.
+    Each table is returned as soon as it is parsed and is then removed from the document tree, so only the table being read is kept in memory.
+
+    Args:
+        docx_path (str):         Absolute path to the .docx file
+
+    Yields:
+        (list):                  Rows of each table, each row a list of cell texts (None for empty cells)
+    """
+    with zipfile.ZipFile(docx_path) as docx_file:
+        part, rels_path = document_part(docx_file)
+        # Open elements, number of open tables and ignored elements, and deleted state of open rows (including rows of nested tables)
+        path, depth, ignored, open_rows = [], 0, 0, []
+        rows, row, cell, merge = [], None, None, True
+        note_references = 0
+        body = None
+        with docx_file.open(part) as f:
+            for event, elem in ET.iterparse(f, events=('start', 'end')):
+                tag = elem.tag
+                if event == 'start':
+                    parent = path[-1] if len(path) > 0 else None
+                    path.append(tag)
+                    if tag in IGNORED_TAGS:
+                        ignored += 1
+                    if tag in BODY_TAGS:
+                        body = elem
+                    elif tag in TBL_TAGS:
+                        depth += 1
+                        if depth == 1:
+                            rows, merge = [], True
+                    elif tag in TR_TAGS:
+                        open_rows.append(False)
+                        if depth == 1:
+                            row = {'cells': [], 'header': False}
+                    elif tag in TC_TAGS and depth == 1 and row is not None:
+                        cell = {'text': [], 'colspan': 1, 'rowspan': 1, 'vmerge': False, 'header': False}
+                        row['cells'].append(cell)
+                    elif tag in DEL_TAGS and parent in TR_PR_TAGS and len(open_rows) > 0:
+                        open_rows[-1] = True
+                    elif tag in TBL_HEADER_TAGS and parent in TR_PR_TAGS and depth == 1 and row is not None:
+                        row['header'] = True
+                    elif tag in GRID_SPAN_TAGS and parent in TC_PR_TAGS and depth == 1 and cell is not None:
+                        cell['colspan'] = span_value(w_attribute(elem, 'val'))
+                    elif tag in V_MERGE_TAGS and parent in TC_PR_TAGS and depth == 1 and cell is not None:
+                        cell['vmerge'] = w_attribute(elem, 'val') in ['continue', '', None]
+                    elif tag in BOOKMARK_START_TAGS and (parent in TR_TAGS or parent in TBL_TAGS) and depth == 1 and ignored == 0 and True not in open_rows:
+                        # mammoth does not merge cells of tables with bookmarks between rows or cells
+                        merge = merge and w_attribute(elem, 'name') == '_GoBack'
+                    continue
+                path.pop()
+                visible = ignored == 0 and True not in open_rows
+                if tag in IGNORED_TAGS:
+                    ignored -= 1
+                if tag in NOTE_REFERENCE_TAGS:
+                    if visible:
+                        # Note references are numbered in the order of the document, e.g. [1]
+                        note_references += 1
+                        if cell is not None:
+                            cell['text'].append(f'[{note_references}]')
+                elif tag in T_TAGS or tag in TAB_TAGS or tag in NO_BREAK_HYPHEN_TAGS or tag in SOFT_HYPHEN_TAGS:
+                    if visible and cell is not None:
+                        cell['text'].append((elem.text or '') if tag in T_TAGS else '\t' if tag in TAB_TAGS else '\u2011' if tag in NO_BREAK_HYPHEN_TAGS else '\u00ad')
+                elif tag in TC_TAGS and depth == 1:
+                    cell = None
+                elif tag in TR_TAGS:
+                    deleted = open_rows.pop()
+                    if depth == 1:
+                        if row is not None and deleted == False:
+                            rows.append(row)
+                        row = None
+                        elem.clear()
+                elif tag in TBL_TAGS:
+                    depth -= 1
+                    if depth == 0:
+                        table = table_rows(rows, merge=merge)
+                        rows = []
+                        # Processed tables and paragraphs are removed from the document tree
+                        elem.clear()
+                        if body is not None:
+                            body.clear()
+                        yield table
+                elif tag in P_TAGS and depth == 0 and body is not None and len(path) > 0 and path[-1] in BODY_TAGS:
+                    body.clear()
@@ -1,11 +1,31 @@
 import os
 from pathlib import Path
-import re
+from importlib import metadata
 import mammoth
+from mammoth import html as mammoth_html
 
 
 
 
+def converter_version():
+    """
+    Forms the name and version of the converter used by convert_docx_file, used as a part of the conversion cache key.
+
+    Returns:
+        (str):                   Converter name and version
+    """
+    try:
+        return f"mammoth-{metadata.version('mammoth')}"
+    except metadata.PackageNotFoundError:
+        return 'mammoth'
+
+def discard_image(image):
+    """
+    Image converter for mammoth that discards images, so embedded images are not read and encoded into the converted file.
+    The element containing an image is still written (e.g. an empty paragraph or link), the same as when the <img> tag is removed from the converted file.
+    """
+    return [mammoth_html.force_write]
+
 def convert_docx_file(root_dir, docx_path, file_name='', processed_dir='tmp/converted_documents_md_html/', clear_dir=False, output_format='html'):
     """
     Converts .docx file to .html or .md or .txt file.
@@ -44,35 +64,17 @@ def convert_docx_file(root_dir, docx_path, file_name='', processed_dir='tmp/conv
     # Convert .docx file to .html
     if output_format == 'html':
         with open(file_path, 'rb') as f:
-            res = mammoth.convert_to_html(f)
-            html = res.value
-            # remove images
-            html = re.sub(r'\<img src\=.*?\>', '', html)
+            # Images are discarded during the conversion
+            res = mammoth.convert_to_html(f, convert_image=discard_image)
             with open(file_name, 'w', encoding='utf-8') as f:
-                f.write(html)
+                f.write(res.value)
     # Convert .docx file to .md
     if output_format == 'md':
         with open(file_path, 'rb') as f:
-            res = mammoth.convert_to_markdown(f)
-            md = res.value
-            # md_no_img = re.sub(r'\_\_\!\[\]\(data\:image*+\)\_\_', '', md)
-            md_no_img = ''
-            for line in md.split('\n'):
-                in_img = False
-                last_img_line = False
-                if in_img == False and re.search(r'\_\_\!\[\]\(data\:image', line):
-                    in_img = True
-                    continue
-                if in_img == True and re.search(r'\)\_\_', line):
-                    last_img_line = True
-                    continue
-                if last_img_line == True:
-                    in_img = False
-                    last_img_line = False
-                    continue
-                md_no_img += line + '\n'
+            # Images are discarded during the conversion, so lines of images do not have to be removed from the converted text
+            res = mammoth.convert_to_markdown(f, convert_image=discard_image)
             with open(file_name, 'w', encoding='utf-8') as f:
-                f.write(md_no_img)
+                f.write(res.value)
     # Convert .docx file to .txt
     if output_format == 'txt':
         with open(file_path, 'rb') as f:
@@ -22,6 +22,7 @@ import src.gui.main_worker as main_worker
 import src.gui.gui_explorer as gui_explorer
 import src.gui.gui_support as gui_support
 import src.db_support as db_support
+import src.results_save_read as results_save_read
 import src.verify_data as verify_data
 
 dirName = os.path.dirname(__file__)
@@ -662,6 +663,7 @@ class MainWindow(QMainWindow):
                 error_dialog.exec_()
                 return
             util.save_data(root_dir=self.root_dir, data=all_data['results'], save_dir='tmp/results', data_name='results')
+            results_save_read.forget_results(root_dir=self.root_dir)
             util.save_data(root_dir=self.root_dir, data=all_data['professors'], save_dir='tmp', data_name='professors_data')
             util.save_data(root_dir=self.root_dir, data=all_data['subjects'], save_dir='tmp', data_name='subjects_data')
             db_support.json_to_db(os.path.join(self.root_dir, Path('tmp/professors_data.json')),
@@ -688,10 +690,13 @@ class MainWindow(QMainWindow):
         if file_path != '':
             os.makedirs(os.path.join(self.root_dir, Path('tmp')), exist_ok=True)
             shutil.copyfile(file_path, os.path.join(self.root_dir, Path('tmp/acreditation.db')))
+            # Databases exported by older versions are upgraded to the current schema
+            db_support.upgrade_database(os.path.join(self.root_dir, Path('tmp/acreditation.db')))
             db_support.db_to_json(os.path.join(self.root_dir, Path('tmp/acreditation.db')),
                                   os.path.join(self.root_dir, Path('tmp/professors_data.json')),
                                   os.path.join(self.root_dir, Path('tmp/subjects_data.json')),
                                   os.path.join(self.root_dir, Path('tmp/results/results.json')))
+            results_save_read.forget_results(root_dir=self.root_dir)
             self.results_button.setEnabled(True)
             loaded_dialog = gui_support.PopupDialog(f"Database from {file_path} imported.", "Database imported", self)
             loaded_dialog.setModal(True)
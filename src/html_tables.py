@@ -0,0 +1,196 @@
+"""
+Reading tables from .html files (converted documents).
+The .html text is parsed once and each table is returned as a list of rows, with each row a list of cell texts.
+Cells spanning multiple columns or rows (colspan, rowspan) are repeated in each of them, the same way pandas.read_html does.
+"""
+
+from html.parser import HTMLParser
+import re
+
+# Whitespace in cell texts is replaced with a single space, the same way pandas.read_html does
+CELL_WHITESPACE_REGEX = re.compile(r'[\r\n]+|\s{2,}')
+
+
+def expand_spans(rows):
+    """
+    Expands cells spanning multiple columns or rows.
+
+    Args:
+        rows (list):             Rows of the table, each row a list of (text, colspan, rowspan) cells
+
+    Returns:
+        (list):                  Rows of the table, each row a list of cell texts
+    """
+    expanded = []
+    remainder = []
+    for row in rows:
+        texts = []
+        next_remainder = []
+        index = 0
+        for text, colspan, rowspan in row:
+            # Cells from previous rows spanning this row, before the current cell
+            while len(remainder) > 0 and remainder[0][0] <= index:
+                prev_index, prev_text, prev_rowspan = remainder.pop(0)
+                texts.append(prev_text)
+                if prev_rowspan > 1:
+                    next_remainder.append((prev_index, prev_text, prev_rowspan - 1))
+                index += 1
+            for i in range(colspan):
+                texts.append(text)
+                if rowspan > 1:
+                    next_remainder.append((index, text, rowspan - 1))
+                index += 1
+        for prev_index, prev_text, prev_rowspan in remainder:
+            texts.append(prev_text)
+            if prev_rowspan > 1:
+                next_remainder.append((prev_index, prev_text, prev_rowspan - 1))
+        expanded.append(texts)
+        remainder = next_remainder
+    # Rows added only by cells spanning rows after the last row
+    while len(remainder) > 0:
+        texts = []
+        next_remainder = []
+        for prev_index, prev_text, prev_rowspan in remainder:
+            texts.append(prev_text)
+            if prev_rowspan > 1:
+                next_remainder.append((prev_index, prev_text, prev_rowspan - 1))
+        expanded.append(texts)
+        remainder = next_remainder
+    return expanded
+
+
+class TableParser(HTMLParser):
+    """
+    Parser collecting tables from .html text. Completed tables are added to the tables list, each table as a list of rows.
+    Tables nested in a cell are not read separately, their text is added to the text of the cell.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.tables = []
+        self.depth = 0
+        self.head_rows, self.body_rows = [], []
+        self.row, self.row_in_head = None, False
+        self.cell, self.cell_is_header = None, False
+        self.in_head = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'table':
+            self.depth += 1
+            if self.depth == 1:
+                self.head_rows, self.body_rows = [], []
+            return
+        if self.depth != 1:
+            return
+        if tag == 'thead':
+            self.in_head = True
+        elif tag in ['tbody', 'tfoot']:
+            self.in_head = False
+        elif tag == 'tr':
+            self.end_row()
+            self.row, self.row_in_head = [], self.in_head
+        elif tag in ['td', 'th']:
+            self.end_cell()
+            if self.row is None:
+                self.row, self.row_in_head = [], self.in_head
+            attrs = dict(attrs)
+            self.cell = {'text': [], 'colspan': span_value(attrs.get('colspan')), 'rowspan': span_value(attrs.get('rowspan'))}
+            self.cell_is_header = tag == 'th'
+            self.row.append(self.cell)
+
+    def handle_endtag(self, tag):
+        if tag == 'table':
+            if self.depth == 1:
+                self.end_row()
+                self.tables.append(table_rows(self.head_rows, self.body_rows))
+                self.in_head = False
+            self.depth = max(0, self.depth - 1)
+            return
+        if self.depth != 1:
+            return
+        if tag == 'thead':
+            self.in_head = False
+        elif tag == 'tr':
+            self.end_row()
+        elif tag in ['td', 'th']:
+            self.end_cell()
+
+    def handle_data(self, data):
+        if self.cell is not None:
+            self.cell['text'].append(data)
+
+    def end_cell(self):
+        if self.cell is not None:
+            self.cell['header'] = self.cell_is_header
+        self.cell = None
+
+    def end_row(self):
+        self.end_cell()
+        if self.row is not None:
+            (self.head_rows if self.row_in_head else self.body_rows).append(self.row)
+        self.row = None
+
+
+def span_value(value):
+    """
+    Reads the value of a colspan or rowspan attribute.
+    """
+    try:
+        return max(1, int(value))
+    except (TypeError, ValueError):
+        return 1
+
+def table_rows(head_rows, body_rows):
+    """
+    Forms the rows of a parsed table. Header rows (in <thead>, or leading rows with <th> cells only) are not included, the same way pandas.read_html uses them as column names.
+
+    Args:
+        head_rows (list):        Rows in <thead>, each row a list of parsed cells
+        body_rows (list):        Other rows, each row a list of parsed cells
+
+    Returns:
+        (list):                  Rows of the table, each row a list of cell texts (None for empty cells), padded to the same length
+    """
+    if len(head_rows) == 0:
+        while len(body_rows) > 0 and len(body_rows[0]) > 0 and False not in [cell['header'] for cell in body_rows[0]]:
+            body_rows = body_rows[1:]
+    rows = []
+    for row in body_rows:
+        cells = []
+        for cell in row:
+            text = CELL_WHITESPACE_REGEX.sub(' ', ''.join(cell['text']).strip())
+            cells.append((text, cell['colspan'], cell['rowspan']))
+        rows.append(cells)
+    rows = expand_spans(rows)
+    width = max([len(row) for row in rows]) if len(rows) > 0 else 0
+    rows = [row + [''] * (width - len(row)) for row in rows]
+    # Empty rows are skipped in single column tables
+    rows = [row for row in rows if len(row) > 1 or (len(row) == 1 and row[0] != '')]
+    return [[cell if cell != '' else None for cell in row] for row in rows]
+
+def read_tables(html_text, chunk_size=64 * 1024):
+    """
+    Reads tables from the .html text, in a single pass.
+
+    Args:
+        html_text (str):         .html text
+        chunk_size (int):        (Optional) Number of characters parsed at once. Default is 65536
+
+    Yields:
+        (list):                  Rows of each table, each row a list of cell texts (None for empty cells)
+    """
+    parser = TableParser()
+    for start in range(0, len(html_text), chunk_size):
+        parser.feed(html_text[start:start + chunk_size])
+        # Completed tables are returned before the rest of the text is parsed
+        while len(parser.tables) > 0:
+            yield parser.tables.pop(0)
+    parser.close()
+    while len(parser.tables) > 0:
+        yield parser.tables.pop(0)
+
+def table_text(table):
+    """
+    Joins all cell texts of the table, used for searching tables.
+    """
+    return ' '.join([cell for row in table for cell in row if cell is not None])
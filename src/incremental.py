@@ -0,0 +1,107 @@
+"""
+Incremental re-verification.
+Stages of a run record fingerprints of their inputs (file contents, studies programme, options) together with their outputs in <root_dir>/cache/incremental,
+outside of the /tmp directory, so they are kept when it is cleared. On a rerun:
+    - a stage with unchanged inputs returns its saved output instead of running again
+    - a changed professors or subjects file is read again, but only tables whose content changed are extracted again
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+
+def fingerprint(value):
+    """
+    Calculates a fingerprint of JSON serializable data.
+
+    Args:
+        value (any):             Data (str, list, dict, ...)
+
+    Returns:
+        (str):                   SHA-256 hex digest of the data
+    """
+    if type(value) != str:
+        value = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(value.encode('utf-8')).hexdigest()
+
+
+class StageCache:
+    """
+    Inputs fingerprints and outputs of pipeline stages from the previous run, each stage saved as <cache_dir>/<stage>.json.
+    """
+
+    def __init__(self, cache_dir):
+        """
+        Args:
+            cache_dir (str):         Absolute path to the cache directory
+        """
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def load(self, name):
+        """
+        Loads a saved cache file.
+
+        Args:
+            name (str):              Name of the cache file (without extension)
+
+        Returns:
+            (dict):                  Saved data, empty if not found or not readable
+        """
+        file_path = os.path.join(self.cache_dir, f'{name}.json')
+        if not os.path.isfile(file_path):
+            return {}
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f'Error reading incremental cache {file_path}:\n    {e}')
+            return {}
+
+    def save(self, name, data):
+        """
+        Saves a cache file. The file is written to a temporary file first, so an interrupted run never leaves a partial file.
+
+        Args:
+            name (str):              Name of the cache file (without extension)
+            data (dict):             Data to save
+        """
+        file_path = os.path.join(self.cache_dir, f'{name}.json')
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, file_path)
+        except (OSError, TypeError, ValueError) as e:
+            print(f'Error saving incremental cache {file_path}:\n    {e}')
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def get(self, stage, inputs):
+        """
+        Gets the output of a stage, if its inputs did not change since it was saved.
+
+        Args:
+            stage (str):             Name of the stage
+            inputs (str):            Fingerprint of the stage inputs
+
+        Returns:
+            (any):                   Saved output of the stage, or None if the inputs changed or the stage was not saved
+        """
+        entry = self.load(stage)
+        if entry.get('inputs') != inputs:
+            return None
+        return entry.get('output')
+
+    def put(self, stage, inputs, output):
+        """
+        Saves the output of a stage with the fingerprint of its inputs.
+
+        Args:
+            stage (str):             Name of the stage
+            inputs (str):            Fingerprint of the stage inputs
+            output (any):            Output of the stage, JSON serializable
+        """
+        self.save(stage, {'inputs': inputs, 'output': output})
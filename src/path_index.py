@@ -0,0 +1,191 @@
+"""
+Index of the documentation directory for resolving hyperlink paths.
+The directory tree is listed once (one os.scandir call per directory) and each directory listing is kept in memory with:
+    - original names
+    - names converted to latin characters (cyrillic_to_latin), as hyperlinks in the converted main documentation file use latin names
+    - case-folded names of both, used where the file system is case insensitive (Windows)
+Hyperlink paths are then resolved with dictionary lookups per path component instead of file system calls per link,
+and the longest existing prefix of a path is found by walking the indexed tree (a trie of path components).
+Directories outside the indexed tree (absolute links to other directories) are listed on first use and kept as well.
+"""
+
+import os
+
+import src.cyrillyc_to_latin as cyrillic_to_latin
+
+
+class PathIndex:
+    """
+    In-memory listings of directories, keyed by directory path.
+    """
+
+    def __init__(self, root_dir='', case_sensitive=None):
+        """
+        Args:
+            root_dir (str):          (Optional) Absolute path to the directory indexed at once, recursively. Default is '' - directories are only listed on first use
+            case_sensitive (bool):   (Optional) If names are compared case sensitive. Default is None - case sensitive, except on Windows
+        """
+        self.case_sensitive = case_sensitive if case_sensitive is not None else os.name != 'nt'
+        self.listings = {}
+        if root_dir != '':
+            self.add_tree(str(root_dir))
+
+    def key(self, name):
+        """
+        Returns the form of a name used for comparison (case-folded if names are not case sensitive).
+        """
+        return name if self.case_sensitive == True else name.casefold()
+
+    def dir_key(self, dir_path):
+        """
+        Returns the key of a directory listing (normalized path).
+        """
+        return self.key(os.path.normpath(dir_path))
+
+    def add_listing(self, dir_path, entries):
+        """
+        Stores the listing of a directory.
+
+        Args:
+            dir_path (str):          Path to the directory
+            entries (list):          List of (name, is_dir) of the directory entries
+
+        Returns:
+            (dict):                  Listing: {'names': {name key: is_dir}, 'latin': set of latin name keys}
+        """
+        listing = {'names': {}, 'latin': set()}
+        for name, is_dir in entries:
+            listing['names'][self.key(name)] = is_dir
+            listing['latin'].add(self.key(cyrillic_to_latin.cyrillic_to_latin(name)))
+        self.listings[self.dir_key(dir_path)] = listing
+        return listing
+
+    def add_tree(self, root_dir):
+        """
+        Lists a directory recursively and stores the listings.
+
+        Args:
+            root_dir (str):          Path to the directory
+        """
+        stack = [root_dir]
+        while len(stack) > 0:
+            dir_path = stack.pop()
+            try:
+                with os.scandir(dir_path) as entries:
+                    entries = [(entry.name, entry.is_dir()) for entry in entries]
+            except OSError:
+                self.listings[self.dir_key(dir_path)] = None
+                continue
+            self.add_listing(dir_path, entries)
+            stack.extend([os.path.join(dir_path, name) for name, is_dir in entries if is_dir == True])
+
+    def listing(self, dir_path):
+        """
+        Gets the listing of a directory, listing the directory on first use.
+
+        Args:
+            dir_path (str):          Path to the directory
+
+        Returns:
+            (dict or None):          Listing of the directory (see add_listing), None if the path is not a directory
+        """
+        dir_key = self.dir_key(dir_path)
+        if dir_key not in self.listings:
+            try:
+                with os.scandir(dir_path) as entries:
+                    self.add_listing(dir_path, [(entry.name, entry.is_dir()) for entry in entries])
+            except OSError:
+                self.listings[dir_key] = None
+        return self.listings[dir_key]
+
+    def is_dir_entry(self, listing, name):
+        """
+        Checks if a directory listing contains a name.
+
+        Args:
+            listing (dict):          Listing of the directory
+            name (str):              Name (path component)
+
+        Returns:
+            (bool or None):          True if the name is a directory, False if it is a file, None if it is not found
+        """
+        # Empty names (repeated separators) and special entries are directories, but are not in listings
+        if name in ['', os.curdir, os.pardir]:
+            return True
+        return listing['names'].get(self.key(name))
+
+    def longest_existing_prefix(self, path):
+        """
+        Finds the longest prefix (in characters) of a path that exists, the same as removing the last character of the path until it exists.
+
+        Args:
+            path (str):              Path
+
+        Returns:
+            (str):                   Longest existing prefix of the path, '' if no prefix exists
+        """
+        path = str(path)
+        if os.altsep is not None:
+            path = path.replace(os.altsep, os.sep)
+        drive, rest = os.path.splitdrive(path)
+        prefix = drive + (os.sep if rest.startswith(os.sep) else '')
+        longest = prefix if prefix != '' and self.listing(prefix) is not None else ''
+        remaining = path[len(prefix):]
+        dir_path = prefix if prefix != '' else os.curdir
+        while True:
+            listing = self.listing(dir_path)
+            if listing is None:
+                break
+            name, separator, remaining = remaining.partition(os.sep)
+            if separator != '':
+                is_dir = self.is_dir_entry(listing, name)
+                if is_dir == True:
+                    prefix = prefix + name + separator
+                    longest = prefix
+                    dir_path = prefix
+                    continue
+                if is_dir == False:
+                    # A file followed by a separator does not exist, the file does
+                    longest = prefix + name
+                    break
+            # Longest name in the directory the last path component starts with
+            for length in range(len(name), 0, -1):
+                if self.is_dir_entry(listing, name[:length]) is not None:
+                    longest = prefix + name[:length]
+                    break
+            break
+        return longest
+
+    def exists(self, path):
+        """
+        Checks if a path exists, the same as os.path.exists.
+
+        Args:
+            path (str):              Path
+
+        Returns:
+            (bool):                  True if the path exists
+        """
+        path = str(path)
+        if os.altsep is not None:
+            path = path.replace(os.altsep, os.sep)
+        return path != '' and self.longest_existing_prefix(path) == path
+
+    def exists_latin(self, path):
+        """
+        Checks if a path exists, or its parent directory contains a file whose name converted to latin characters matches the file name of the path.
+
+        Args:
+            path (str):              Path
+
+        Returns:
+            (bool):                  True if the path exists or a file with the latin name is found
+        """
+        path = str(path)
+        if self.exists(path):
+            return True
+        parent_dir = os.sep.join(path.split(os.sep)[:-1])
+        if parent_dir == '' or not self.exists(parent_dir):
+            return False
+        listing = self.listing(parent_dir)
+        return listing is not None and self.key(path.split(os.sep)[-1]) in listing['latin']
@@ -0,0 +1,85 @@
+"""
+Regular expressions used when reading the documentation.
+Patterns for the field labels of the documentation tables (Naziv predmeta, Nastavnik, ESPB, Spisak predmeta, ...) are compiled once, when the module is imported,
+and used by name from PATTERNS. Patterns built at run time (escaped names, search expressions passed as options) are compiled with compile_pattern, which keeps compiled patterns in a cache.
+"""
+
+from functools import lru_cache
+import re
+
+
+PATTERNS = {
+    # Links in the main documentation file
+    'professors_file': re.compile(r'Knjiga\snastavnika'),
+    'subjects_file': re.compile(r'Knjiga\spredmeta'),
+    'subjects_file_table': re.compile(r'Tabela', re.I),
+    # Studies programme table
+    'studies_programme': re.compile(r'Naziv\s*(?:studijskog)*\s*programa|Studijski\s*program', re.I),
+    'studies_programme_or_type': re.compile(r'Naziv\s*(?:studijskog)*\s*programa|Studijski\s*program|Vrsta\s*studija', re.I),
+    'studies_type': re.compile(r'Vrsta\s*studija', re.I),
+    'studies_type_abbreviation': re.compile(r'^[A-Z]$'),
+    # Professor tables. Cells are searched as they are, whitespace between words of a label may be any whitespace
+    'prof_name': re.compile(r'Ime i prezime'),
+    'prof_subjects': re.compile(r'Spisak\s+predmeta.*?akreditovan', re.I | re.S),
+    'prof_references': re.compile(r'Reprezentativne\s+reference', re.I),
+    # Subjects tables: label, label with the value (label and value in the same cell) and label prefix removed from the value
+    'school': re.compile(r'školska\s+ustanova', re.I),
+    'school_value': re.compile(r'školska\s+ustanova.+', re.I),
+    'school_prefix': re.compile(r'školska\s+ustanova\:*\s*'),
+    'study_programme': re.compile(r'Studijski\s+program', re.I),
+    'study_programme_value': re.compile(r'Studijski\s+program.+', re.I),
+    'study_programme_prefix': re.compile(r'[sS]tudijski\s+program\:*\s*'),
+    'subject': re.compile(r'Naziv\s+predmeta', re.I),
+    'subject_value': re.compile(r'Naziv\s+predmeta.+', re.I),
+    'subject_prefix': re.compile(r'[nN]aziv\s+predmeta\:*\s*'),
+    'subject_code': re.compile(r'^\[[0-9A-Z\.]+\]'),
+    'professor': re.compile(r'Nastavnik(?:\/nastavnici)*', re.I),
+    'professor_value': re.compile(r'Nastavnik(?:\/nastavnici)*.+', re.I),
+    'professor_label': re.compile(r'Nastavnik(?:\/nastavnici)*\:*', re.I),
+    'subject_status': re.compile(r'Status\s+predmeta', re.I),
+    'subject_status_value': re.compile(r'Status\s+predmeta.+', re.I),
+    'subject_status_prefix': re.compile(r'[sS]tatus\s+predmeta\:*\s*'),
+    'espb': re.compile(r'ESPB', re.I),
+    'espb_value': re.compile(r'ESPB.+', re.I),
+    'espb_prefix': re.compile(r'[eE][sS][pP][bB]\:*\s*'),
+    'condition': re.compile(r'Uslov', re.I),
+    'condition_value': re.compile(r'Uslov.+', re.I),
+    'condition_prefix': re.compile(r'[uU]slov\:*\s*'),
+    'classes': re.compile(r'Broj\s+časova.+nastave', re.I),
+    'theory_classes': re.compile(r'Teorijska\s+nastava', re.I),
+    'theory_classes_value': re.compile(r'Teorijska\s+nastava\:*\s*[0-9]+', re.I),
+    'theory_classes_prefix': re.compile(r'[tT]eorijska\s+nastava\:*\s*'),
+    'practical_classes': re.compile(r'Praktična\s+nastava', re.I),
+    'practical_classes_value': re.compile(r'Praktična\s+nastava\:*\s*[0-9]+', re.I),
+    'practical_classes_prefix': re.compile(r'[pP]raktična\s+nastava\:*\s*'),
+    'class_points': re.compile(r'^predispitne\s*', re.I),
+    'trailing_number': re.compile(r'[0-9]+$'),
+}
+
+
+@lru_cache(maxsize=1024)
+def compile_pattern(pattern, flags=0):
+    """
+    Compiles a pattern built at run time, keeping compiled patterns in a cache.
+
+    Args:
+        pattern (str):           Regular expression
+        flags (int):             (Optional) Regular expression flags (re.I, ...). Default is 0
+
+    Returns:
+        (re.Pattern):            Compiled pattern
+    """
+    return re.compile(pattern, flags)
+
+def literal(text, flags=0):
+    """
+    Compiles a pattern matching the given text literally (re.escape), keeping compiled patterns in a cache.
+
+    Args:
+        text (str):              Text to match
+        flags (int):             (Optional) Regular expression flags (re.I, ...). Default is 0
+
+    Returns:
+        (re.Pattern):            Compiled pattern
+    """
+    return compile_pattern(re.escape(text), flags)
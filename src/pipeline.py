@@ -0,0 +1,673 @@
+"""
+GUI-free verification pipeline.
+Documentation copying, directory reading, file conversion and reading, hyperlinks verification, professors and subjects data comparison and filtering.
+Progress and results are reported through plain callbacks, so the pipeline can be driven by the GUI worker or run headless.
+"""
+
+import os
+from pathlib import Path
+import shutil
+import sys
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import src.directory_reading as directory_reading
+import src.util as util
+import src.docx_to_md_html as docx_to_md_html
+import src.cyrillyc_to_latin as cyrillic_to_latin
+import src.verify_data as verify_data
+import src.results_save_read as results_save_read
+import src.doc_2_docx_ms_word_win as doc_2_docx_ms_word_win
+import src.conversion_cache as conversion_cache
+import src.incremental as incremental
+import src.workspace as workspace
+import src.path_index as path_index
+import src.docx_stream as docx_stream
+import src.conversion_backends as conversion_backends
+
+# Progress ranges of reading the professors and subjects files (see Pipeline.read_books)
+BOOK_STAGES = {'professors': (40, 65), 'subjects': (65, 90)}
+
+class Pipeline:
+    """
+    Verification pipeline for a single documentation directory.
+    """
+
+    def __init__(self, root_dir, doc_dir, clean_tmp=True, copy_files=True, processing_options=None, progress_callback=None, results_callback=None, doc_map_callback=None, cache_dir=''):
+        """
+        Args:
+            root_dir (str):                 Root directory of the project, absolute path. Working files are saved in <root_dir>/tmp
+            doc_dir (str):                  Absolute path to the documentation directory
+            clean_tmp (bool):               (Optional) If True, the /tmp directory is cleared before running. Default is True
+            copy_files (bool):              (Optional) If True, documentation files are copied to the /tmp directory. Default is True
+            processing_options (dict):      (Optional) Processing options, as set in the GUI options tab. Default is None - no options
+            progress_callback (callable):   (Optional) Called with (value, description) when the run progresses. Default is None
+            results_callback (callable):    (Optional) Called with a dictionary of new results. Default is None
+            doc_map_callback (callable):    (Optional) Called with the map of original to converted documents when it changes. Default is None
+            cache_dir (str):                (Optional) Absolute path to the conversion cache directory. If not passed, <root_dir>/cache/conversions is used. Default is ''
+        """
+        self.root_dir = root_dir
+        self.doc_dir = doc_dir
+        self.clean_tmp = clean_tmp
+        self.copy_files = copy_files
+        self.processing_options = processing_options if processing_options is not None else {}
+        self.progress_callback = progress_callback
+        self.results_callback = results_callback
+        self.doc_map_callback = doc_map_callback
+        self.files_dir = ''
+        self.doc_map = {}
+        self.main_doc_docx = ''
+        self.results = {}
+        self.errors = []
+        # Professors and subjects files are read in separate threads, shared state is updated under locks
+        self.results_lock = threading.Lock()
+        self.progress_lock = threading.Lock()
+        self.book_reader_lock = threading.Lock()
+        self.progress_stage = threading.local()
+        self.book_progress = None
+        # Converted documents are cached outside of the /tmp directory, so they are kept when it is cleared
+        self.conversion_cache = None
+        if self.processing_options.get('use_conversion_cache', True) == True:
+            self.conversion_cache = conversion_cache.ConversionCache(cache_dir if cache_dir != '' else os.path.join(root_dir, Path('cache/conversions')))
+        # Selected conversion backend (see conversion_backends.py) is saved next to the conversion cache
+        self.backend_selection_path = os.path.join(os.path.dirname(str(cache_dir if cache_dir != '' else os.path.join(root_dir, Path('cache/conversions')))), 'conversion_backends.json')
+        # Inputs fingerprints and outputs of stages, so a rerun only repeats stages and tables affected by changed files
+        self.stage_cache = None
+        if self.processing_options.get('use_incremental_cache', True) == True:
+            self.stage_cache = incremental.StageCache(os.path.join(root_dir, Path('cache/incremental')))
+
+    def progress(self, value, desc=''):
+        """
+        Reports progress of the run. While the professors and subjects files are read at the same time, progress of the file read by the current thread is stored
+        and the progress of both files together is reported, so the reported value does not go back.
+        """
+        with self.progress_lock:
+            stage = getattr(self.progress_stage, 'name', None)
+            if self.book_progress is not None and stage in BOOK_STAGES.keys():
+                start, end = BOOK_STAGES[stage]
+                self.book_progress[stage] = max(self.book_progress[stage], min(1.0, (value - start) / (end - start)))
+                first, last = BOOK_STAGES['professors'][0], BOOK_STAGES['subjects'][1]
+                value = max(self.book_progress['reported'], first + int((last - first) * (self.book_progress['professors'] + self.book_progress['subjects']) / 2))
+                self.book_progress['reported'] = value
+            if self.progress_callback is not None:
+                self.progress_callback(value, desc)
+
+    def update_results(self, results):
+        """
+        Stores new results and reports them.
+        """
+        with self.results_lock:
+            self.results.update(results)
+            if self.results_callback is not None:
+                self.results_callback(results)
+
+    def update_doc_map(self, doc_path, converted_path):
+        """
+        Maps an original document to its converted version and reports the updated map.
+        """
+        with self.results_lock:
+            self.doc_map[doc_path] = converted_path
+            if self.doc_map_callback is not None:
+                self.doc_map_callback(dict(self.doc_map))
+
+    def use_loaded_data(self):
+        """
+        Checks if previously extracted data should be used instead of reading the documentation.
+
+        Returns:
+            (bool):                  True if the 'use_loaded_data' option is set and extracted data is found
+        """
+        loaded_data_found = util.check_files_exist(root_dir=self.root_dir)
+        return self.processing_options.get('use_loaded_data', False) == True and loaded_data_found == True
+
+    def materialize(self, file_path):
+        """
+        Replaces a linked documentation file by a copy before it is read, if the working copy is lazy (see workspace.py).
+        """
+        if self.processing_options.get('workspace_mode', 'copy') == 'lazy':
+            workspace.materialize(file_path)
+
+    def book_reader(self, docx_path):
+        """
+        Finds how tables of a professors or subjects file are read: the 'book_reader' option, or the reader of the selected conversion backend if the option is 'auto'.
+        If no backend is selected yet, backends are benchmarked on the file and the selection is saved (see conversion_backends.py).
+
+        Args:
+            docx_path (str):         Absolute path to the .docx file
+
+        Returns:
+            (str):                   'html' (tables are read from the converted .html file) or 'docx' (tables are read from the .docx file)
+        """
+        book_reader = self.processing_options.get('book_reader', 'html')
+        if book_reader == 'auto':
+            # Backends are benchmarked only once, when both files are read at the same time
+            with self.book_reader_lock:
+                book_reader = conversion_backends.selected_book_reader(self.backend_selection_path, sample_paths=[str(docx_path)])
+            print(f'Selected book reader: {book_reader}')
+        return book_reader
+
+    def convert_to_docx(self, conversions):
+        """
+        Converts .doc files to .docx files. Files found in the conversion cache are copied instead of converted, the rest are converted at the same time.
+
+        Args:
+            conversions (list):      List of (doc_path, docx_path) pairs, absolute paths
+
+        Returns:
+            (list):                  Absolute paths to the created .docx files, in the order of the given conversions ('' for failed conversions)
+        """
+        conversions = [(str(doc_path), str(docx_path) if str(docx_path).endswith('.docx') else f'{docx_path}.docx') for doc_path, docx_path in conversions]
+        converted = ['' for i in conversions]
+        cache_keys = {}
+        to_convert = []
+        for index, (doc_path, docx_path) in enumerate(conversions):
+            self.materialize(doc_path)
+            if self.conversion_cache is not None:
+                cache_keys[index] = self.conversion_cache.key(doc_path, converter=f'doc2docx-{sys.platform}-{doc_2_docx_ms_word_win.converter_version()}')
+                if self.conversion_cache.get(cache_keys[index], {'converted.docx': docx_path}):
+                    print(f'Converted file loaded from conversion cache: {docx_path}')
+                    converted[index] = docx_path
+                    continue
+            to_convert.append(index)
+        if len(to_convert) > 0:
+            converted_files = doc_2_docx_ms_word_win.doc2docx_batch(conversions=[conversions[i] for i in to_convert])
+            for index, docx_path in zip(to_convert, converted_files):
+                converted[index] = docx_path
+                if docx_path != '' and index in cache_keys.keys():
+                    self.conversion_cache.put(cache_keys[index], {'converted.docx': docx_path})
+        return converted
+
+    def convert_to_html(self, docx_path, file_name, clear_dir=False):
+        """
+        Converts .docx file to .html, converts cyrillic characters to latin characters and saves the result as <file_name>_lat.html.
+        If the file is found in the conversion cache, cached files are copied instead.
+
+        Args:
+            docx_path (str):         Absolute path to the .docx file
+            file_name (str):         Name of the converted file (without extension)
+            clear_dir (bool):        (Optional) If True, clears the directory of converted files before converting. Default is False
+
+        Returns:
+            (str):                   Absolute path to the converted .html file
+            (str):                   Converted file content, with latin characters
+        """
+        processed_dir = os.path.join(self.root_dir, Path('tmp/converted_documents_md_html'))
+        if clear_dir == True and os.path.exists(processed_dir):
+            shutil.rmtree(processed_dir, ignore_errors=True)
+        html_file = os.path.join(processed_dir, f'{file_name}.html')
+        html_file_lat = html_file.replace('.html', '_lat.html')
+        self.materialize(docx_path)
+        cache_key = None
+        if self.conversion_cache is not None:
+            cache_key = self.conversion_cache.key(docx_path, converter=docx_to_md_html.converter_version(), options={'output_format': 'html', 'images': 'discard'})
+            if self.conversion_cache.get(cache_key, {'converted.html': html_file, 'converted_lat.html': html_file_lat}):
+                print(f'Converted file loaded from conversion cache: {html_file}')
+                with open(html_file_lat, 'r', encoding='utf-8') as f:
+                    return html_file, f.read()
+        html_file = docx_to_md_html.convert_docx_file(root_dir=self.root_dir, docx_path=docx_path, file_name=file_name, processed_dir='tmp/converted_documents_md_html', output_format='html')
+        print('Saving file with latin characters...')
+        cyrillic_to_latin.cyrillic_to_latin_file(html_file, html_file_lat)
+        with open(html_file_lat, 'r', encoding='utf-8') as f:
+            html_file_txt = f.read()
+        if cache_key is not None:
+            self.conversion_cache.put(cache_key, {'converted.html': html_file, 'converted_lat.html': html_file_lat})
+        return html_file, html_file_txt
+
+    def read_tables_data(self, data_name, file_txt='', docx_path=''):
+        """
+        Reads professors or subjects data from the converted file, or from the .docx file. If the file and the studies programme did not change since the previous run, saved data is used,
+        otherwise the file is read again and only changed tables are extracted.
+
+        Args:
+            data_name (str):         'professors_data' or 'subjects_data'
+            file_txt (str):          (Optional) Converted file content, with latin characters. Default is ''
+            docx_path (str):         (Optional) Absolute path to the .docx file. If set, tables are read from the .docx file (see docx_stream.py) instead of the converted file. Default is ''
+
+        Returns:
+            (list):                  Professors or subjects data
+            (str):                   Path to the saved data
+        """
+        processes = self.processing_options.get('table_processes', 0)
+        chunk_size = self.processing_options.get('table_chunk_size', 50)
+        tables = None
+        if docx_path != '':
+            # Tables are read one at a time, with cyrillic characters converted to latin characters the same as in the converted file
+            tables = ([[cyrillic_to_latin.cyrillic_to_latin(cell) if cell is not None else None for cell in row] for row in table] for table in docx_stream.read_tables(docx_path))
+        table_cache = None
+        if self.stage_cache is not None:
+            file_input = file_txt if docx_path == '' else ['docx', conversion_cache.file_hash(docx_path)]
+            inputs = incremental.fingerprint([verify_data.EXTRACTION_VERSION, file_input, self.results.get('Studies programme', ''), self.results.get('Studies type', '')])
+            data = self.stage_cache.get(data_name, inputs)
+            if data is not None:
+                save_path = util.save_data(root_dir=self.root_dir, data=data, save_dir='tmp', data_name=data_name)
+                print(f'File unchanged since the previous run, {data_name} loaded from incremental cache and saved to {save_path}')
+                return data, save_path
+            table_cache = self.stage_cache.load(f'{data_name}_tables')
+        if data_name == 'professors_data':
+            data, save_path = verify_data.read_professors(root_dir=self.root_dir, professors_file_txt=file_txt, processes=processes, chunk_size=chunk_size, table_cache=table_cache, tables=tables)
+        else:
+            data, save_path = verify_data.read_subjects(root_dir=self.root_dir, subjects_file_txt=file_txt, processes=processes, chunk_size=chunk_size, table_cache=table_cache, tables=tables)
+        if self.stage_cache is not None:
+            self.stage_cache.save(f'{data_name}_tables', table_cache)
+            self.stage_cache.put(data_name, inputs, data)
+        return data, save_path
+
+    def read_documentation(self):
+        """
+        Copies documentation files and reads directory structure.
+
+        Returns:
+            (dict):                  Structure of the documentation directory
+        """
+        start_value = 0 if self.clean_tmp == False else 2
+        self.progress(start_value, 'Copying documentation files and reading directory structure...')
+        reported = {'value': start_value}
+        def copy_progress(copied, total):
+            # Copying takes the progress up to 9%, reported only when the value changes
+            value = start_value + int((9 - start_value) * copied / total) if total > 0 else 9
+            if value != reported['value']:
+                reported['value'] = value
+                self.progress(value, f'Copying documentation files ({copied}/{total})...')
+        doc_structure, dir_tree, self.files_dir = directory_reading.copy_read_doc_dir(root_dir=self.root_dir, documentation_dir=self.doc_dir, copy_documentation=self.copy_files, clear_dir=self.clean_tmp, overwrite=True, load_struct=True, convert_names_to_latin=True, scan_threads=self.processing_options.get('scan_threads', 0), workspace_mode=self.processing_options.get('workspace_mode', 'copy'),
+                                                                                      copy_threads=self.processing_options.get('copy_threads', 4), copy_progress_callback=copy_progress)
+        self.update_results({'Documentation directory structure': doc_structure})
+        return doc_structure
+
+    def read_main_doc(self, doc_structure):
+        """
+        Finds the main documentation file, converts it to .html and finds the studies programme.
+
+        Args:
+            doc_structure (dict):    Structure of the documentation directory
+
+        Returns:
+            (str):                   Main documentation file content, with latin characters
+        """
+        self.progress(10, 'Finding main documentation file...')
+        files_in_doc_dir = [i for i in doc_structure['contents'] if i['type'] == 'file']
+        self.update_results({'Files in root directory: ': '\n'.join([i['name'] for i in files_in_doc_dir])})
+        print("Files in documentation root directory:")
+        for i in files_in_doc_dir:
+            print(i['name'])
+        main_doc = util.find_main_doc(docs=files_in_doc_dir)
+        self.update_results({'Main document: ': main_doc['name']})
+        print(f"Main documentation file: {main_doc['name']}")
+
+        # If the main documentation file is .doc, it is converted to .docx
+        if main_doc['path'].split(os.sep)[-1].endswith('.doc'):
+            self.progress(15, 'Converting main documentation file to .docx...')
+            main_doc_docx = self.convert_to_docx([(main_doc['path'], os.path.join(self.root_dir, Path('tmp/converted_documents_docx'), main_doc['name'].replace('.doc', '.docx')))])[0]
+            self.update_results({'Main documentation file converted to .docx: ': main_doc_docx})
+            print(f'Main documentation file converted to .docx: {main_doc_docx}')
+            self.update_doc_map(main_doc['path'], main_doc_docx)
+        doc_to_convert_path = self.doc_map[main_doc['path']] if main_doc['path'] in self.doc_map.keys() else main_doc['path']
+        self.main_doc_docx = doc_to_convert_path
+        self.progress(20, 'Converting main documentation file to .html and cyrillic characters to latin characters...')
+        # Converting cyrillic characters of the converted file to latin characters
+        html_file, html_file_txt = self.convert_to_html(docx_path=doc_to_convert_path, file_name='main_doc', clear_dir=True)
+        self.update_results({'Main documentation file converted to .html: ': html_file})
+        print(f'Main documentation file converted to .html: {html_file}')
+
+        # Finding studies program
+        self.progress(27, 'Finding studies program...')
+        studies_programme_and_type = util.find_studies_programme(root_dir=self.root_dir, html_file_lat=html_file_txt)
+        self.update_results({'Studies programme': studies_programme_and_type['studies_programme'], 'Studies type': studies_programme_and_type['studies_type']})
+        print(f"Studies programe: {studies_programme_and_type['studies_programme']}\nStudies type: {studies_programme_and_type['studies_type']}")
+        return html_file_txt
+
+    def read_link_lines(self):
+        """
+        Reads hyperlinks of the main documentation file from the .docx file (see docx_stream.py), if the 'link_source' option is 'docx'.
+
+        Returns:
+            (list or None):          Link tag lines, with latin characters. None if hyperlinks are to be found in the converted .html file
+        """
+        if self.processing_options.get('link_source', 'docx') != 'docx' or not str(self.main_doc_docx).endswith('.docx'):
+            return None
+        try:
+            start_time = time.perf_counter()
+            link_lines = [cyrillic_to_latin.cyrillic_to_latin(line) for line in docx_stream.hyperlink_lines(self.main_doc_docx)]
+            print(f'Read {len(link_lines)} hyperlinks from {self.main_doc_docx} ({round(time.perf_counter() - start_time, 2)} s)')
+            return link_lines
+        except Exception as e:
+            print(f'Error reading hyperlinks from {self.main_doc_docx}, searching the converted .html file:\n    {e}')
+            return None
+
+    def find_hyperlinks(self, html_file_txt):
+        """
+        Finds hyperlinks to files in the main documentation file and verifies the linked files exist.
+
+        Args:
+            html_file_txt (str):     Main documentation file content, with latin characters
+
+        Returns:
+            (list):                  Found hyperlinks
+        """
+        self.progress(30, 'Finding hyperlinks to files...')
+        # Documentation directory is listed once, links are resolved from the index
+        index = path_index.PathIndex(self.files_dir)
+        found_hyperlinks = util.find_link_tags(root_dir=self.root_dir, doc_dir=self.files_dir, html_file_txt=html_file_txt, file_format='html', index=index, link_tag_lines=self.read_link_lines())
+        print(f"Found hyperlinks: \n{json.dumps(found_hyperlinks, indent=4)}")
+        self.update_results({'Found hyperlinks': found_hyperlinks})
+
+        # Verify hyperlinks files exist
+        self.progress(35, 'Verifying hyperlinks files exist...')
+        unmatched_hyperlinks = util.verify_hyperlinks(root_dir=self.root_dir, found_hyperlinks=found_hyperlinks, index=index)
+        if len(unmatched_hyperlinks) > 0:
+            self.errors.append({'Unmatched hyperlinks': unmatched_hyperlinks})
+        print(f"Unmatched hyperlinks: \n{json.dumps(unmatched_hyperlinks, indent=4)}")
+        self.update_results({'Unmatched hyperlinks': unmatched_hyperlinks if len(unmatched_hyperlinks) > 0 else 'All hyperlinks verified'})
+        return found_hyperlinks
+
+    def convert_books(self, found_hyperlinks):
+        """
+        Converts professors and subjects files to .docx at the same time, before they are read.
+
+        Args:
+            found_hyperlinks (list): Found hyperlinks
+        """
+        to_convert = []
+        professors_file = verify_data.find_professors_file(root_dir=self.root_dir, links=found_hyperlinks)
+        if professors_file != [] and os.path.exists(professors_file['path']):
+            if professors_file['path'].endswith('.doc') and sys.platform.startswith('win') or sys.platform.startswith('linux'):
+                to_convert.append(professors_file['path'])
+        subjects_file = verify_data.find_subjects_file(root_dir=self.root_dir, links=found_hyperlinks)
+        if subjects_file != [] and os.path.exists(subjects_file['path']) and subjects_file['path'].endswith('.doc'):
+            to_convert.append(subjects_file['path'])
+        to_convert = [i for i in dict.fromkeys(to_convert) if i not in self.doc_map.keys()]
+        if len(to_convert) == 0:
+            return
+        self.progress(38, 'Converting professors and subjects files to .docx...')
+        conversions = [(doc_path, os.path.join(self.root_dir, Path('tmp/converted_documents_docx'), doc_path.split(os.sep)[-1].replace('.doc', '.docx'))) for doc_path in to_convert]
+        converted = self.convert_to_docx(conversions)
+        for doc_path, docx_path in zip(to_convert, converted):
+            if docx_path != '':
+                print(f'Converted {doc_path} to .docx: {docx_path}')
+                self.update_doc_map(doc_path, docx_path)
+
+    def update_professors_link(self, found_hyperlinks, professors_file):
+        """
+        If the professors file has a .docx version, points its hyperlink to the .docx file and saves the updated hyperlinks.
+
+        Args:
+            found_hyperlinks (list): Found hyperlinks
+            professors_file (dict):  Professors file hyperlink
+        """
+        if os.path.exists(professors_file['path'].replace('.doc', '.docx')):
+            print('Updating professors file path to .docx...')
+            for indexI, link in enumerate(found_hyperlinks):
+                if link['path'] == professors_file['path']:
+                    found_hyperlinks[indexI]['path'] = professors_file['path'].replace('.doc', '.docx')
+                    util.update_hyperlinks(root_dir=self.root_dir, new_hyperlinks=found_hyperlinks)
+
+    def read_professors_file(self, found_hyperlinks):
+        """
+        Finds, converts and reads the professors file ("Knjiga nastavnika").
+
+        Args:
+            found_hyperlinks (list): Found hyperlinks
+
+        Returns:
+            (list):                  Professors data, or '' if the file is not read
+        """
+        self.progress(40, 'Finding professors file...')
+        professors_file = verify_data.find_professors_file(root_dir=self.root_dir, links=found_hyperlinks)
+        professors_file_txt, professors_docx, professors_data = '', '', ''
+        if professors_file != []:
+            print(f"Professors file: {professors_file}")
+            self.update_results({'Professors file': professors_file})
+            # Verify link to professors file
+            self.progress(45, 'Verifying professors file link...')
+            if os.path.exists(professors_file['path']) or os.path.exists(professors_file['path'].replace('.doc', '.docx')):
+                self.update_professors_link(found_hyperlinks, professors_file)
+                self.update_results({'Professors file link verification': 'File exists'})
+                print(f'Professors file link verified - file found: {professors_file["path"]}')
+                # Read professors file
+                professors_file_path = professors_file['path']
+                if professors_file['path'] in self.doc_map.keys():
+                    professors_file_path = self.doc_map[professors_file['path']]
+                    self.update_results({'Professors file converted to .docx: ': professors_file_path})
+                elif professors_file['path'].endswith('.doc') and sys.platform.startswith('win') or sys.platform.startswith('linux'):
+                    self.progress(50, 'Converting professors file to .docx...')
+                    file_name = professors_file['path'].split(os.sep)[-1]
+                    professors_file_docx = self.convert_to_docx([(professors_file['path'], os.path.join(self.root_dir, Path('tmp/converted_documents_docx'), file_name.replace('.doc', '.docx')))])[0]
+                    print(f'Converted professors file to .docx: {professors_file}')
+                    self.update_doc_map(professors_file['path'], professors_file_docx)
+                    self.update_results({'Professors file converted to .docx: ': professors_file_docx})
+                    professors_file_path = self.doc_map[professors_file['path']]
+                if professors_file_path.endswith('.docx') and self.book_reader(professors_file_path) == 'docx':
+                    # Tables are read from the .docx file, without converting it to .html
+                    self.materialize(professors_file_path)
+                    professors_docx = professors_file_path
+                    print(f'Reading professors file tables from .docx: {professors_docx}')
+                elif professors_file_path.endswith('.docx'):
+                    self.progress(55, 'Converting professors file to .html and cyrillic characters to latin characters...')
+                    print('Converting cyrillic characters to latin characters...')
+                    professors_file, professors_file_txt = self.convert_to_html(docx_path=professors_file_path, file_name='professors_file')
+                    print(f'Converted professors file to .html: {professors_file}')
+                else:
+                    print(f'Professors file is not .docx. Skipping conversion and reading.')
+                    self.errors.append({'Professors file': 'Not .docx'})
+                    self.update_results({'Professors file': 'Not .docx'})
+            else:
+                self.update_results({'Professors file link verification': 'File does not exist or link is broken'})
+                self.errors.append({'Professors file link verification': 'File does not exist or link is broken'})
+        else:
+            print('Professors file not found. Skipping professors verification.')
+            self.errors.append({'Professors file not found': 'Not found'})
+            self.update_results({'Professors file: ': 'Not found'})
+        if professors_file_txt != '' or professors_docx != '':
+            self.progress(62, 'Listing professors file content...')
+            print(f'Professors file loaded. Reading...')
+            professors_data, professors_save_path = self.read_tables_data(data_name='professors_data', file_txt=professors_file_txt, docx_path=professors_docx)
+            self.update_results({'Professors file read': professors_data})
+            self.update_results({'Professors file saved to file': professors_save_path})
+        return professors_data
+
+    def read_subjects_file(self, found_hyperlinks):
+        """
+        Finds, converts and reads the subjects file ("Knjiga predmeta").
+
+        Args:
+            found_hyperlinks (list): Found hyperlinks
+
+        Returns:
+            (list):                  Subjects data, or '' if the file is not read
+        """
+        self.progress(65, 'Finding subjects file...')
+        subjects_file = verify_data.find_subjects_file(root_dir=self.root_dir, links=found_hyperlinks)
+        subjects_file_txt, subjects_docx, subjects_data = '', '', ''
+        print(f"Subjects file: {subjects_file}")
+        subjects_file_verified = False
+        if subjects_file != []:
+            self.update_results({'Subjects file': subjects_file})
+            # Verify path to subjects file
+            self.progress(70, 'Verifying subjects file path...')
+            if os.path.exists(subjects_file['path']):
+                subjects_file_verified = True
+                print(f'Subjects file path verified - file found: {subjects_file["path"]}')
+                self.update_results({'Subjects file link verification': 'File exists'})
+        else:
+            self.update_results({'Subjects file': 'Not found'})
+            self.errors.append({'Subjects file not found': 'Not found'})
+        if subjects_file_verified == True:
+            subjects_file_path = subjects_file['path']
+            if subjects_file['path'] in self.doc_map.keys():
+                subjects_file_path = self.doc_map[subjects_file['path']]
+                self.update_results({'Subjects file converted to .docx: ': subjects_file_path})
+            elif subjects_file['path'].endswith('.doc'):
+                # Convert subjects file to .docx
+                self.progress(75, 'Converting subjects file to .docx...')
+                subjects_file_docx = self.convert_to_docx([(subjects_file['path'], os.path.join(self.root_dir, Path('tmp/converted_documents_docx'), subjects_file['path'].split(os.sep)[-1].replace('.doc', '.docx')))])[0]
+                print(f'Converted subjects file to .docx: {subjects_file}')
+                self.update_doc_map(subjects_file['path'], subjects_file_docx)
+                self.update_results({'Subjects file converted to .docx: ': subjects_file_docx})
+                subjects_file_path = self.doc_map[subjects_file['path']]
+            if str(subjects_file_path).endswith('.docx') and self.book_reader(subjects_file_path) == 'docx':
+                # Tables are read from the .docx file, without converting it to .html
+                self.materialize(subjects_file_path)
+                subjects_docx = subjects_file_path
+                print(f'Reading subjects file tables from .docx: {subjects_docx}')
+            else:
+                # Convert subjects file to .html
+                self.progress(80, 'Converting subjects file to .html and cyrillic characters to latin characters...')
+                print('Converting cyrillic characters to latin characters...')
+                subjects_file, subjects_file_txt = self.convert_to_html(docx_path=subjects_file_path, file_name='subjects_file')
+                print(f'Converted subjects file to .html: {subjects_file}')
+            if subjects_file_txt != '' or subjects_docx != '':
+                self.progress(87, 'Listing subjects file content...')
+                print(f'Subjects file loaded. Reading...')
+                subjects_data, subjects_save_path = self.read_tables_data(data_name='subjects_data', file_txt=subjects_file_txt, docx_path=subjects_docx)
+                self.update_results({'Subjects file read': subjects_data})
+                self.update_results({'Subjects file saved to file': subjects_save_path})
+        return subjects_data
+
+    def read_books(self, found_hyperlinks):
+        """
+        Reads the professors and subjects files. By default both files are read at the same time, each in its own thread, from the conversion to .docx to the extracted data,
+        so conversion of one file (LibreOffice runs in separate processes, Microsoft Word converts one file at a time) overlaps conversion and reading of the other, and the comparison starts when both are read.
+        Progress of both files is reported together (see progress). With the 'overlap_books' option set to False, the files are converted together first and then read one after another.
+
+        Args:
+            found_hyperlinks (list): Found hyperlinks
+
+        Returns:
+            (list):                  Professors data, or '' if the file is not read
+            (list):                  Subjects data, or '' if the file is not read
+        """
+        if self.processing_options.get('overlap_books', True) == False:
+            self.convert_books(found_hyperlinks)
+            return self.read_professors_file(found_hyperlinks), self.read_subjects_file(found_hyperlinks)
+        # Hyperlinks are shared by both threads, so the professors file link is updated before they start, as in the sequential reading
+        professors_file = verify_data.find_professors_file(root_dir=self.root_dir, links=found_hyperlinks)
+        if professors_file != []:
+            self.update_professors_link(found_hyperlinks, professors_file)
+        def read_book(stage, read_file):
+            self.progress_stage.name = stage
+            try:
+                return read_file(found_hyperlinks)
+            finally:
+                self.progress(BOOK_STAGES[stage][1], f'{stage.capitalize()} file read')
+                self.progress_stage.name = None
+        start_time = time.perf_counter()
+        self.book_progress = {'professors': 0.0, 'subjects': 0.0, 'reported': BOOK_STAGES['professors'][0]}
+        try:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                professors_future = executor.submit(read_book, 'professors', self.read_professors_file)
+                subjects_future = executor.submit(read_book, 'subjects', self.read_subjects_file)
+                professors_data, subjects_data = professors_future.result(), subjects_future.result()
+        finally:
+            self.book_progress = None
+        print(f'Professors and subjects files read in {round(time.perf_counter() - start_time, 2)} s')
+        return professors_data, subjects_data
+
+    def load_extracted_data(self):
+        """
+        Loads previously extracted professors and subjects data.
+
+        Returns:
+            (list, list):            Professors data and subjects data, or (None, None) if the data is not found
+        """
+        self.progress(20, 'Loading extracted documentation data...')
+        prof_data_path = os.path.join(self.root_dir, Path('tmp/professors_data.json'))
+        subj_data_path = os.path.join(self.root_dir, Path('tmp/subjects_data.json'))
+        if not os.path.exists(prof_data_path):
+            self.update_results({'Professors data not found': 'Not found'})
+            return None, None
+        professors_data = util.load_data(root_dir=self.root_dir, abs_path=prof_data_path)
+        self.update_results({'Professors data loaded from file': professors_data})
+        if not os.path.exists(subj_data_path):
+            self.update_results({'Subjects data not found': 'Not found'})
+            return None, None
+        subjects_data = util.load_data(root_dir=self.root_dir, abs_path=subj_data_path)
+        self.update_results({'Subjects data loaded from file': subjects_data})
+        return professors_data, subjects_data
+
+    def compare(self, professors_data, subjects_data):
+        """
+        Compares professors and subjects data, then filters and sorts comparison results.
+
+        Args:
+            professors_data (list):  Professors data
+            subjects_data (list):    Subjects data
+        """
+        self.progress(90, 'Comparing professors and subjects data...')
+        print('Comparing professors and subjects data...')
+        backend = self.processing_options.get('comparison_backend', 'python')
+        compare_results, inputs = None, ''
+        if self.stage_cache is not None:
+            inputs = incremental.fingerprint([professors_data, subjects_data])
+            compare_results = self.stage_cache.get('comparison', inputs)
+        if compare_results is not None:
+            print('Professors and subjects data unchanged since the previous run, comparison results loaded from incremental cache')
+            results_save_read.save_results(root_dir=self.root_dir, results=compare_results)
+        else:
+            compare_results = verify_data.compare_prof_and_subj_data(root_dir=self.root_dir, prof_data=professors_data, subj_data=subjects_data, backend=backend)
+            if self.stage_cache is not None:
+                self.stage_cache.put('comparison', inputs, compare_results)
+        self.update_results({'Professors and subjects data comparison': compare_results})
+        self.progress(95, 'Filtering and sorting comparison results...')
+        print('Filtering and sorting comparison results...')
+        compare_results_filter = verify_data.filter_sort_results(root_dir=self.root_dir)
+        self.update_results({'Filtered comparison results': compare_results_filter})
+
+    def run(self):
+        """
+        Runs the verification.
+
+        Returns:
+            (dict):                  All reported results
+        """
+        print("Running main script...")
+        use_loaded_data = self.use_loaded_data()
+
+        if use_loaded_data == True:
+            self.update_results({'run_dir': f"Verification for loaded documentation data"})
+        else:
+            self.update_results({'run_dir': f"Verification for documents in root directory: {self.doc_dir}"})
+
+        if self.clean_tmp == True and use_loaded_data == False:
+            self.progress(0, 'Clearing /tmp directory...')
+            util.clear_tmp_dir(root_dir=self.root_dir)
+            print('Cleared /tmp directory')
+
+        if use_loaded_data == False:
+            doc_structure = self.read_documentation()
+            html_file_txt = self.read_main_doc(doc_structure)
+            found_hyperlinks = self.find_hyperlinks(html_file_txt)
+            professors_data, subjects_data = self.read_books(found_hyperlinks)
+        else:
+            professors_data, subjects_data = self.load_extracted_data()
+            if professors_data is None or subjects_data is None:
+                return self.results
+
+        if subjects_data != [] and professors_data != []:
+            self.compare(professors_data, subjects_data)
+
+        # Database is created once, from all data saved during the run
+        self.progress(99, 'Saving database...')
+        results_save_read.flush_database(root_dir=self.root_dir)
+
+        print("Script finished.")
+        return self.results
+
+    def summary(self):
+        """
+        Creates a short summary of the run.
+
+        Returns:
+            (dict):                  Documentation directory, studies programme and type, errors and numbers of unmatched items
+        """
+        filtered_results = self.results.get('Filtered comparison results', {})
+        unmatched_hyperlinks = self.results.get('Unmatched hyperlinks', [])
+        return {
+            'doc_dir': str(self.doc_dir),
+            'studies_programme': self.results.get('Studies programme', ''),
+            'studies_type': self.results.get('Studies type', ''),
+            'errors': [list(i.keys())[0] for i in self.errors],
+            'unmatched_hyperlinks': len(unmatched_hyperlinks) if type(unmatched_hyperlinks) == list else 0,
+            'prof_to_subj_not_found': len(filtered_results.get('prof_to_subj_filt_not_found', [])),
+            'subj_to_prof_not_found': len(filtered_results.get('subj_to_prof_filt_not_found', [])),
+        }
@@ -0,0 +1,123 @@
+"""
+Matching of professors' subjects (professors file) to subjects tables (subjects file).
+Subjects are looked up in hash indexes built once per comparison, instead of scanning all subjects tables for every professor's subject:
+    - exact index: subject code -> subjects tables with that code
+    - substring index: lowercase professor's subject code -> subjects tables whose title ([code] name) contains it
+Only the candidates found in the indexes are checked for professor and subject name matches, so the comparison runs in roughly linear time.
+"""
+
+
+def substring_codes(text, codes_by_length):
+    """
+    Finds codes which are contained in the given text.
+
+    Args:
+        text (str):                  Lowercase text
+        codes_by_length (dict):      Sets of lowercase codes, by code length
+
+    Returns:
+        (set):                       Codes contained in the text
+    """
+    found = set()
+    for length, codes in codes_by_length.items():
+        for start in range(len(text) - length + 1):
+            if text[start:start + length] in codes:
+                found.add(text[start:start + length])
+    return found
+
+def build_index(prof_tables, subj_tables):
+    """
+    Builds indexes of professors' subjects and subjects tables by subject code.
+
+    Args:
+        prof_tables (list):          Professors tables
+        subj_tables (list):          Subjects tables
+
+    Returns:
+        (dict):                      Indexes used by subject_candidates and professor_candidates
+    """
+    # Professors' subjects, as (professor index, subject index) pairs, by exact and lowercase code
+    prof_subj_by_code = {}
+    prof_subj_by_code_lower = {}
+    for indexProf, prof in enumerate(prof_tables):
+        for indexProfSubj, prof_subj in enumerate(prof['subjects']):
+            prof_subj_by_code.setdefault(prof_subj['code'], []).append((indexProf, indexProfSubj))
+            prof_subj_by_code_lower.setdefault(prof_subj['code'].lower(), []).append((indexProf, indexProfSubj))
+    # Empty code is contained in every subject title
+    codes_by_length = {}
+    for code in prof_subj_by_code_lower.keys():
+        if code != '':
+            codes_by_length.setdefault(len(code), set()).add(code)
+    # Subjects tables by exact code and by the professors' subject codes contained in their titles
+    subj_by_code = {}
+    subj_by_code_lower = {}
+    subj_codes = []
+    for indexSubj, subj in enumerate(subj_tables):
+        subj_by_code.setdefault(subj['subject_code'], []).append(indexSubj)
+        codes = substring_codes(subj['subject'].lower(), codes_by_length)
+        subj_codes.append(codes)
+        for code in codes:
+            subj_by_code_lower.setdefault(code, []).append(indexSubj)
+    return {
+        'subj_count': len(subj_tables),
+        'prof_subj_by_code': prof_subj_by_code,
+        'prof_subj_by_code_lower': prof_subj_by_code_lower,
+        'subj_by_code': subj_by_code,
+        'subj_by_code_lower': subj_by_code_lower,
+        'subj_codes': subj_codes,
+    }
+
+def subject_candidates(index, prof_subj):
+    """
+    Finds subjects tables with a code matching the professor's subject code, either exactly or as a part of the subject title (case insensitive).
+
+    Args:
+        index (dict):                Indexes built by build_index
+        prof_subj (dict):            Professor's subject
+
+    Returns:
+        (list):                      Indexes of the subjects tables, in the order of the subjects tables
+    """
+    code = prof_subj['code']
+    if code == '':
+        return list(range(index['subj_count']))
+    candidates = set(index['subj_by_code'].get(code, []))
+    candidates.update(index['subj_by_code_lower'].get(code.lower(), []))
+    return sorted(candidates)
+
+def professor_candidates(index, subj, indexSubj):
+    """
+    Finds professors' subjects with a code matching the subject code, either exactly or as a part of the subject title (case insensitive).
+
+    Args:
+        index (dict):                Indexes built by build_index
+        subj (dict):                 Subject table
+        indexSubj (int):             Index of the subject table
+
+    Returns:
+        (list):                      (professor index, professor's subject index) pairs, in the order of the professors tables
+    """
+    candidates = set(index['prof_subj_by_code_lower'].get('', []))
+    if subj['subject_code'] != '':
+        candidates.update(index['prof_subj_by_code'].get(subj['subject_code'], []))
+    for code in index['subj_codes'][indexSubj]:
+        candidates.update(index['prof_subj_by_code_lower'][code])
+    return sorted(candidates)
+
+def match_type(prof, prof_subj, subj):
+    """
+    Checks whether the subject table matches the professor and the professor's subject with a matching code.
+
+    Args:
+        prof (dict):                 Professor table
+        prof_subj (dict):            Professor's subject
+        subj (dict):                 Subject table
+
+    Returns:
+        (str):                       '' if the subject matches, 'prof_name_mismatch' or 'subj_name_mismatch' otherwise
+    """
+    if prof['name'] not in subj['professor']:
+        return 'prof_name_mismatch'
+    if not (prof_subj['name'].lower() in subj['subject_name'].lower() or subj['subject_name'] in prof_subj['name'].lower()):
+        return 'subj_name_mismatch'
+    return ''
@@ -0,0 +1,158 @@
+"""
+Matching of professors' subjects (professors file) to subjects tables (subjects file) in SQLite.
+Alternative to the Python matching in prof_subj_matching, selected with the 'comparison_backend' processing option ('sql').
+Tables are loaded into an in-memory database with pre-normalized (lowercase) columns, and candidates and match types are computed with indexed joins:
+    - candidates: professors' subjects without a code, or with a code equal to the subject code, or contained in the subject title (case insensitive)
+    - match type: '' if the subject matches, 'prof_name_mismatch' or 'subj_name_mismatch' otherwise, the same way as prof_subj_matching.match_type
+Results have the same structure and order as the Python matching.
+"""
+
+from itertools import groupby
+import sqlite3
+
+import src.prof_subj_matching as prof_subj_matching
+
+
+SCHEMA = """
+    CREATE TABLE professors (
+        prof_index INTEGER PRIMARY KEY,
+        name TEXT
+    );
+    CREATE TABLE prof_subjects (
+        prof_index INTEGER,
+        prof_subj_index INTEGER,
+        code TEXT,
+        code_lower TEXT,
+        name_lower TEXT,
+        PRIMARY KEY (prof_index, prof_subj_index)
+    );
+    CREATE TABLE subjects (
+        subj_index INTEGER PRIMARY KEY,
+        subject_code TEXT,
+        subject_name TEXT,
+        subject_name_lower TEXT,
+        professor TEXT
+    );
+    CREATE TABLE subject_title_codes (
+        subj_index INTEGER,
+        code_lower TEXT
+    );
+"""
+
+INDEXES = """
+    CREATE INDEX idx_prof_subjects_code ON prof_subjects(code);
+    CREATE INDEX idx_prof_subjects_code_lower ON prof_subjects(code_lower);
+    CREATE INDEX idx_subjects_code ON subjects(subject_code);
+    CREATE INDEX idx_subject_title_codes_code ON subject_title_codes(code_lower);
+"""
+
+# Candidate pairs (all three cases) with the match type of each pair
+MATCHES_QUERY = """
+    CREATE TABLE matches AS
+    SELECT c.prof_index, c.prof_subj_index, c.subj_index,
+        CASE
+            WHEN instr(s.professor, p.name) = 0 THEN 'prof_name_mismatch'
+            WHEN instr(s.subject_name_lower, ps.name_lower) = 0 AND instr(ps.name_lower, s.subject_name) = 0 THEN 'subj_name_mismatch'
+            ELSE ''
+        END AS mismatch
+    FROM (
+        SELECT ps.prof_index, ps.prof_subj_index, s.subj_index
+        FROM prof_subjects ps CROSS JOIN subjects s
+        WHERE ps.code = ''
+        UNION
+        SELECT ps.prof_index, ps.prof_subj_index, s.subj_index
+        FROM subjects s JOIN prof_subjects ps ON ps.code = s.subject_code
+        WHERE s.subject_code != ''
+        UNION
+        SELECT ps.prof_index, ps.prof_subj_index, t.subj_index
+        FROM subject_title_codes t JOIN prof_subjects ps ON ps.code_lower = t.code_lower
+    ) c
+    JOIN professors p ON p.prof_index = c.prof_index
+    JOIN prof_subjects ps ON ps.prof_index = c.prof_index AND ps.prof_subj_index = c.prof_subj_index
+    JOIN subjects s ON s.subj_index = c.subj_index;
+    CREATE INDEX idx_matches_prof ON matches(prof_index, prof_subj_index, mismatch);
+    CREATE INDEX idx_matches_subj ON matches(subj_index, mismatch);
+"""
+
+# Professors' subjects without a matching subject, with all potential matches (subjects in order)
+PROF_TO_SUBJ_QUERY = """
+    SELECT ps.prof_index, ps.prof_subj_index, m.subj_index, m.mismatch
+    FROM prof_subjects ps
+    LEFT JOIN matches m ON m.prof_index = ps.prof_index AND m.prof_subj_index = ps.prof_subj_index
+    WHERE NOT EXISTS (
+        SELECT 1 FROM matches f
+        WHERE f.prof_index = ps.prof_index AND f.prof_subj_index = ps.prof_subj_index AND f.mismatch = ''
+    )
+    ORDER BY ps.prof_index, ps.prof_subj_index, m.subj_index
+"""
+
+# Subjects without a matching professor, with all potential matches (professors' subjects in order)
+SUBJ_TO_PROF_QUERY = """
+    SELECT s.subj_index, m.prof_index, m.mismatch
+    FROM subjects s
+    LEFT JOIN matches m ON m.subj_index = s.subj_index
+    WHERE NOT EXISTS (
+        SELECT 1 FROM matches f
+        WHERE f.subj_index = s.subj_index AND f.mismatch = ''
+    )
+    ORDER BY s.subj_index, m.prof_index, m.prof_subj_index
+"""
+
+
+def load_tables(conn, prof_tables, subj_tables):
+    """
+    Loads professors and subjects tables into the matching database, with pre-normalized columns.
+
+    Args:
+        conn (sqlite3.Connection):   Connection to the matching database
+        prof_tables (list):          Professors tables
+        subj_tables (list):          Subjects tables
+    """
+    conn.executescript(SCHEMA)
+    conn.executemany('INSERT INTO professors VALUES (?, ?)', [(indexProf, prof['name']) for indexProf, prof in enumerate(prof_tables)])
+    conn.executemany('INSERT INTO prof_subjects VALUES (?, ?, ?, ?, ?)',
+                     [(indexProf, indexProfSubj, prof_subj['code'], prof_subj['code'].lower(), prof_subj['name'].lower())
+                      for indexProf, prof in enumerate(prof_tables) for indexProfSubj, prof_subj in enumerate(prof['subjects'])])
+    conn.executemany('INSERT INTO subjects VALUES (?, ?, ?, ?, ?)',
+                     [(indexSubj, subj['subject_code'], subj['subject_name'], subj['subject_name'].lower(), subj['professor'])
+                      for indexSubj, subj in enumerate(subj_tables)])
+    # Professors' subject codes contained in subject titles, found with the same lookup as the Python matching
+    codes_by_length = {}
+    for prof in prof_tables:
+        for prof_subj in prof['subjects']:
+            if prof_subj['code'] != '':
+                codes_by_length.setdefault(len(prof_subj['code']), set()).add(prof_subj['code'].lower())
+    conn.executemany('INSERT INTO subject_title_codes VALUES (?, ?)',
+                     [(indexSubj, code) for indexSubj, subj in enumerate(subj_tables)
+                      for code in prof_subj_matching.substring_codes(subj['subject'].lower(), codes_by_length)])
+    conn.executescript(INDEXES)
+
+def compare(prof_tables, subj_tables):
+    """
+    Compares professors and subjects tables in an in-memory SQLite database.
+
+    Args:
+        prof_tables (list):          Professors tables
+        subj_tables (list):          Subjects tables
+
+    Returns:
+        (tuple):                     Professors' subjects not found in subjects tables and subjects without a professor, in the format of verify_data.compare_prof_and_subj_data
+    """
+    conn = sqlite3.connect(':memory:')
+    try:
+        load_tables(conn=conn, prof_tables=prof_tables, subj_tables=subj_tables)
+        conn.executescript(MATCHES_QUERY)
+        professors_to_subjects_not_found = []
+        for (indexProf, indexProfSubj), rows in groupby(conn.execute(PROF_TO_SUBJ_QUERY), key=lambda row: (row[0], row[1])):
+            prof = prof_tables[indexProf]
+            prof_subj = prof['subjects'][indexProfSubj]
+            pot_subjects = [{'type': mismatch, 'subject': subj_tables[indexSubj]} for _, _, indexSubj, mismatch in rows if indexSubj is not None]
+            professors_to_subjects_not_found.append({'professor': prof['name'], 'subject': f"[{prof_subj['code']}] {prof_subj['name']}", 'subject_code': prof_subj['code'], 'subject_name': prof_subj['name'], 'studies_programme': prof_subj['studies_programme'], 'potential_matches': pot_subjects})
+        subjects_to_professors_not_found = []
+        for indexSubj, rows in groupby(conn.execute(SUBJ_TO_PROF_QUERY), key=lambda row: row[0]):
+            subj = subj_tables[indexSubj]
+            pot_professors = [{'type': mismatch, 'prof': prof_tables[indexProf]} for _, indexProf, mismatch in rows if indexProf is not None]
+            subjects_to_professors_not_found.append({'subject': subj['subject'], 'subject_code': subj['subject_code'], 'subject_name': subj['subject_name'], 'studies_programme': subj['studies_programme'], 'professor': subj['professor'], 'potential_matches': pot_professors})
+    finally:
+        conn.close()
+    return professors_to_subjects_not_found, subjects_to_professors_not_found
@@ -1,16 +1,52 @@
 """
 Saving result to a file and loading saved results.
+Results are kept in memory and merged with new results, results.json is rewritten only when results change.
+The database (tmp/acreditation.db) is created from the saved data once, at the end of the run (flush_database).
 """
+import hashlib
 import json
 import os
 from pathlib import Path
+import threading
 
 import src.db_support as db_support
 
+# Saved results by results file path: {'results': merged results, 'stamp': (modification time, size) of the file when it was saved}
+RESULTS_STORE = {}
+RESULTS_STORE_LOCK = threading.Lock()
+
+
+def file_stamp(file_path):
+    """
+    Forms a stamp of the file (modification time and size), used to find out if the file was changed since it was last saved.
+
+    Args:
+        file_path (str):         Absolute path to the file
+
+    Returns:
+        (tuple):                 Modification time (ns) and size of the file, None if the file does not exist
+    """
+    if not os.path.exists(file_path):
+        return None
+    stat = os.stat(file_path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+def forget_results(root_dir):
+    """
+    Removes the saved results of the project from memory, so they are loaded from results.json on the next save.
+    Called after results.json is written outside save_results (e.g. data loaded or a database imported in the GUI),
+    because the modification time of the file may not change on file systems with coarse timestamps.
+
+    Args:
+        root_dir (str):          Root directory of the project, absolute path
+    """
+    results_path = os.path.join(root_dir, Path('tmp/results'), Path('results.json'))
+    with RESULTS_STORE_LOCK:
+        RESULTS_STORE.pop(results_path, None)
 
 def save_results(root_dir, results):
     """
-    Saves the given results to a file.
+    Saves the given results to a file. Results are merged with previously saved results, and the file is written only if any of the results changed.
 
     Args:
         root_dir (str):          Root directory of the project, absolute path
@@ -19,24 +55,75 @@ def save_results(root_dir, results):
     Returns:
         None
     """
-    save_dir = os.path.join(root_dir, Path('tmp'))
     save_dir_results = os.path.join(root_dir, Path('tmp/results'))
-    old_results = {}
-    new_results = {}
-    print(f'Saving results to {os.path.join(root_dir, save_dir_results, Path("results.json"))}')
-    if not os.path.exists(save_dir_results):
+    results_path = os.path.join(save_dir_results, Path('results.json'))
+    with RESULTS_STORE_LOCK:
+        stored = RESULTS_STORE.get(results_path, None)
+        stamp = file_stamp(results_path)
+        # Results are loaded from the file if it was changed or removed since it was last saved
+        if stored is None or stored['stamp'] != stamp:
+            old_results = {}
+            if stamp is not None:
+                with open(results_path, 'r', encoding='utf-8') as f:
+                    old_results = json.load(f)
+            stored = {'results': old_results, 'stamp': stamp}
+            RESULTS_STORE[results_path] = stored
+        changed_keys = [key for key, value in results.items() if key not in stored['results'].keys() or stored['results'][key] != value]
+        if len(changed_keys) == 0 and stamp is not None:
+            print(f'Results unchanged, not saving {results_path}')
+            return
+        print(f'Saving results to {results_path}')
         os.makedirs(save_dir_results, exist_ok=True)
-    else:
-        if os.path.exists(os.path.join(save_dir_results, Path('results.json'))):
-           with open(os.path.join(save_dir_results, Path('results.json')), 'r', encoding='utf-8') as f:
-               old_results = json.load(f)
-    new_results = {**old_results, **results} if old_results != {} else results
-    with open(os.path.join(save_dir_results, Path('results.json')), 'w', encoding='utf-8') as f:
-        json.dump(new_results, f, indent=4)
-    # Save as database
-    db_support.json_to_db(os.path.join(save_dir, Path('professors_data.json')), os.path.join(save_dir, Path('subjects_data.json')), os.path.join(save_dir_results, Path('results.json')), os.path.join(save_dir, Path('acreditation.db')))
-    print(f'Saved results to {os.path.join(root_dir, save_dir_results, Path("results.json"))}')
-    print(f'Saved database to {os.path.join(root_dir, save_dir, Path("acreditation.db"))}')
+        stored['results'] = {**stored['results'], **results}
+        with open(results_path, 'w', encoding='utf-8') as f:
+            json.dump(stored['results'], f, indent=4)
+        stored['stamp'] = file_stamp(results_path)
+    print(f"Saved results to {results_path} (updated: {', '.join(changed_keys)})")
+
+def file_fingerprint(file_path):
+    """
+    Calculates a fingerprint (SHA-1 hash of the content) of the file.
+
+    Args:
+        file_path (str):         Absolute path to the file
+
+    Returns:
+        (str):                   Fingerprint of the file, '' if the file does not exist
+    """
+    if not os.path.isfile(file_path):
+        return ''
+    sha = hashlib.sha1()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            sha.update(block)
+    return sha.hexdigest()
+
+def flush_database(root_dir):
+    """
+    Creates the database (tmp/acreditation.db) from the saved professors data, subjects data and results.
+    The database is not recreated if the saved data did not change since the database was last created.
+
+    Args:
+        root_dir (str):          Root directory of the project, absolute path
+
+    Returns:
+        (str):                   Absolute path to the database
+    """
+    save_dir = os.path.join(root_dir, Path('tmp'))
+    db_path = os.path.join(save_dir, Path('acreditation.db'))
+    sources = {
+        'professors_data': os.path.join(save_dir, Path('professors_data.json')),
+        'subjects_data': os.path.join(save_dir, Path('subjects_data.json')),
+        'results': os.path.join(save_dir, Path('results/results.json')),
+    }
+    fingerprints = {name: file_fingerprint(path) for name, path in sources.items()}
+    if os.path.exists(db_path) and db_support.read_source_fingerprints(db_path) == fingerprints:
+        print(f'Database is up to date: {db_path}')
+        return db_path
+    db_support.json_to_db(*[path if fingerprints[name] != '' else None for name, path in sources.items()], db_path)
+    db_support.save_source_fingerprints(db_path, fingerprints)
+    print(f'Saved database to {db_path}')
+    return db_path
 
 def load_results(root_dir, save_dir='', abs_path=''):
     """
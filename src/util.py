@@ -8,7 +8,7 @@ Utility functions.
 - Finding main documentation file in the given list of files
 - Finding hyperlinks in .md files
 - Extracting paths from hyperlinks
-- Verifying hyperlinks paths exist
+- Verifying hyperlinks paths exist (with a cached index of the documentation directory)
 """
 
 import json
@@ -18,12 +18,15 @@ from itertools import islice
 import re
 import shutil
 import sys
-import pandas as pd
 
 import src.util as util
 import src.cyrillyc_to_latin as cyrillic_to_latin
 import src.results_save_read as results_save_read
 import src.verify_data as verify_data
+import src.html_tables as html_tables
+import src.dir_scan as dir_scan
+import src.path_index as path_index
+import src.patterns as patterns
 
 
 def install_office_package():
@@ -77,7 +80,7 @@ def process_name(name, file=False, skip_ext=True):
     name = re.sub(r'\.{}$'.format(ext), '', name)
     return '{}.{}'.format(re.escape(name), ext)
 
-def tree(dir_path: Path, level: int=-1, limit_to_directories: bool=False, length_limit: int=1000, save_dir: str='', print_tree=True):
+def tree(dir_path: Path, level: int=-1, limit_to_directories: bool=False, length_limit: int=1000, save_dir: str='', print_tree=True, scan=None):
     '''
     Given a directory Path object print a visual tree structure
 
@@ -88,6 +91,7 @@ def tree(dir_path: Path, level: int=-1, limit_to_directories: bool=False, length
         length_limit (int):             (Optional) Maximum number of lines to print. Default is 1000
         save_dir (str):                 (Optional) If not empty, the tree structure will be saved as a .txt file in the given directory. Default is ''
         print_tree (bool):              (Optional) If True, the tree structure is printed while being formed. Default is True
+        scan (dict):                    (Optional) Scan of the directory (see dir_scan.scan_dir). If not passed, the directory is scanned. Default is None
 
     Returns:
         struct_txt (str):               Tree structure as a string
@@ -100,30 +104,31 @@ def tree(dir_path: Path, level: int=-1, limit_to_directories: bool=False, length
 
     struct_txt = ''
     dir_path = Path(dir_path) # accept string coerceable to Path
+    scan = scan if scan is not None else dir_scan.scan_dir(dir_path)
     files = 0
     directories = 0
-    def inner(dir_path: Path, prefix: str='', level=-1):
+    def inner(node: dict, prefix: str='', level=-1):
         nonlocal files, directories
         if not level:
             return # 0, stop iterating
         if limit_to_directories:
-            contents = [d for d in dir_path.iterdir() if d.is_dir()]
+            contents = [d for d in node['contents'] if d['is_dir']]
         else:
-            contents = list(dir_path.iterdir())
+            contents = node['contents']
         pointers = [tee] * (len(contents) - 1) + [last]
         for pointer, path in zip(pointers, contents):
-            if path.is_dir():
-                yield prefix + pointer + path.name
+            if path['is_dir']:
+                yield prefix + pointer + path['name']
                 directories += 1
                 extension = branch if pointer == tee else space
                 yield from inner(path, prefix=prefix+extension, level=level-1)
             elif not limit_to_directories:
-                yield prefix + pointer + path.name
+                yield prefix + pointer + path['name']
                 files += 1
     if print_tree == True:
         print(dir_path.name)
     struct_txt += f'{dir_path.name}\n'
-    iterator = inner(dir_path, level=level)
+    iterator = inner(scan, level=level)
     for line in islice(iterator, length_limit):
         if print_tree == True:
             print(line)
@@ -143,7 +148,7 @@ def tree(dir_path: Path, level: int=-1, limit_to_directories: bool=False, length
             print(f'Error saving tree structure to {os.path.join(save_dir, Path("documentation_tree.txt"))}:\n    {e}')
     return struct_txt
 
-def print_save_tree(root_dir, formed_tree='', dir_path='', save_dir='', print_tree=True, save_tree=True):
+def print_save_tree(root_dir, formed_tree='', dir_path='', save_dir='', print_tree=True, save_tree=True, scan=None):
     '''
     Prints the tree structure of the given directory. If formed_tree is passed, it is printed; otherwise, the tree structure is formed and then printed.
 
@@ -154,6 +159,7 @@ def print_save_tree(root_dir, formed_tree='', dir_path='', save_dir='', print_tr
         save_dir (str):         (Optional) Absolute path. If not empty, the tree structure will be saved as a .txt file in the given directory, else it is saved in <root_dir>/tmp. Default is ''
         print_tree (bool):      (Optional) If True, the tree structure is printed. Default is True
         save_tree (bool):       (Optional) If True, the tree structure is saved. Default is True
+        scan (dict):            (Optional) Scan of the directory (see dir_scan.scan_dir), used if the tree structure is formed. Default is None - the directory is scanned
 
     Returns:
         (str):                  Formed tree structure as a string
@@ -162,7 +168,7 @@ def print_save_tree(root_dir, formed_tree='', dir_path='', save_dir='', print_tr
 
     # If formed_tree is not passed, tree is generated for the given dir_path directory and saved as a .txt file in the save_dir directory
     if formed_tree == '':
-        formed_tree = tree(dir_path=dir_path, save_dir=save_dir if save_tree == True else '', print_tree=print_tree)
+        formed_tree = tree(dir_path=dir_path, save_dir=save_dir if save_tree == True else '', print_tree=print_tree, scan=scan)
         return formed_tree
 
     # If formed_tree is passed, and it is not a path to a .txt file, it is assumed to be a tree structure as a string
@@ -186,7 +192,7 @@ def print_save_tree(root_dir, formed_tree='', dir_path='', save_dir='', print_tr
             print(saved_tree)
         return saved_tree
 
-def dir_struct(doc_dir, process_names=False, convert_to_latin=False):
+def dir_struct(doc_dir, process_names=False, convert_to_latin=False, scan=None):
     """
     Recursively reads a structure of the given documentation directory.
 
@@ -195,12 +201,14 @@ def dir_struct(doc_dir, process_names=False, convert_to_latin=False):
         process_names (bool):    If True, special characters are removed from the file/directory names. Default is False
         save_struct (bool):      If True, the structure is saved in a file. Default is True
         convert_to_latin (bool): If True, cyrillic characters of the files/directories are converted to latin characters. Files/directories are renamed accordingly. Default is False
+        scan (dict):             (Optional) Scan of the directory (see dir_scan.scan_dir). If not passed, the directory is scanned. Default is None
 
     Returns:
         dir_struct (dict):       Dictionary representing directory: {'name': <name of the file/directory>, 'processed_name': <name with special characters removed>, 'type': <"file" or "directory">, 'path': <path to file/directory>, 'contents': <for directories only (else empty): list of all files in the directory>}
     """
+    scan = scan if scan is not None else dir_scan.scan_dir(doc_dir)
     name = doc_dir.split(os.sep)[-1]
-    type = 'directory' if os.path.isdir(doc_dir) else 'file'
+    type = 'directory' if scan['is_dir'] else 'file'
     processed_name = util.process_name(name=name, file=True if type == 'file' else False) if process_names == True else name
     orig_name = name
     name = cyrillic_to_latin.cyrillic_to_latin(name) if convert_to_latin == True else name
@@ -209,10 +217,11 @@ def dir_struct(doc_dir, process_names=False, convert_to_latin=False):
 
     if type == 'file':
         return [{'name': name, 'orig_name': orig_name, 'processed_name': processed_name, 'type': type, 'contents': contents}]
-    for dir_item in os.listdir(doc_dir):
+    for item in scan['contents']:
+        dir_item = item['name']
         if dir_item == '.DS_Store':
             continue
-        if os.path.isfile(os.path.join(doc_dir, dir_item)):
+        if item['is_file']:
             contents.append({'name': dir_item if convert_to_latin == False else cyrillic_to_latin.cyrillic_to_latin(dir_item),
                                     'orig_name': dir_item,
                                     'processed_name': util.process_name(name=dir_item, file=True) if process_names == True else dir_item,
@@ -220,7 +229,7 @@ def dir_struct(doc_dir, process_names=False, convert_to_latin=False):
                                     'path': os.path.join(doc_dir, dir_item if convert_to_latin == False else cyrillic_to_latin.cyrillic_to_latin(dir_item)),
                                     'contents': []})
             continue
-        contents.append(dir_struct(os.path.join(doc_dir, dir_item), process_names=process_names))
+        contents.append(dir_struct(os.path.join(doc_dir, dir_item), process_names=process_names, scan=item))
     return {'name': name, 'orig_name': orig_name, 'processed_name': processed_name, 'type': type, 'path': doc_dir, 'contents': contents}
 
 def save_json(file_path, data):
@@ -334,42 +343,41 @@ def find_studies_programme(root_dir, html_file_lat):
     studies_programme, studies_type = '', ''
     studies_programme_found = False
     stud_type_found = False
-    tables_in_file = re.findall(r'\<table\>.*?\<\/table\>', html_file_lat)
-    for table in tables_in_file:
+    for table_read in html_tables.read_tables(html_file_lat):
         if studies_programme_found == True and stud_type_found == True:
             break
-        if not re.search(r'Naziv\s*(?:studijskog)*\s*programa|Studijski\s*program', table, re.I):
+        if not patterns.PATTERNS['studies_programme'].search(html_tables.table_text(table_read)):
             continue
-        table_read = pd.read_html(table)[0]
         print(f"Studies programme table: \n{table_read}")
-        for index, row in enumerate(table_read.values):
+        for index, row in enumerate(table_read):
             if studies_programme_found == True and stud_type_found == True:
                 break
-            if True not in [True if re.search(r'Naziv\s*(?:studijskog)*\s*programa|Studijski\s*program|Vrsta\s*studija', i, re.I) else False for i in row]:
+            row = [i if i is not None else '' for i in row]
+            if True not in [True if patterns.PATTERNS['studies_programme_or_type'].search(i) else False for i in row]:
                 continue
             for indexCol, col in enumerate(row):
-                if studies_programme_found == False and re.search(r'Naziv\s*(?:studijskog)*\s*programa|Studijski\s*program', col, re.I):
+                if studies_programme_found == False and patterns.PATTERNS['studies_programme'].search(col):
                     if len(row) > indexCol + 1:
                         studies_programme = row[indexCol + 1]
                     else:
-                        colName = re.findall(r'Naziv\s*(?:studijskog)*\s*programa|Studijski\s*program', col, re.I)[0]
-                        studies_programme = re.sub(re.escape(colName), '', col)
+                        colName = patterns.PATTERNS['studies_programme'].findall(col)[0]
+                        studies_programme = patterns.literal(colName).sub('', col)
                     studies_programme_found = True
                     break
-                elif stud_type_found == False and re.search(r'Vrsta\s*studija', col, re.I):
+                elif stud_type_found == False and patterns.PATTERNS['studies_type'].search(col):
                     if len(row) > indexCol + 1:
                         studies_type = row[indexCol + 1]
-                        if not re.search(r'^[A-Z]$', studies_type) and len(studies_type.split()) > 0:
+                        if not patterns.PATTERNS['studies_type_abbreviation'].search(studies_type) and len(studies_type.split()) > 0:
                             studies_type = ''.join([i[0].upper() for i in studies_type.split()])
                     else:
-                        colName = re.findall(r'Vrsta\s*studija', col, re.I)[0]
-                        studies_type = re.sub(re.escape(colName), '', col)
+                        colName = patterns.PATTERNS['studies_type'].findall(col)[0]
+                        studies_type = patterns.literal(colName).sub('', col)
                     stud_type_found = True
                     break
     results_save_read.save_results(root_dir=root_dir, results={'studies_programme': studies_programme, 'studies_type': studies_type})
     return {'studies_programme': studies_programme, 'studies_type': studies_type}
 
-def find_link_tags(root_dir, doc_dir, html_file_txt, file_format='md'):
+def find_link_tags(root_dir, doc_dir, html_file_txt, file_format='md', index=None, link_tag_lines=None):
     """
     Finds all link tags in the given .md file.
 
@@ -378,27 +386,30 @@ def find_link_tags(root_dir, doc_dir, html_file_txt, file_format='md'):
         doc_dir (str):         Absolute path to the documentation directory
         html_file_txt (str):     .md or .html file content
         file_format (str):     (Optional) File format of the file, either 'md' or 'html'. Default is 'md'
+        index (PathIndex):     (Optional) Index of the documentation directory (see path_index.py), used to check link paths exist. Default is None - the directory is indexed
+        link_tag_lines (list): (Optional) Link tag lines already found (e.g. read from the .docx file, see docx_stream.py), html_file_txt is not searched. Default is None
 
     Returns:
         (list):                List of link
 
     """
-    link_tag_lines = []
     link_tags = []
-    if file_format == 'md':
+    if link_tag_lines is None and file_format == 'md':
+        link_tag_lines = []
         for line in html_file_txt.split('\n'):
             if re.search(r'\(file\:', line) or re.search(r'\(\.\.\{}'.format(os.sep), line):
                 link_tag_lines.append(line)
-    else:
+    elif link_tag_lines is None:
         link_tag_lines = re.findall(r'\<p\>.*?\<a href\=.*?\<\/a\>.*?\<\/p\>', html_file_txt)
     # Save link tag lines to a file
     if not os.path.exists(os.path.join(root_dir, Path('tmp'))):
         os.makedirs(os.path.join(root_dir, Path('tmp')))
     with open(os.path.join(root_dir, Path('tmp/link_tags.txt')), 'w', encoding='utf-8') as f:
         f.write('\n'.join(link_tag_lines))
+    index = index if index is not None else path_index.PathIndex(doc_dir)
     found_tags = []
     for indexLine, line in enumerate(link_tag_lines):
-        all_line_tags = extract_path_from_tag(line, doc_dir=doc_dir)
+        all_line_tags = extract_path_from_tag(line, doc_dir=doc_dir, index=index)
         if all_line_tags == ['not_file_link']:
             continue
         for tag in all_line_tags:
@@ -408,7 +419,7 @@ def find_link_tags(root_dir, doc_dir, html_file_txt, file_format='md'):
         json.dump(found_tags, f, indent=4)
     return found_tags
 
-def extract_path_from_tag(tag_line, doc_dir='', file_format='html'):
+def extract_path_from_tag(tag_line, doc_dir='', file_format='html', index=None):
     """
     Extracts the path from the given tag.
 
@@ -416,10 +427,12 @@ def extract_path_from_tag(tag_line, doc_dir='', file_format='html'):
         tag_line (str):         Tag line to be processed
         doc_dir (str):          (Optional) Absolute path to the documentation directory. Default is ''
         file_format (str):      (Optional) File format of the file, either 'md' or 'html'. Default is 'html'
+        index (PathIndex):      (Optional) Index of the documentation directory (see path_index.py), used to check the path exists. Default is None - directories are listed on first use
 
     Returns:
         (str):                  Path extracted from the tag
     """
+    index = index if index is not None else path_index.PathIndex()
     line_tags = []
     tag_abs_path = r'file\:\/\/\/'
     tag_rel_path = r'\.\.\/'
@@ -457,7 +470,7 @@ def extract_path_from_tag(tag_line, doc_dir='', file_format='html'):
             from urllib.parse import unquote
         if abs_path == True:
             tag_path = unquote(tag_path)
-            if os.path.exists(tag_path):
+            if index.exists(tag_path):
                 print(f'Found link to file: {tag_path}')
             else:
                 print(f'Link to file not found: {tag_path}')
@@ -467,7 +480,7 @@ def extract_path_from_tag(tag_line, doc_dir='', file_format='html'):
         tag_path = os.path.join(doc_dir, Path(tag_path) if str(doc_dir).split(os.sep)[-1] != str(tag_path).split(os.sep)[0] else Path(os.sep.join(tag_path.split(os.sep)[1:])))
         # Convert to readable path
         tag_path = unquote(tag_path)
-        if os.path.exists(tag_path):
+        if index.exists(tag_path):
             print(f'Found link to file: {tag_path}')
         else:
             print(f'Link to file not found: {tag_path}')
@@ -512,56 +525,31 @@ def extract_path_from_tag(tag_line, doc_dir='', file_format='html'):
             if abs_path == False:
                 tag_path = os.path.join(doc_dir, Path(tag_path))
             tag_alt_path = ''
-            if not os.path.exists(tag_path):
-                path_found = False
-                path_parent = os.sep.join(tag_path.split(os.sep)[:-1])
-                if os.path.exists(path_parent) and os.path.isdir(path_parent):
-                    parent_dir_contents = os.listdir(path_parent)
-                    file_name = tag_path.split(os.sep)[-1]
-                    for item in parent_dir_contents:
-                        if file_name == cyrillic_to_latin.cyrillic_to_latin(item):
-                            path_found = True
-                            break
-                if path_found == False:
-                    tag_path_new = tag_path
-                    while len(tag_path_new) > 0:
-                        if os.path.exists(tag_path_new):
-                            tag_alt_path = tag_path_new
-                            break
-                        tag_path_new = tag_path_new[:-1]
+            # If the file is not found by its name or its name in latin characters, the longest existing part of the path is used
+            if not index.exists_latin(tag_path):
+                tag_alt_path = index.longest_existing_prefix(tag_path)
             tag_desc = tag_line if tag_desc == '' else tag_desc
             line_tags.append({'name': tag_name, 'path': tag_path, 'desc': tag_desc, 'line': tag_line, 'verified_path': tag_alt_path if tag_alt_path != '' else tag_path})
     return line_tags
 
-def verify_hyperlinks(root_dir, found_hyperlinks):
+def verify_hyperlinks(root_dir, found_hyperlinks, index=None):
     """
     Verifies if the files listed in the given list of hyperlinks exist.
 
     Args:
         root_dir (str):          Root directory of the project, absolute path
         found_hyperlinks (list): List of hyperlinks
+        index (PathIndex):       (Optional) Index of the documentation directory (see path_index.py). Default is None - directories are listed on first use
 
     Returns:
         (list):                  List of hyperlinks that do not exist
     """
+    index = index if index is not None else path_index.PathIndex()
     unmatched_hyperlinks = []
     for hyperlink in found_hyperlinks:
-        hyperlink_verified = False
-        # Check if hyperlink path exists
-        if os.path.exists(hyperlink['path']):
-            hyperlink_verified = True
+        # Check if hyperlink path exists, or its parent directory contains the file with the name in latin characters
+        if index.exists_latin(hyperlink['path']):
             continue
-        # Check if parent directory of hyperlink path exists, and check files in that directory
-        parent_dir = os.sep.join(hyperlink['path'].split(os.sep)[:-1])
-        if os.path.exists(parent_dir) and os.path.isdir(parent_dir):
-            parent_dir_contents = os.listdir(parent_dir)
-            file_name = hyperlink['path'].split(os.sep)[-1]
-            for item in parent_dir_contents:
-                if file_name == cyrillic_to_latin.cyrillic_to_latin(item):
-                    hyperlink_verified = True
-                    break
-            if hyperlink_verified == True:
-                continue
         unmatched_hyperlinks.append(hyperlink)
     results_save_read.save_results(root_dir=root_dir, results={'unmatched_hyperlinks': unmatched_hyperlinks})
     return unmatched_hyperlinks
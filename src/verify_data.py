@@ -3,12 +3,22 @@ Verification of data in the documentation files.
 """
 import json
 import os
-import pandas as pd
 from pathlib import Path
 import re
+import time
+import copy
+from concurrent.futures import ProcessPoolExecutor
 
 import src.util as util
 import src.results_save_read as results_save_read
+import src.prof_subj_matching as prof_subj_matching
+import src.prof_subj_sql as prof_subj_sql
+import src.html_tables as html_tables
+import src.incremental as incremental
+import src.patterns as patterns
+
+# Increase when extraction of professor or subjects tables changes, so tables extracted in previous runs are extracted again
+EXTRACTION_VERSION = 1
 
 
 def find_professors_file(root_dir, links, search_regex=''):
@@ -24,14 +34,14 @@ def find_professors_file(root_dir, links, search_regex=''):
         (dict):                  Professors file
     """
     professors_file = []
-    search_regex = r'Knjiga\snastavnika' if search_regex == '' else search_regex
+    search_pattern = patterns.PATTERNS['professors_file'] if search_regex == '' else patterns.compile_pattern(search_regex)
     for link in links:
-        if re.search(r'Knjiga\snastavnika', f'{link['name']} {link["desc"]} {link["line"]}'):
+        if patterns.PATTERNS['professors_file'].search(f'{link['name']} {link["desc"]} {link["line"]}'):
             professors_file.append(link)
     if len(professors_file) > 1:
         print('Multiple professors files found')
         for prof_file in professors_file:
-            if re.search(search_regex, prof_file['path']):
+            if search_pattern.search(prof_file['path']):
                 print(f'Professors file found: {prof_file["path"]}')
                 return prof_file
     return professors_file[0] if len(professors_file) > 0 else []
@@ -50,10 +60,10 @@ def find_subjects_file(root_dir, links, search_regex=''):
     """
     subjects_file = []
 
-    search_regex = r'Knjiga\spredmeta' if search_regex == '' else search_regex
+    search_pattern = patterns.PATTERNS['subjects_file'] if search_regex == '' else patterns.compile_pattern(search_regex)
 
     for link in links:
-        if re.search(search_regex, f'{link["name"]} {link["desc"]} {link["line"]}') and re.search(r'Tabela', link['name'], re.I):
+        if search_pattern.search(f'{link["name"]} {link["desc"]} {link["line"]}') and patterns.PATTERNS['subjects_file_table'].search(link['name']):
             subjects_file.append(link)
 
     return subjects_file[0] if len(subjects_file) > 0 else []
@@ -63,7 +73,7 @@ def extract_professor_table(prof_table, index_table):
     Extracts professor table data from the given table.
 
     Args:
-        prof_table (array):       Professor table
+        prof_table (list):        Professor table rows, each row a list of cell texts (None for empty cells)
         index_table (int):        Index of the table in the list of tables - to be used as a key for the data dictionary
     Returns:
         (dict):                   Professor table data with keys 'name', 'title', 'institution', 'sci_discipline', 'subjects', 'subjects_header'
@@ -71,10 +81,10 @@ def extract_professor_table(prof_table, index_table):
     prof_name, prof_title, institution, sci_discipline = '', '', '', ''
     subjects, subjects_header = [], []
     in_subjects, index_subject_row = False, 0
-    for index, row in enumerate(prof_table.values):
+    for index, row in enumerate(prof_table):
         if len(row) < 1:
             continue
-        if prof_name == '' and True not in [True if re.search(r'Ime i prezime', elem) else False for elem in row]:
+        if prof_name == '' and True not in [True if type(elem) == str and patterns.PATTERNS['prof_name'].search(elem) else False for elem in row]:
             continue
         row_elems = set()
         row = [elem for elem in row if elem not in row_elems and type(elem) == str and (row_elems.add(elem) or True)]
@@ -90,11 +100,11 @@ def extract_professor_table(prof_table, index_table):
         if sci_discipline == '':
             sci_discipline = row[4] if len(row) > 4 else row[3] if len(row) > 3 else row[2] if len(row) > 2 else row[1] if len(row) > 1 else row[0] if len(row) > 0 else ''
             continue
-        if in_subjects == True and True in [(True if re.search(r'Reprezentativne\sreference', re.sub(r'\s+', ' ', elem.strip()), re.I) else False) if type(elem) == str else False for elem in row]:
+        if in_subjects == True and True in [(True if patterns.PATTERNS['prof_references'].search(elem) else False) if type(elem) == str else False for elem in row]:
             in_subjects = False
             # Finishes reading current table. For reading other values, replace 'break' with 'continue' and add neccessary code.
             break
-        if in_subjects == False and not True in [(True if re.search(r'Spisak\spredmeta.*?akreditovan', re.sub(r'\s+', ' ', elem.strip()), re.I) else False) if type(elem) == str else False for elem in row]:
+        if in_subjects == False and not True in [(True if patterns.PATTERNS['prof_subjects'].search(elem) else False) if type(elem) == str else False for elem in row]:
             continue
         elif in_subjects == False:
             in_subjects = True
@@ -119,85 +129,87 @@ def extract_subjects_table(subj_table):
     Extracts subjects table data from the given table.
 
     Args:
-        subj_table (array):       Subjects table
+        subj_table (list):        Subjects table rows, each row a list of cell texts (None for empty cells)
     Returns:
         (dict):                   Subjects table data
     """
     school, study_programme, subject, subject_code, subject_name, professor, subject_status, espb, condition, theory_classes, practical_classes, class_points = '', '', '', '', '', '', '', '', '', '', '', {}
     subj_header = []
-    for index, row in enumerate(subj_table.values):
+    for index, row in enumerate(subj_table):
         if len(row) < 1:
             continue
-        if index == 0 and not re.search(r'školska\s+ustanova', row[0], re.I):
+        if index == 0 and not patterns.PATTERNS['school'].search(row[0] or ''):
             subj_header = row
             continue
         row_elems = set()
         row = [elem for elem in row if elem not in row_elems and type(elem) == str and (row_elems.add(elem) or True)]
-        if school == '' and re.search(r'školska\s+ustanova', row[0], re.I):
+        if len(row) < 1:
+            continue
+        if school == '' and patterns.PATTERNS['school'].search(row[0]):
             school = row[1].strip() if len(row) > 1 else ''
             if len(row) == 1:
-                school = re.findall(r'školska\s+ustanova.+', row[0], re.I)[0].strip()
-                school = re.sub(r'školska\s+ustanova\:*\s*', '', school)
+                school = patterns.PATTERNS['school_value'].findall(row[0])[0].strip()
+                school = patterns.PATTERNS['school_prefix'].sub('', school)
             continue
-        if study_programme == '' and re.search(r'Studijski\s+program', row[0], re.I):
+        if study_programme == '' and patterns.PATTERNS['study_programme'].search(row[0]):
             study_programme = row[1].strip() if len(row) > 1 else ''
             if len(row) == 1:
-                study_programme = re.findall(r'Studijski\s+program.+', row[0], re.I)[0].strip()
-                study_programme = re.sub(r'[sS]tudijski\s+program\:*\s*', '', study_programme)
+                study_programme = patterns.PATTERNS['study_programme_value'].findall(row[0])[0].strip()
+                study_programme = patterns.PATTERNS['study_programme_prefix'].sub('', study_programme)
             continue
-        if subject == '' and re.search(r'Naziv\s+predmeta', row[0], re.I):
+        if subject == '' and patterns.PATTERNS['subject'].search(row[0]):
             subject = row[1].strip() if len(row) > 1 else ''
             if len(row) == 1:
-                subject = re.findall(r'Naziv\s+predmeta.+', row[0], re.I)[0].strip()
-                subject = re.sub(r'[nN]aziv\s+predmeta\:*\s*', '', subject)
-            if re.search(r'^\[[0-9A-Z\.]+\]', subject):
-                subject_code = re.findall(r'^\[[0-9A-Z\.]+\]', subject)[0]
-                subject_name = re.sub(re.escape(subject_code), '', subject).strip()
+                subject = patterns.PATTERNS['subject_value'].findall(row[0])[0].strip()
+                subject = patterns.PATTERNS['subject_prefix'].sub('', subject)
+            if patterns.PATTERNS['subject_code'].search(subject):
+                subject_code = patterns.PATTERNS['subject_code'].findall(subject)[0]
+                subject_name = patterns.literal(subject_code).sub('', subject).strip()
             continue
-        if professor == '' and re.search(r'Nastavnik(?:\/nastavnici)*', row[0], re.I):
+        if professor == '' and patterns.PATTERNS['professor'].search(row[0]):
             professor = row[1].strip() if len(row) > 1 else ''
             if len(row) == 1:
-                professor = re.findall(r'Nastavnik(?:\/nastavnici)*.+', row[0], re.I)[0].strip()
-                row_name = re.findall(r'Nastavnik(?:\/nastavnici)*\:*', professor, re.I)[0].strip()
-                professor = re.sub(re.escape(row_name), '', professor).strip()
+                professor = patterns.PATTERNS['professor_value'].findall(row[0])[0].strip()
+                row_name = patterns.PATTERNS['professor_label'].findall(professor)[0].strip()
+                professor = patterns.literal(row_name).sub('', professor).strip()
             continue
-        if subject_status == '' and re.search(r'Status\s+predmeta', row[0], re.I):
+        if subject_status == '' and patterns.PATTERNS['subject_status'].search(row[0]):
             subject_status = row[1].strip() if len(row) > 1 else ''
             if len(row) == 1:
-                subject_status = re.findall(r'Status\s+predmeta.+', row[0], re.I)[0].strip()
-                subject_status = re.sub(r'[sS]tatus\s+predmeta\:*\s*', '', subject_status)
+                subject_status = patterns.PATTERNS['subject_status_value'].findall(row[0])[0].strip()
+                subject_status = patterns.PATTERNS['subject_status_prefix'].sub('', subject_status)
             continue
-        if espb == '' and re.search(r'ESPB', row[0], re.I):
+        if espb == '' and patterns.PATTERNS['espb'].search(row[0]):
             espb = row[1].strip() if len(row) > 1 else ''
             if len(row) == 1:
-                espb = re.findall(r'ESPB.+', row[0], re.I)[0].strip()
-                espb = re.sub(r'[eE][sS][pP][bB]\:*\s*', '', espb)
+                espb = patterns.PATTERNS['espb_value'].findall(row[0])[0].strip()
+                espb = patterns.PATTERNS['espb_prefix'].sub('', espb)
             continue
-        if condition == '' and re.search(r'Uslov', row[0], re.I):
+        if condition == '' and patterns.PATTERNS['condition'].search(row[0]):
             condition = row[1].strip() if len(row) > 1 else ''
             if len(row) == 1:
-                condition = re.findall(r'Uslov.+', row[0], re.I)[0].strip()
-                condition = re.sub(r'[uU]slov\:*\s*', '', condition)
+                condition = patterns.PATTERNS['condition_value'].findall(row[0])[0].strip()
+                condition = patterns.PATTERNS['condition_prefix'].sub('', condition)
             continue
-        if theory_classes == '' and practical_classes == '' and re.search(r'Broj\s+časova.+nastave', row[0], re.I):
-            theory_classes = [i for i in row[1:] if re.search(r'Teorijska\s+nastava', i, re.I)] if len(row) > 1 else []
+        if theory_classes == '' and practical_classes == '' and patterns.PATTERNS['classes'].search(row[0]):
+            theory_classes = [i for i in row[1:] if patterns.PATTERNS['theory_classes'].search(i)] if len(row) > 1 else []
             theory_classes = theory_classes[0] if len(theory_classes) > 0 else ''
-            practical_classes = [i for i in row[1:] if re.search(r'Praktična\s+nastava', i, re.I)] if len(row) > 1 else []
+            practical_classes = [i for i in row[1:] if patterns.PATTERNS['practical_classes'].search(i)] if len(row) > 1 else []
             practical_classes = practical_classes[0] if len(practical_classes) > 0 else ''
             if len(row) == 1:
-                theory_classes = re.findall(r'Teorijska\s+nastava\:*\s*[0-9]+', row[0], re.I)[0].strip()
-                practical_classes = re.findall(r'Praktična\s+nastava\:*\s*[0-9]+', row[0], re.I)[0].strip()
-            theory_classes = re.sub(r'[tT]eorijska\s+nastava\:*\s*', '', theory_classes)
-            practical_classes = re.sub(r'[pP]raktična\s+nastava\:*\s*', '', practical_classes)
+                theory_classes = patterns.PATTERNS['theory_classes_value'].findall(row[0])[0].strip()
+                practical_classes = patterns.PATTERNS['practical_classes_value'].findall(row[0])[0].strip()
+            theory_classes = patterns.PATTERNS['theory_classes_prefix'].sub('', theory_classes)
+            practical_classes = patterns.PATTERNS['practical_classes_prefix'].sub('', practical_classes)
             continue
-        if re.search(r'^predispitne\s*', row[0], re.I) and len(subj_table.values) > index + 1:
-            for index_next in range(index + 1, len(subj_table.values)):
-                for itemIndex, item in enumerate(subj_table.values[index_next]):
-                    if (item.__str__() != 'nan') and not item.isdecimal() and (len(class_points.keys()) == 0 or (item != list(class_points.keys())[-1]) or class_points[list(class_points.keys())[-1]] != None):
+        if patterns.PATTERNS['class_points'].search(row[0]) and len(subj_table) > index + 1:
+            for index_next in range(index + 1, len(subj_table)):
+                for itemIndex, item in enumerate(subj_table[index_next]):
+                    if item is not None and not item.isdecimal() and (len(class_points.keys()) == 0 or (item != list(class_points.keys())[-1]) or class_points[list(class_points.keys())[-1]] != None):
                         if item not in class_points.keys():
                             class_points[item] = None
                         else:
-                            item_num = re.findall(r'[0-9]+$', item)
+                            item_num = patterns.PATTERNS['trailing_number'].findall(item)
                             if len(item_num) > 0:
                                 for i in range(len(item_num)):
                                     if item_num[i].isdecimal():
@@ -208,11 +220,73 @@ def extract_subjects_table(subj_table):
                             item_num += 1
                             class_points[f'{item} {item_num}'] = None
 
-                    elif (item.__str__() != 'nan') and item.isdecimal() and class_points[list(class_points.keys())[-1]] is None:
+                    elif item is not None and item.isdecimal() and class_points[list(class_points.keys())[-1]] is None:
                         class_points[list(class_points.keys())[-1]] = item
     return {'school': school, 'studies_programme': study_programme, 'subject': subject, 'subject_code': subject_code, 'subject_name': subject_name, 'professor': professor, 'subject_status': subject_status, 'espb': espb, 'condition': condition, 'theory_classes': theory_classes, 'practical_classes': practical_classes, 'class_points': class_points, 'subjects_header': subj_header}
 
-def read_professors(root_dir, professors_file_txt):
+def extract_tables_chunk(table_type, tables):
+    """
+    Extracts data from a chunk of professor or subjects tables. Used by extract_tables, in a worker process when extracting in parallel.
+
+    Args:
+        table_type (str):        Type of the tables: 'prof' for professor tables, 'subj' for subjects tables
+        tables (list):           List of (index of the table, table rows)
+    Returns:
+        (list):                  Extracted tables data, in the order of the given tables
+        (float):                 Extraction time in seconds
+    """
+    start_time = time.perf_counter()
+    if table_type == 'prof':
+        extracted = [extract_professor_table(prof_table=table, index_table=indexTable) for indexTable, table in tables]
+    else:
+        extracted = [extract_subjects_table(subj_table=table) for indexTable, table in tables]
+    return extracted, time.perf_counter() - start_time
+
+def extract_tables(table_type, tables, processes=0, chunk_size=50, table_cache=None):
+    """
+    Extracts data from professor or subjects tables. If processes is greater than 1, chunks of tables are extracted in parallel in a process pool.
+
+    Args:
+        table_type (str):        Type of the tables: 'prof' for professor tables, 'subj' for subjects tables
+        tables (list):           List of (index of the table, table rows)
+        processes (int):         (Optional) Number of worker processes. If 0 or 1, tables are extracted in the current process. Default is 0
+        chunk_size (int):        (Optional) Number of tables extracted by a worker process at once. Default is 50
+        table_cache (dict):      (Optional) Tables extracted in the previous run, by table fingerprint. Unchanged tables are taken from it instead of being extracted,
+                                 and it is updated to the tables of this run. Default is None - all tables are extracted
+    Returns:
+        (list):                  Extracted tables data, in the order of the given tables
+    """
+    if table_cache is not None:
+        # Professor tables are keyed by their index too (table_key of the extracted data)
+        keys = [incremental.fingerprint([EXTRACTION_VERSION, table_type, indexTable if table_type == 'prof' else None, table]) for indexTable, table in tables]
+        changed = [index for index, key in enumerate(keys) if key not in table_cache]
+        print(f'Extracting {len(changed)} new or changed tables, {len(tables) - len(changed)} tables unchanged since the previous run')
+        extracted_changed = extract_tables(table_type=table_type, tables=[tables[index] for index in changed], processes=processes, chunk_size=chunk_size)
+        extracted = [None] * len(tables)
+        for index, table_extracted in zip(changed, extracted_changed):
+            extracted[index] = table_extracted
+            table_cache[keys[index]] = copy.deepcopy(table_extracted)
+        for index, key in enumerate(keys):
+            if extracted[index] is None:
+                extracted[index] = copy.deepcopy(table_cache[key])
+        # Only tables of this run are kept
+        for key in set(table_cache.keys()) - set(keys):
+            del table_cache[key]
+        return extracted
+    if processes <= 1 or len(tables) <= chunk_size:
+        return extract_tables_chunk(table_type=table_type, tables=tables)[0]
+    chunk_size = max(1, chunk_size)
+    chunks = [tables[i:i + chunk_size] for i in range(0, len(tables), chunk_size)]
+    extracted = []
+    print(f'Extracting {len(tables)} tables in {len(chunks)} chunks with {processes} worker processes...')
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        # Results are returned in the order of the chunks, so table indexes are kept
+        for indexChunk, (chunk_extracted, chunk_time) in enumerate(executor.map(extract_tables_chunk, [table_type] * len(chunks), chunks)):
+            print(f'    Chunk {indexChunk + 1}/{len(chunks)}: tables {chunks[indexChunk][0][0]}-{chunks[indexChunk][-1][0]} extracted in {chunk_time:.3f} s')
+            extracted += chunk_extracted
+    return extracted
+
+def read_professors(root_dir, professors_file_txt, processes=0, chunk_size=50, table_cache=None, tables=None):
     """
     Reads contents of the professors file. Created a list of tables, with each table represented by a dictionary.
     First table is a list of professors (keys are 'ord_num', 'prof_name', 'prof_title').
@@ -221,6 +295,10 @@ def read_professors(root_dir, professors_file_txt):
     Args:
         root_dir (str):              Root directory of the project, absolute path
         professors_file_txt (str):   Text of the professors file
+        processes (int):             (Optional) Number of worker processes extracting professor tables in parallel. If 0 or 1, tables are extracted sequentially. Default is 0
+        chunk_size (int):            (Optional) Number of professor tables extracted by a worker process at once. Default is 50
+        table_cache (dict):          (Optional) Professor tables extracted in the previous run, by table fingerprint (see extract_tables). Default is None - all tables are extracted
+        tables (iterable):           (Optional) Tables of the professors file, e.g. read from the .docx file (see docx_stream.read_tables). Default is None - tables are read from the text of the file
     Returns:
         (list):                      List of tables (each table represented by a dictionary)
     """
@@ -228,23 +306,19 @@ def read_professors(root_dir, professors_file_txt):
     data = {}
     if os.path.exists(os.path.join(root_dir, Path('tmp/results/results.json'))):
         data = results_save_read.load_results(root_dir=root_dir)
-    tables_in_file = re.findall(r'\<table\>.*?\<\/table\>', professors_file_txt)
-    read_tables = []
     prof_tables = []
     table_data = []
-    for indexTable, table in enumerate(tables_in_file):
-        table_read = pd.read_html(table)[0]
+    tables_to_extract = []
+    for indexTable, table_read in enumerate(tables if tables is not None else html_tables.read_tables(professors_file_txt)):
         # table_read.to_csv(os.path.join(root_dir, Path('tmp/converted_documents_md_html/curr_table.txt', sep='\t', index=False)))
-        read_tables.append(table_read)
-        print(table_read)
         if indexTable == 0:
             # First table is a list of professors
-            header = table_read.values[0]
+            header = table_read[0] if len(table_read) > 0 else []
             header_elems = set()
             header = [elem for elem in header if elem not in header_elems and type(elem) == str and (header_elems.add(elem) or True)]
             table_vals = []
-            for index, row in enumerate(table_read.values[1:]):
-                ord_num = row[0].replace('.', '') if len(row) > 0 else ''
+            for index, row in enumerate(table_read[1:]):
+                ord_num = row[0].replace('.', '') if len(row) > 0 and row[0] is not None else ''
                 jmbg = row[1] if len(row) > 1 else ''
                 prof_name = row[2] if len(row) > 1 else ''
                 prof_title = row[3] if len(row) > 2 else ''
@@ -252,15 +326,16 @@ def read_professors(root_dir, professors_file_txt):
             table_data.append({'type': 'prof_list', 'data': table_vals, 'header': header})
             continue
         # Other tables are professor tables
-        professor_table = extract_professor_table(prof_table=table_read, index_table=indexTable)
+        tables_to_extract.append((indexTable, table_read))
+    for professor_table in extract_tables(table_type='prof', tables=tables_to_extract, processes=processes, chunk_size=chunk_size, table_cache=table_cache):
         subjects_filter_programme = []
         if data != {} and ('studies_programme' in data.keys() or 'studies_type' in data.keys()):
             studies_programme = data['studies_programme'] if 'studies_programme' in data.keys() else ''
             studies_type = data['studies_type'] if 'studies_type' in data.keys() else ''
             for subject in professor_table['subjects']:
-                if studies_type != '' and re.search(studies_type, subject['studies_type']):
+                if studies_type != '' and patterns.compile_pattern(studies_type).search(subject['studies_type']):
                     subjects_filter_programme.append(subject)
-                elif studies_programme != '' and re.search(studies_programme, subject['studies_programme']):
+                elif studies_programme != '' and patterns.compile_pattern(studies_programme).search(subject['studies_programme']):
                     subjects_filter_programme.append(subject)
             professor_table['subjects_all'] = professor_table['subjects']
             professor_table['subjects'] = subjects_filter_programme
@@ -271,7 +346,7 @@ def read_professors(root_dir, professors_file_txt):
     print(f'Saved professors data to {save_path}')
     return table_data, save_path
 
-def read_subjects(root_dir, subjects_file_txt):
+def read_subjects(root_dir, subjects_file_txt, processes=0, chunk_size=50, table_cache=None, tables=None):
     """
     Reads contents of the subjects file. Created a list of tables, with each table represented by a dictionary.
     First table is a list of subjects (keys are 'index', 'code', 'name', 'type', 'studies_programme', 'studies_type').
@@ -280,6 +355,10 @@ def read_subjects(root_dir, subjects_file_txt):
     Args:
         root_dir (str):              Root directory of the project, absolute path
         subjects_file_txt (str):     Text of the subjects file
+        processes (int):             (Optional) Number of worker processes extracting subjects tables in parallel. If 0 or 1, tables are extracted sequentially. Default is 0
+        chunk_size (int):            (Optional) Number of subjects tables extracted by a worker process at once. Default is 50
+        table_cache (dict):          (Optional) Subjects tables extracted in the previous run, by table fingerprint (see extract_tables). Default is None - all tables are extracted
+        tables (iterable):           (Optional) Tables of the subjects file, e.g. read from the .docx file (see docx_stream.read_tables). Default is None - tables are read from the text of the file
     Returns:
         (list):                      List of tables (each table represented by a dictionary)
     """
@@ -287,23 +366,19 @@ def read_subjects(root_dir, subjects_file_txt):
     data = {}
     if os.path.exists(os.path.join(root_dir, Path('tmp/results/results.json'))):
         data = results_save_read.load_results(root_dir=root_dir)
-    tables_in_file = re.findall(r'\<table\>.*?\<\/table\>', subjects_file_txt)
-    read_tables = []
     subjects_tables = []
     table_data = []
-    for indexTable, table in enumerate(tables_in_file):
-        table_read = pd.read_html(table)[0]
+    tables_to_extract = []
+    for indexTable, table_read in enumerate(tables if tables is not None else html_tables.read_tables(subjects_file_txt)):
         # table_read.to_csv(os.path.join(root_dir, Path('tmp/converted_documents_md_html/curr_table.txt', sep='\t', index=False)))
-        read_tables.append(table_read)
-        print(table_read)
         if indexTable == 0:
             # First table is a list of subjects
-            header = table_read.values[0]
+            header = table_read[0] if len(table_read) > 0 else []
             header_elems = set()
             header = [elem for elem in header if elem not in header_elems and type(elem) == str and (header_elems.add(elem) or True)]
             table_vals = []
-            for index, row in enumerate(table_read.values[1:]):
-                ord_num = row[0].replace('.', '') if len(row) > 0 else ''
+            for index, row in enumerate(table_read[1:]):
+                ord_num = row[0].replace('.', '') if len(row) > 0 and row[0] is not None else ''
                 subj_code = row[1] if len(row) > 1 else ''
                 subj_name = row[2] if len(row) > 1 else ''
                 sub_type = row[3] if len(row) > 3 else ''
@@ -317,8 +392,8 @@ def read_subjects(root_dir, subjects_file_txt):
             table_data.append({'type': 'subj_list', 'data': table_vals, 'header': header})
             continue
         # Other tables are subjects tables
-        subjects_table = extract_subjects_table(subj_table=table_read)
-        subjects_tables.append(subjects_table)
+        tables_to_extract.append((indexTable, table_read))
+    subjects_tables = extract_tables(table_type='subj', tables=tables_to_extract, processes=processes, chunk_size=chunk_size, table_cache=table_cache)
     subj_tables_filter_programme = []
     if data != {} and ('studies_programme' in data.keys() or 'studies_type' in data.keys()):
         studies_programme = data['studies_programme'] if 'studies_programme' in data.keys() else ''
@@ -327,9 +402,9 @@ def read_subjects(root_dir, subjects_file_txt):
             s_p = True if studies_programme == '' else False
             s_t = True if studies_type == '' else False
             if s_p == False:
-                s_p = True if re.search(studies_programme, subj_table['studies_programme']) else False
+                s_p = True if patterns.compile_pattern(studies_programme).search(subj_table['studies_programme']) else False
             if s_t == False and 'studies_type' in subj_table.keys() or 'studies_programme' in subj_table.keys():
-                s_t = True if re.search(studies_type, subj_table['studies_type' if 'studies_type' in subj_table.keys() else 'studies_programme']) else False
+                s_t = True if patterns.compile_pattern(studies_type).search(subj_table['studies_type' if 'studies_type' in subj_table.keys() else 'studies_programme']) else False
             if s_p == True and s_t == True:
                 subj_tables_filter_programme.append(subj_table)
     table_data.append({'type': 'subj_tables', 'data': subj_tables_filter_programme, 'data_all': subjects_tables, 'header': subjects_tables[0]['subjects_header'] if len(subjects_tables) > 0 else []})
@@ -338,7 +413,7 @@ def read_subjects(root_dir, subjects_file_txt):
     print(f'Saved subjects data to {save_path}')
     return table_data, save_path
 
-def compare_prof_and_subj_data(root_dir, prof_data='', subj_data='', prof_data_save_path='', subj_data_save_path=''):
+def compare_prof_and_subj_data(root_dir, prof_data='', subj_data='', prof_data_save_path='', subj_data_save_path='', backend='python'):
     """
     Compares professors and subjects data. Accepts professors and subjects data or paths to the data files.
 
@@ -348,6 +423,7 @@ def compare_prof_and_subj_data(root_dir, prof_data='', subj_data='', prof_data_s
         subj_data (dict):            Subjects data
         prof_data_save_path (str):   Path to the professors data file
         subj_data_save_path (str):   Path to the subjects data file
+        backend (str):               (Optional) Comparison backend, 'python' or 'sql' (matching in an in-memory SQLite database, see prof_subj_sql). Default is 'python'
     Returns:
         (dict):                       Comparison results
     """
@@ -362,20 +438,29 @@ def compare_prof_and_subj_data(root_dir, prof_data='', subj_data='', prof_data_s
     prof_tables = prof_tables[0] if len(prof_tables) > 0 else []
     subj_tables = [i['data'] for i in subj_data if i['type'] == 'subj_tables']
     subj_tables = subj_tables[0] if len(subj_tables) > 0 else []
+    if backend == 'sql':
+        start_time = time.perf_counter()
+        professors_to_subjects_not_found, subjects_to_professors_not_found = prof_subj_sql.compare(prof_tables=prof_tables, subj_tables=subj_tables)
+        print(f"Compared {len(prof_tables)} professors and {len(subj_tables)} subjects in SQLite ({round(time.perf_counter() - start_time, 2)} s)")
+        for item in professors_to_subjects_not_found:
+            print(f"    Subject {item['subject']} of professor {item['professor']} not found in subjects file!")
+        for item in subjects_to_professors_not_found:
+            print(f"    Professor not found in professors file for subject {item['subject']}!")
+        results_save_read.save_results(root_dir=root_dir, results={'prof_to_subj_not_found': professors_to_subjects_not_found, 'subj_to_prof_not_found': subjects_to_professors_not_found})
+        return {'prof_to_subj_not_found': professors_to_subjects_not_found, 'subj_to_prof_not_found': subjects_to_professors_not_found}
+    # Index subjects tables and professors' subjects by subject code
+    index = prof_subj_matching.build_index(prof_tables=prof_tables, subj_tables=subj_tables)
     # Compare professors to subjects
     for indexProf, prof in enumerate(prof_tables):
         print(f"{'-' * 20}\n{indexProf + 1}/{len(prof_tables)}    Finding subjects for professor {prof['name']}...\n")
         for indexProfSubj, prof_subj in enumerate(prof['subjects']):
             subject_found = False
             pot_subjects = []
-            for indexSubj, subj in enumerate(subj_tables):
-                if not (prof_subj['code'] == subj['subject_code'] or re.search(re.escape(prof_subj['code']), subj['subject'], re.I)):
-                    continue
-                if not re.search(re.escape(prof['name']), subj['professor']):
-                    pot_subjects.append({'type': 'prof_name_mismatch', 'subject': subj})
-                    continue
-                if not (re.search(re.escape(prof_subj['subject_name'].lower()),subj['subject_name'].lower()) or re.search(re.escape(subj['subject_name']), prof_subj['subject_name'].lower())):
-                    pot_subjects.append({'type': 'subj_name_mismatch', 'subject': subj})
+            for indexSubj in prof_subj_matching.subject_candidates(index=index, prof_subj=prof_subj):
+                subj = subj_tables[indexSubj]
+                mismatch = prof_subj_matching.match_type(prof=prof, prof_subj=prof_subj, subj=subj)
+                if mismatch != '':
+                    pot_subjects.append({'type': mismatch, 'subject': subj})
                     continue
                 subject_found = True
                 break
@@ -391,19 +476,19 @@ def compare_prof_and_subj_data(root_dir, prof_data='', subj_data='', prof_data_s
         professor_found = False
         professor = ''
         pot_professors = []
-        for indexProf, prof in enumerate(prof_tables):
-            for indexProfSubj, prof_subj in enumerate(prof['subjects']):
-                if not ((subj['subject_code'] != '' and subj['subject_code'] == prof_subj['code']) or re.search(re.escape(prof_subj['code']), subj['subject'], re.I)):
-                    continue
-                if not re.search(re.escape(prof['name']), subj['professor']):
-                    pot_professors.append({'type': 'prof_name_mismatch', 'prof': prof})
-                    continue
-                if not(re.search(re.escape(prof_subj['subject_name'].lower()),subj['subject_name'].lower()) or re.search(re.escape(subj['subject_name']), prof_subj['subject_name'].lower())):
-                    pot_professors.append({'type': 'subj_name_mismatch', 'prof': prof})
-                    continue
-                professor_found = True
-                professor = prof
-                break
+        matched_prof = -1
+        for indexProf, indexProfSubj in prof_subj_matching.professor_candidates(index=index, subj=subj, indexSubj=indexSubj):
+            # Remaining subjects of a professor are skipped once one of them matches
+            if indexProf == matched_prof:
+                continue
+            prof = prof_tables[indexProf]
+            mismatch = prof_subj_matching.match_type(prof=prof, prof_subj=prof['subjects'][indexProfSubj], subj=subj)
+            if mismatch != '':
+                pot_professors.append({'type': mismatch, 'prof': prof})
+                continue
+            professor_found = True
+            professor = prof
+            matched_prof = indexProf
         if professor_found == False:
             subjects_to_professors_not_found.append({'subject': subj['subject'], 'subject_code': subj['subject_code'], 'subject_name': subj['subject_name'], 'studies_programme': subj['studies_programme'], 'professor': subj['professor'], 'potential_matches': pot_professors})
             print(f"    Professor not found in professors file for subject {subj['subject']}!")
@@ -453,10 +538,10 @@ def filter_sort_results(root_dir):
     # Filter professors to subjects comparison to find unmatched items for specific studies programme and studies type only
     prof_to_subj_filt_not_found = [i for i in prof_to_subj if i['potential_matches'] == []]
     prof_to_subj_filt_not_found = [i for i in prof_to_subj_filt_not_found if i['studies_programme'].lower() == studies_programme.lower() or\
-        re.search(re.escape(studies_programme), i['studies_programme'], re.I) or\
-            re.search(re.escape(i['studies_programme']), studies_programme, re.I)]
+        patterns.literal(studies_programme, re.I).search(i['studies_programme']) or\
+            patterns.literal(i['studies_programme'], re.I).search(studies_programme)]
     if studies_type != '':
-        prof_to_subj_filt_not_found = [i for i in prof_to_subj_filt_not_found if ('studies_type' in i.keys() and i['studies_type'].lower == studies_type.lower()) or ('studies_type' not in i.keys() and re.search(re.escape(studies_type), i['studies_programme'], re.I))]
+        prof_to_subj_filt_not_found = [i for i in prof_to_subj_filt_not_found if ('studies_type' in i.keys() and i['studies_type'].lower == studies_type.lower()) or ('studies_type' not in i.keys() and patterns.literal(studies_type, re.I).search(i['studies_programme']))]
     print(f"Professors to subjects not found: {json.dumps(prof_to_subj_filt_not_found, indent=4)}")
     # Filter professors to subjects comparison results to find items with mismatched professor name
     prof_to_subj_filt_pot_matches_prof_name = [i for i in prof_to_subj if i['potential_matches'] != []]
@@ -477,7 +562,7 @@ def filter_sort_results(root_dir):
             if len(prof_name_subj) == 3 and prof_name_subj[1].endswith('.') and len(prof_name_subj[1]) in [2, 3]:
                 prof_name_subj = [prof_name_subj[0], prof_name_subj[2]]
             prof_to_subj_name = ' '.join(prof_name_subj)
-            if True not in [True if re.search(re.escape(name_item), prof_to_subj_name) else False for name_item in prof_name_prof]:
+            if True not in [True if patterns.literal(name_item).search(prof_to_subj_name) else False for name_item in prof_name_prof]:
                 potential_matches.append(item_subj)
         if potential_matches != []:
             item['potential_matches'] = potential_matches
@@ -493,10 +578,10 @@ def filter_sort_results(root_dir):
     # Filter subjects to professors comparison to find unmatched items for specific studies programme and studies type only
     subj_to_prof_filt_not_found = [i for i in subj_to_prof if i['potential_matches'] == []]
     subj_to_prof_filt_not_found = [i for i in subj_to_prof_filt_not_found if i['studies_programme'].lower() == studies_programme.lower() or\
-        re.search(re.escape(studies_programme), i['studies_programme'], re.I) or\
-            re.search(re.escape(i['studies_programme']), studies_programme, re.I)]
+        patterns.literal(studies_programme, re.I).search(i['studies_programme']) or\
+            patterns.literal(i['studies_programme'], re.I).search(studies_programme)]
     if studies_type != '':
-        subj_to_prof_filt_not_found = [i for i in subj_to_prof_filt_not_found if ('studies_type' in i.keys() and i['studies_type'].lower == studies_type.lower()) or ('studies_type' not in i.keys() and re.search(re.escape(studies_type), i['studies_programme'], re.I))]
+        subj_to_prof_filt_not_found = [i for i in subj_to_prof_filt_not_found if ('studies_type' in i.keys() and i['studies_type'].lower == studies_type.lower()) or ('studies_type' not in i.keys() and patterns.literal(studies_type, re.I).search(i['studies_programme']))]
     print(f"Subjects to professors not found: {json.dumps(subj_to_prof_filt_not_found, indent=4)}")
     # Filter subjects to professors comparison results to find items with mismatched professor name
     subj_to_prof_filt_pot_matches_prof_name = [i for i in subj_to_prof if i['potential_matches'] != []]
@@ -517,7 +602,7 @@ def filter_sort_results(root_dir):
             if len(prof_name_prof) == 3 and prof_name_prof[1].endswith('.') and len(prof_name_prof[1]) in [2, 3]:
                 prof_name_prof = [prof_name_prof[0], prof_name_prof[2]]
             subj_to_prof_name = ' '.join(prof_name_prof)
-            if True not in [True if re.search(re.escape(name_item), subj_to_prof_name) else False for name_item in prof_name_subj]:
+            if True not in [True if patterns.literal(name_item).search(subj_to_prof_name) else False for name_item in prof_name_subj]:
                 potential_matches.append(item_prof)
         if potential_matches != []:
             item['potential_matches'] = potential_matches
@@ -0,0 +1,239 @@
+"""
+Building the working copy of the documentation directory (tmp/input_files).
+Workspace modes:
+    - 'copy':  files are copied (default)
+    - 'link':  files are hardlinked, or reflinked (copy-on-write clone) if hardlinks are not supported, and copied only if neither is supported
+    - 'lazy':  files are symbolic links to the documentation files. Files the pipeline opens (converted documents) are materialised - replaced by copies - before they are read
+In all modes the directory structure and file names are kept, so the structure, tree and hyperlink checks (including matching of names converted to latin characters) are the same.
+Files in the working copy are only read by the pipeline, never written, so linked files do not change the documentation.
+Files are created in a thread pool, and files already up to date in the working copy (e.g. with the /tmp directory kept between runs) are skipped.
+"""
+
+import os
+import shutil
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import src.conversion_cache as conversion_cache
+
+WORKSPACE_MODES = ['copy', 'link', 'lazy']
+
+# Linux ioctl cloning a file (btrfs, xfs, ...)
+FICLONE = 0x40049409
+
+
+def reflink(src, dst):
+    """
+    Clones a file (copy-on-write), if the file system supports it.
+
+    Args:
+        src (str):               Absolute path to the source file
+        dst (str):               Absolute path to the created file
+
+    Raises:
+        OSError:                 If cloning is not supported
+    """
+    if not sys.platform.startswith('linux'):
+        raise OSError('Reflinks are not supported on this platform')
+    import fcntl
+    with open(src, 'rb') as src_file, open(dst, 'wb') as dst_file:
+        try:
+            fcntl.ioctl(dst_file.fileno(), FICLONE, src_file.fileno())
+        except OSError:
+            dst_file.close()
+            os.remove(dst)
+            raise
+    shutil.copystat(src, dst)
+
+
+class WorkspaceBuilder:
+    """
+    Copy function creating files of the working copy in the given mode, with counts of created files by method.
+    """
+
+    def __init__(self, mode='copy'):
+        """
+        Args:
+            mode (str):              (Optional) Workspace mode, one of WORKSPACE_MODES. Default is 'copy'
+        """
+        if mode not in WORKSPACE_MODES:
+            raise ValueError(f'Unknown workspace mode: {mode}. Supported modes: {", ".join(WORKSPACE_MODES)}')
+        self.mode = mode
+        self.counts = {'copied': 0, 'hardlinked': 0, 'reflinked': 0, 'symlinked': 0}
+        self.counts_lock = threading.Lock()
+        # Reflinks and symlinks are not tried again once they fail (e.g. not supported by the file system), hardlinks are tried for each file
+        self.reflinks_supported = True
+        self.symlinks_supported = True
+
+    def count(self, method):
+        with self.counts_lock:
+            self.counts[method] += 1
+
+    def __call__(self, src, dst):
+        # Existing file is removed first, so a file linked by a previous run is never written to
+        if os.path.lexists(dst):
+            os.remove(dst)
+        if self.mode == 'link':
+            try:
+                os.link(src, dst)
+                self.count('hardlinked')
+                return dst
+            except OSError:
+                pass
+        if self.mode == 'link' and self.reflinks_supported:
+            try:
+                reflink(src, dst)
+                self.count('reflinked')
+                return dst
+            except OSError:
+                self.reflinks_supported = False
+        if self.mode == 'lazy' and self.symlinks_supported:
+            try:
+                os.symlink(os.path.abspath(src), dst)
+                self.count('symlinked')
+                return dst
+            except OSError:
+                self.symlinks_supported = False
+        shutil.copy2(src, dst)
+        self.count('copied')
+        return dst
+
+
+def is_up_to_date(src_stat, src, dst, mode='copy', compare='mtime'):
+    """
+    Checks if a file of the working copy is up to date, so it is not created again.
+
+    Args:
+        src_stat (os.stat_result):   Stat of the source file
+        src (str):                   Absolute path to the source file
+        dst (str):                   Absolute path to the file in the working copy
+        mode (str):                  (Optional) Workspace mode. Default is 'copy'
+        compare (str):               (Optional) How copied files are compared: 'mtime' (size and modification time) or 'hash' (size and content hash). Default is 'mtime'
+
+    Returns:
+        (bool):                      True if the file does not have to be created again
+    """
+    try:
+        dst_stat = os.lstat(dst)
+    except OSError:
+        return False
+    if os.path.islink(dst):
+        # Symbolic links are up to date only in a lazy working copy
+        return mode == 'lazy' and os.readlink(dst) == os.path.abspath(src)
+    if dst_stat.st_ino == src_stat.st_ino and dst_stat.st_dev == src_stat.st_dev:
+        # Hardlinks are not a copy
+        return mode != 'copy'
+    if dst_stat.st_size != src_stat.st_size:
+        return False
+    if compare == 'hash':
+        return conversion_cache.file_hash(src) == conversion_cache.file_hash(dst)
+    return dst_stat.st_mtime_ns == src_stat.st_mtime_ns
+
+def list_tree(src_dir, dest_dir):
+    """
+    Lists a directory recursively, for creating its working copy.
+
+    Args:
+        src_dir (str):           Absolute path to the directory
+        dest_dir (str):          Absolute path to the working copy
+
+    Returns:
+        (list):                  Directories to create, as (source path, working copy path), parents first
+        (list):                  Files, as (source path, working copy path, stat of the source file)
+        (list):                  Symbolic links, as (source path, working copy path)
+    """
+    dirs, files, links = [(src_dir, dest_dir)], [], []
+    index = 0
+    while index < len(dirs):
+        src_path, dest_path = dirs[index]
+        index += 1
+        with os.scandir(src_path) as entries:
+            for entry in entries:
+                entry_dest = os.path.join(dest_path, entry.name)
+                if entry.is_symlink():
+                    links.append((entry.path, entry_dest))
+                elif entry.is_dir():
+                    dirs.append((entry.path, entry_dest))
+                else:
+                    files.append((entry.path, entry_dest, entry.stat()))
+    return dirs, files, links
+
+def build_workspace(src_dir, dest_dir, mode='copy', overwrite=True, threads=4, compare='mtime', progress_callback=None):
+    """
+    Creates the working copy of the documentation directory. Files already up to date in the working copy are skipped.
+
+    Args:
+        src_dir (str):                  Absolute path to the documentation directory
+        dest_dir (str):                 Absolute path to the working copy
+        mode (str):                     (Optional) Workspace mode, one of WORKSPACE_MODES. Default is 'copy'
+        overwrite (bool):               (Optional) If True, an existing working copy is updated, otherwise FileExistsError is raised. Default is True
+        threads (int):                  (Optional) Number of threads creating files. Default is 4
+        compare (str):                  (Optional) How existing copied files are compared: 'mtime' (size and modification time) or 'hash' (size and content hash). Default is 'mtime'
+        progress_callback (callable):   (Optional) Called with (number of processed files, number of all files) while files are created. Default is None
+
+    Returns:
+        (dict):                         Numbers of copied, hardlinked, reflinked, symlinked and skipped (up to date) files, size of created files (bytes), duration (s) and throughput (files/s, MB/s)
+    """
+    if overwrite == False and os.path.exists(dest_dir):
+        raise FileExistsError(f'Working copy already exists: {dest_dir}')
+    start_time = time.perf_counter()
+    builder = WorkspaceBuilder(mode=mode)
+    dirs, files, links = list_tree(src_dir, dest_dir)
+    for src_path, dest_path in dirs:
+        os.makedirs(dest_path, exist_ok=True)
+    for src_path, dest_path in links:
+        if os.path.islink(dest_path) and os.readlink(dest_path) == os.readlink(src_path):
+            continue
+        if os.path.lexists(dest_path):
+            os.remove(dest_path)
+        os.symlink(os.readlink(src_path), dest_path)
+    to_create = [(src_path, dest_path, src_stat) for src_path, dest_path, src_stat in files if not is_up_to_date(src_stat, src_path, dest_path, mode=mode, compare=compare)]
+    skipped = len(files) - len(to_create)
+    if progress_callback is not None:
+        progress_callback(skipped, len(files))
+    with ThreadPoolExecutor(max_workers=max(1, threads)) as executor:
+        futures = [executor.submit(builder, src_path, dest_path) for src_path, dest_path, src_stat in to_create]
+        for index, future in enumerate(as_completed(futures)):
+            future.result()
+            if progress_callback is not None:
+                progress_callback(skipped + index + 1, len(files))
+    # Directory times are set after their files are created, as shutil.copytree does
+    for src_path, dest_path in reversed(dirs):
+        try:
+            shutil.copystat(src_path, dest_path)
+        except OSError:
+            pass
+    duration = time.perf_counter() - start_time
+    copied_bytes = sum([src_stat.st_size for src_path, dest_path, src_stat in to_create])
+    stats = {**builder.counts, 'skipped': skipped, 'bytes': copied_bytes, 'duration': round(duration, 3),
+             'files_per_s': round(len(to_create) / duration, 1) if duration > 0 else 0.0,
+             'mb_per_s': round(copied_bytes / 1024 ** 2 / duration, 1) if duration > 0 else 0.0}
+    print(f"Workspace ({mode}): {stats['copied']} files copied, {stats['hardlinked']} hardlinked, {stats['reflinked']} reflinked, {stats['symlinked']} symlinked, {stats['skipped']} up to date")
+    print(f"    {stats['duration']} s, {stats['files_per_s']} files/s, {stats['mb_per_s']} MB/s")
+    return stats
+
+def materialize(file_path):
+    """
+    Replaces a symbolic link of a lazy working copy by a copy of the linked file, before the file is read. Other files are not changed.
+
+    Args:
+        file_path (str):         Absolute path to the file in the working copy
+
+    Returns:
+        (str):                   Absolute path to the file
+    """
+    file_path = str(file_path)
+    if not os.path.islink(file_path) or not os.path.isfile(file_path):
+        return file_path
+    tmp_path = f'{file_path}.materialize'
+    try:
+        shutil.copy2(os.path.realpath(file_path), tmp_path)
+        os.replace(tmp_path, file_path)
+        print(f'Materialised file in workspace: {file_path}')
+    except OSError as e:
+        print(f'Error materialising {file_path}, reading the linked file:\n    {e}')
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return file_path